@@ -11,6 +11,9 @@ class LLMSettings(BaseSettings):
     max_tokens: Optional[int] = None
     max_retries: int = 3
     use_fallback: bool = False
+    # Connections the async client may open at once, i.e. concurrent LLM calls
+    # per worker (the SDK default is 100).
+    max_connections: int = Field(os.getenv("LLM_MAX_CONNECTIONS", 500))
 
 
 class GroqConfig(LLMSettings):
@@ -21,10 +24,143 @@ class GroqConfig(LLMSettings):
     embedding_model: str = Field("sentence-transformers/all-mpnet-base-v2")
 
 
+class LLMCacheConfig(BaseSettings):
+    """Settings for caching deterministic (temperature 0) LLM responses."""
+
+    enabled: bool = Field(os.getenv("LLM_CACHE_ENABLED", True))
+    max_entries: int = 2048
+    disk_path: Optional[str] = Field(os.getenv("LLM_CACHE_PATH"))
+    default_ttl_seconds: float = 3600.0
+    # Per prompt_name; 0 disables caching. Planner answers depend on live tool
+    # output (e.g. the weather) and chat replies on the conversation so far.
+    ttl_seconds: dict[str, float] = Field(
+        default_factory=lambda: {
+            "query_rewriting": 24 * 3600.0,
+            "question_answering": 3600.0,
+            "fact_extracting": 7 * 24 * 3600.0,
+            "chat_agent": 0.0,
+            "planner_agent": 0.0,
+        }
+    )
+
+
+class RateLimitConfig(BaseSettings):
+    """Client-side request and token budgets per LLM model."""
+
+    enabled: bool = Field(os.getenv("LLM_RATE_LIMIT_ENABLED", True))
+    # Seed budgets, replaced by the limits Groq reports in its response headers.
+    default_requests_per_minute: float = 30.0
+    default_tokens_per_minute: float = 6000.0
+    requests_per_minute: dict[str, float] = Field(
+        default_factory=lambda: {
+            "llama-3.3-70b-versatile": 30.0,
+            "llama-3.1-8b-instant": 30.0,
+        }
+    )
+    tokens_per_minute: dict[str, float] = Field(
+        default_factory=lambda: {
+            "llama-3.3-70b-versatile": 12000.0,
+            "llama-3.1-8b-instant": 6000.0,
+        }
+    )
+    # Longest a call queues for a model's budget; beyond that it moves on to the
+    # next fallback model.
+    max_queue_seconds: float = Field(os.getenv("LLM_RATE_LIMIT_MAX_QUEUE", 10.0))
+
+
+class CircuitBreakerConfig(BaseSettings):
+    """Settings for the per-model circuit breakers and health-based model routing."""
+
+    enabled: bool = Field(os.getenv("LLM_CIRCUIT_BREAKER_ENABLED", True))
+    # Calls older than the window no longer count towards a model's statistics.
+    window_seconds: float = 60.0
+    min_calls: int = 5
+    error_rate_threshold: float = 0.5
+    consecutive_failures: int = 3
+    # How long an open circuit rejects calls before letting a probe through.
+    open_seconds: float = Field(os.getenv("LLM_CIRCUIT_OPEN_SECONDS", 30.0))
+    # Models slower than this on average score proportionally lower.
+    latency_target_seconds: float = 10.0
+    # Models scoring at least this keep their configured order; the others are
+    # tried after them, healthiest first.
+    healthy_score: float = 0.8
+    # Models allowed per prompt_name, e.g. to keep a prompt on the larger model.
+    # Prompts not listed may use every configured model.
+    prompt_models: dict[str, list[str]] = Field(default_factory=dict)
+
+
+class EmbeddingConfig(BaseSettings):
+    """Settings for the embedding model and its cache."""
+
+    model_name: str = Field("sentence-transformers/all-mpnet-base-v2")
+    backend: str = Field(os.getenv("EMBEDDING_BACKEND", "huggingface"))
+    onnx_model_dir: str = Field(os.getenv("EMBEDDING_ONNX_DIR", "models/onnx"))
+    onnx_quantize: bool = True
+    max_seq_length: int = 384
+    cache_enabled: bool = True
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_disk_path: Optional[str] = Field(os.getenv("EMBEDDING_CACHE_PATH"))
+    batch_enabled: bool = True
+    batch_max_size: int = 32
+    batch_max_wait_ms: float = 5.0
+
+
+class ChunkingConfig(BaseSettings):
+    """Settings for splitting long step descriptions into passages at index time."""
+
+    enabled: bool = Field(os.getenv("CHUNKING_ENABLED", True))
+    # Sizes are in words: ~200 words stay below the model's 384-token window.
+    chunk_size: int = Field(os.getenv("CHUNK_SIZE", 200))
+    chunk_overlap: int = Field(os.getenv("CHUNK_OVERLAP", 40))
+    # Chunks fetched per requested step, so that collapsing chunks of the same
+    # step still leaves enough distinct steps.
+    search_overfetch: int = 2
+
+
+class VectorStoreConfig(BaseSettings):
+    """Settings for selecting the vector store backend."""
+
+    backend: str = Field(os.getenv("VECTOR_STORE_BACKEND", "qdrant"))
+    numpy_storage_path: Optional[str] = Field(os.getenv("NUMPY_STORAGE_PATH"))
+    storage_layout: str = Field(os.getenv("VECTOR_STORE_LAYOUT", "per_trip"))
+    shared_collection_name: str = Field(
+        os.getenv("VECTOR_STORE_SHARED_COLLECTION", "trip_steps")
+    )
+    # Store BM25 sparse vectors next to the dense ones and fuse both rankings at
+    # search time. Collections created without sparse vectors must be re-indexed.
+    hybrid_search: bool = Field(os.getenv("HYBRID_SEARCH", False))
+    bm25_k1: float = 1.2
+    bm25_b: float = 0.75
+    # Average words per indexed text, used for BM25 length normalisation.
+    bm25_avg_doc_length: float = 40.0
+    # Re-rank search results with maximal marginal relevance, so that near-duplicate
+    # steps do not crowd out the others. Lambda weighs relevance against diversity.
+    mmr_enabled: bool = Field(os.getenv("MMR_ENABLED", False))
+    mmr_lambda: float = Field(os.getenv("MMR_LAMBDA", 0.5))
+    # Candidates fetched per result for the re-ranking to choose from.
+    mmr_candidates: int = 4
+
+
 class QdrantConfig(BaseSettings):
     """Settings for Qdrant vector store."""
 
     qdrant_url: str = Field(os.getenv("QDRANT_URL", "http://localhost:6333"))
+    prefer_grpc: bool = Field(os.getenv("QDRANT_PREFER_GRPC", False))
+    grpc_port: int = Field(os.getenv("QDRANT_GRPC_PORT", 6334))
+    scroll_page_size: int = 256
+    collection_cache_ttl: float = 60.0
+    # Collection layout, applied when a collection is created.
+    # quantization is one of "none", "scalar" (int8) or "binary".
+    quantization: str = Field(os.getenv("QDRANT_QUANTIZATION", "none"))
+    quantization_always_ram: bool = True
+    vectors_on_disk: bool = Field(os.getenv("QDRANT_VECTORS_ON_DISK", False))
+    hnsw_m: Optional[int] = Field(os.getenv("QDRANT_HNSW_M"))
+    hnsw_ef_construct: Optional[int] = Field(os.getenv("QDRANT_HNSW_EF_CONSTRUCT"))
+    # Search settings for quantized collections: candidates are fetched with the
+    # quantized vectors, then rescored with the original ones.
+    search_rescore: bool = True
+    search_oversampling: float = Field(os.getenv("QDRANT_SEARCH_OVERSAMPLING", 2.0))
+    search_hnsw_ef: Optional[int] = Field(os.getenv("QDRANT_SEARCH_HNSW_EF"))
 
 
 class APISettings(BaseSettings):
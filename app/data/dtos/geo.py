@@ -0,0 +1,57 @@
+import math
+from typing import Union
+
+from pydantic import BaseModel, Field
+
+# Payload field holding each step's {"lat", "lon"} point, indexed for geo filters.
+GEO_FIELD = "location"
+EARTH_RADIUS_KM = 6371.0088
+
+
+class GeoRadius(BaseModel):
+    """
+    Matches steps within `radius_km` kilometres of a point.
+    """
+
+    lat: float = Field(ge=-90, le=90, description="Latitude of the centre.")
+    lon: float = Field(ge=-180, le=180, description="Longitude of the centre.")
+    radius_km: float = Field(gt=0, description="Radius around the centre, in km.")
+
+    def contains(self, lat: float, lon: float) -> bool:
+        """
+        Checks whether a point lies within the radius (haversine distance).
+        """
+        phi1, phi2 = math.radians(self.lat), math.radians(lat)
+        d_phi = phi2 - phi1
+        d_lambda = math.radians(lon - self.lon)
+        a = (
+            math.sin(d_phi / 2) ** 2
+            + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+        )
+        distance = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+        return distance <= self.radius_km
+
+
+class GeoBoundingBox(BaseModel):
+    """
+    Matches steps inside a latitude/longitude box. A box whose min_lon is greater
+    than its max_lon crosses the antimeridian.
+    """
+
+    min_lat: float = Field(ge=-90, le=90)
+    min_lon: float = Field(ge=-180, le=180)
+    max_lat: float = Field(ge=-90, le=90)
+    max_lon: float = Field(ge=-180, le=180)
+
+    def contains(self, lat: float, lon: float) -> bool:
+        """
+        Checks whether a point lies inside the box.
+        """
+        if not self.min_lat <= lat <= self.max_lat:
+            return False
+        if self.min_lon <= self.max_lon:
+            return self.min_lon <= lon <= self.max_lon
+        return lon >= self.min_lon or lon <= self.max_lon
+
+
+GeoFilter = Union[GeoRadius, GeoBoundingBox]
@@ -24,21 +24,30 @@ class TripStepDTO(BaseModel):
     weather_condition: Optional[str] = None
     weather_temperature: Optional[float] = None
 
+    @staticmethod
+    def fields_from_raw(data: dict) -> dict:
+        """
+        Maps a raw Polarsteps step onto the fields of a TripStepDTO.
+        :param data: A step from the all_steps list of a trip.json.
+        :return: A dictionary of field name -> value.
+        """
+        location = data.get("location", {})
+        return {
+            "id": data["id"],
+            "display_name": data.get("display_name") or location.get("name") or "Unknown",
+            "description": data.get("description"),
+            "location_name": location.get("name") or "Unknown",
+            "lat": _as_float(location.get("lat", 0.0)),
+            "lon": _as_float(location.get("lon", 0.0)),
+            "detail": location.get("detail") or location.get("full_detail") or "",
+            "country_code": location.get("country_code") or "XX",
+            "weather_condition": data.get("weather_condition"),
+            "weather_temperature": _as_float(data.get("weather_temperature")),
+        }
+
     @classmethod
     def from_raw_json(cls, data: dict) -> TripStepDTO:
-        location = data.get("location", {})
-        return cls(
-            id=data["id"],
-            display_name=data.get("display_name") or location.get("name") or "Unknown",
-            description=data.get("description"),
-            location_name=location.get("name") or "Unknown",
-            lat=location.get("lat", 0.0),
-            lon=location.get("lon", 0.0),
-            detail=location.get("detail") or location.get("full_detail") or "",
-            country_code=location.get("country_code") or "XX",
-            weather_condition=data.get("weather_condition"),
-            weather_temperature=data.get("weather_temperature"),
-        )
+        return cls(**cls.fields_from_raw(data))
 
 
 class TripDTO(BaseModel):
@@ -59,3 +68,11 @@ class TripDTO(BaseModel):
             summary=data.get("summary"),
             all_steps=parsed_steps,
         )
+
+
+def _as_float(value):
+    """
+    Converts JSON integers to floats, as validation does, so that payloads built
+    straight from raw JSON match the ones built from a TripStepDTO.
+    """
+    return float(value) if isinstance(value, int) and not isinstance(value, bool) else value
@@ -1,17 +1,26 @@
 import os
 import sys
-import json
+from typing import Optional
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
 from app.data.dtos.trip import TripDTO
+from app.data.io.trip_stream import iter_trips
 
+DEFAULT_TRIP_PATH = os.getenv(
+    "POLARSTEPS_TRIP_PATH", "~/ai-travel-companion/app/data/files/trip.json"
+)
 
-def read_trip_from_polarsteps() -> TripDTO:
-    with open(
-        os.path.expanduser("~/ai-travel-companion/app/data/files/trip.json"),
-        "r",
-    ) as f:
-        data = json.load(f)
-    trip = TripDTO.from_raw_json(data)
-    return trip
+
+def read_trip_from_polarsteps(path: Optional[str] = None) -> TripDTO:
+    """
+    Reads the first trip found at `path` into memory.
+    Use iter_trips to stream the steps of large exports instead.
+    :param path: A trip.json file, an export directory or a zip archive
+        (defaults to POLARSTEPS_TRIP_PATH).
+    :return: The trip with all of its steps.
+    """
+    trip = next(iter_trips(path or DEFAULT_TRIP_PATH), None)
+    if trip is None:
+        raise FileNotFoundError(f"No trip.json found in '{path or DEFAULT_TRIP_PATH}'.")
+    return trip.to_trip_dto()
@@ -0,0 +1,128 @@
+import os
+import zipfile
+from contextlib import contextmanager
+from typing import IO, Callable, ContextManager, Iterator, Optional
+
+import ijson
+
+from app.data.dtos.trip import TripDTO, TripStepDTO
+
+TRIP_FILE_NAME = "trip.json"
+HEADER_FIELDS = ("id", "user_id", "name", "summary")
+
+
+class TripStream:
+    """
+    A Polarsteps trip whose steps are parsed lazily from its trip.json.
+
+    Only the trip's header fields are held in memory; steps are decoded one at a
+    time with an incremental JSON parser every time they are iterated.
+    """
+
+    def __init__(
+        self, source: str, open_file: Callable[[], ContextManager[IO[bytes]]]
+    ):
+        self.source = source
+        self._open_file = open_file
+        header = self._read_header()
+        missing = [field for field in ("id", "user_id", "name") if field not in header]
+        if missing:
+            raise ValueError(f"Trip file '{source}' is missing fields: {missing}")
+        self.id: int = header["id"]
+        self.user_id: int = header["user_id"]
+        self.name: str = header["name"]
+        self.summary: Optional[str] = header.get("summary")
+
+    def _read_header(self) -> dict:
+        """
+        Collects the top-level scalar fields of the trip, stopping as soon as all
+        of them are found. Steps are skipped without being built.
+        """
+        header = {}
+        with self._open_file() as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if prefix in HEADER_FIELDS and event in (
+                    "number",
+                    "string",
+                    "null",
+                ):
+                    header[prefix] = value
+                    if len(header) == len(HEADER_FIELDS):
+                        break
+        return header
+
+    def steps(self) -> Iterator[TripStepDTO]:
+        """
+        Yields the trip's steps one at a time.
+        :return: Iterator over TripStepDTOs, in file order.
+        """
+        with self._open_file() as f:
+            for step in ijson.items(f, "all_steps.item", use_float=True):
+                yield TripStepDTO.from_raw_json(step)
+
+    def to_trip_dto(self) -> TripDTO:
+        """
+        Loads every step into a TripDTO. Prefer steps() or chunks() for large trips.
+        :return: The complete trip.
+        """
+        return TripDTO(
+            id=self.id,
+            user_id=self.user_id,
+            name=self.name,
+            summary=self.summary,
+            all_steps=list(self.steps()),
+        )
+
+    def chunks(self, size: int) -> Iterator[list[TripStepDTO]]:
+        """
+        Yields the trip's steps in lists of at most `size` steps.
+        :param size: Maximum number of steps per chunk.
+        :return: Iterator over lists of TripStepDTOs.
+        """
+        chunk = []
+        for step in self.steps():
+            chunk.append(step)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def iter_trips(path: str) -> Iterator[TripStream]:
+    """
+    Finds every trip in a Polarsteps export.
+    :param path: A trip.json file, a directory containing trip.json files at any
+        depth (such as an unpacked export), or a zip archive of either.
+    :return: Iterator over TripStreams, in path order.
+    """
+    path = os.path.expanduser(path)
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            names = sorted(
+                name
+                for name in archive.namelist()
+                if os.path.basename(name) == TRIP_FILE_NAME
+            )
+        for name in names:
+            yield TripStream(
+                f"{path}:{name}",
+                lambda name=name: _open_zip_member(path, name),
+            )
+    elif os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            if TRIP_FILE_NAME in files:
+                trip_path = os.path.join(root, TRIP_FILE_NAME)
+                yield TripStream(trip_path, lambda p=trip_path: open(p, "rb"))
+    else:
+        yield TripStream(path, lambda: open(path, "rb"))
+
+
+@contextmanager
+def _open_zip_member(path: str, name: str) -> Iterator[IO[bytes]]:
+    """
+    Opens one member of a zip archive, closing the archive along with it.
+    """
+    with zipfile.ZipFile(path) as archive, archive.open(name) as member:
+        yield member
@@ -0,0 +1,319 @@
+import logging
+from typing import AsyncIterator, Optional
+
+from qdrant_client import AsyncQdrantClient
+
+from app.core.settings import QdrantConfig
+from app.data.storage.collection_cache import CollectionMetadataCache
+from app.data.storage.qdrant_filters import to_qdrant_filter
+from app.data.storage.qdrant_errors import raise_if_not_found, search_error
+from app.data.storage.qdrant_params import (
+    batch_request,
+    dense_search_query,
+    hybrid_search_query,
+    search_params,
+    vector_query,
+)
+from app.embeddings.bm25_encoder import SparseEmbedding
+
+
+class AsyncQdrantClientWrapper:
+    """
+    Async counterpart of QdrantClientWrapper for the read path used by the API.
+
+    Built on AsyncQdrantClient, so searches await the network call instead of
+    blocking the event loop. gRPC is used when QDRANT_PREFER_GRPC is set.
+    """
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(
+        self,
+        config: QdrantConfig,
+        collection_cache: Optional[CollectionMetadataCache] = None,
+    ):
+        if not self._initialized:
+            self.client = AsyncQdrantClient(
+                url=config.qdrant_url,
+                prefer_grpc=config.prefer_grpc,
+                grpc_port=config.grpc_port,
+            )
+            self.scroll_page_size = config.scroll_page_size
+            self.search_params = search_params(config)
+            self.collection_cache = collection_cache or CollectionMetadataCache(
+                ttl_seconds=config.collection_cache_ttl
+            )
+            self._initialized = True
+            logging.info(
+                f"AsyncQdrantClient initialized with URL: {config.qdrant_url} (gRPC: {config.prefer_grpc})"
+            )
+
+    async def collection_exists(self, collection_name: str) -> bool:
+        """
+        Check if a collection exists in the Qdrant vector store.
+        The answer is cached for collection_cache_ttl seconds.
+        :param collection_name: Name of the collection to check.
+        :return: True if the collection exists, False otherwise.
+        """
+        cached = self.collection_cache.get(collection_name)
+        if cached is not None and "exists" in cached:
+            return cached["exists"]
+
+        exists = await self.client.collection_exists(collection_name)
+        self.collection_cache.update(collection_name, exists=exists)
+        return exists
+
+    async def search(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ):
+        """
+        Perform a similarity search in a specified collection.
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Embedding of the query to search for.
+        :param k: Number of nearest neighbors to return.
+        :param filters: Optional payload values the results must match.
+        :return: List of payloads of the most similar documents.
+        """
+        try:
+            results = await self.client.query_points(
+                collection_name=collection_name,
+                **dense_search_query(
+                    query_embedding, k, to_qdrant_filter(filters), self.search_params
+                ),
+            )
+        except Exception as e:
+            raise search_error(e, collection_name, self.collection_cache)
+        if not results:
+            logging.info(
+                f"No results found for query in collection '{collection_name}'."
+            )
+            return []
+
+        return [point.payload for point in results.points]
+
+    async def search_batch(
+        self,
+        collection_name: str,
+        query_embeddings: list[list],
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        """
+        Perform several similarity searches in one query_batch_points round-trip.
+        :param collection_name: Name of the collection to search in.
+        :param query_embeddings: One embedding per query.
+        :param k: Number of nearest neighbors to return for each query.
+        :param filters: Optional payload values the results must match.
+        :return: One list of similar documents per query, in query order.
+        """
+        if not query_embeddings:
+            return []
+        query_filter = to_qdrant_filter(filters)
+        try:
+            responses = await self.client.query_batch_points(
+                collection_name=collection_name,
+                requests=[
+                    batch_request(
+                        dense_search_query(
+                            query_embedding, k, query_filter, self.search_params
+                        )
+                    )
+                    for query_embedding in query_embeddings
+                ],
+            )
+        except Exception as e:
+            raise search_error(
+                e, collection_name, self.collection_cache, "batch search"
+            )
+        return [[point.payload for point in response.points] for response in responses]
+
+    async def hybrid_search(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        sparse_query: SparseEmbedding,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[dict]:
+        """
+        Perform a dense and a BM25 search fused with reciprocal rank fusion, in a
+        single query_points request.
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Dense embedding of the query.
+        :param sparse_query: BM25 encoding of the query.
+        :param k: Number of documents to return.
+        :param filters: Optional payload values the results must match.
+        :return: List of payloads, best first.
+        """
+        try:
+            results = await self.client.query_points(
+                collection_name=collection_name,
+                **hybrid_search_query(
+                    query_embedding,
+                    sparse_query,
+                    k,
+                    to_qdrant_filter(filters),
+                    self.search_params,
+                ),
+            )
+        except Exception as e:
+            raise search_error(
+                e, collection_name, self.collection_cache, "hybrid search"
+            )
+        return [point.payload for point in results.points]
+
+    async def hybrid_search_batch(
+        self,
+        collection_name: str,
+        query_embeddings: list[list],
+        sparse_queries: list[SparseEmbedding],
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        """
+        Perform several hybrid searches in one query_batch_points round-trip.
+        :param collection_name: Name of the collection to search in.
+        :param query_embeddings: One dense embedding per query.
+        :param sparse_queries: One BM25 encoding per query.
+        :param k: Number of documents to return for each query.
+        :param filters: Optional payload values the results must match.
+        :return: One list of documents per query, in query order.
+        """
+        if not query_embeddings:
+            return []
+        query_filter = to_qdrant_filter(filters)
+        try:
+            responses = await self.client.query_batch_points(
+                collection_name=collection_name,
+                requests=[
+                    batch_request(
+                        hybrid_search_query(
+                            query_embedding,
+                            sparse_query,
+                            k,
+                            query_filter,
+                            self.search_params,
+                        )
+                    )
+                    for query_embedding, sparse_query in zip(
+                        query_embeddings, sparse_queries
+                    )
+                ],
+            )
+        except Exception as e:
+            raise search_error(
+                e, collection_name, self.collection_cache, "batch hybrid search"
+            )
+        return [[point.payload for point in response.points] for response in responses]
+
+    async def search_with_vectors(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        k: int = 5,
+        filters: Optional[dict] = None,
+        sparse_query: Optional[SparseEmbedding] = None,
+    ) -> list[tuple[dict, list[float]]]:
+        """
+        Perform a similarity search that also returns each point's "description" vector.
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Dense embedding of the query.
+        :param k: Number of documents to return.
+        :param filters: Optional payload values the results must match.
+        :param sparse_query: Optional BM25 encoding of the query, to fuse a
+            sparse search in as hybrid_search does.
+        :return: List of (payload, vector) pairs, best first.
+        """
+        try:
+            results = await self.client.query_points(
+                collection_name=collection_name,
+                **vector_query(
+                    query_embedding,
+                    sparse_query,
+                    k,
+                    to_qdrant_filter(filters),
+                    self.search_params,
+                ),
+            )
+        except Exception as e:
+            raise search_error(e, collection_name, self.collection_cache)
+        return [
+            (point.payload, point.vector["description"]) for point in results.points
+        ]
+
+    async def iter_documents(
+        self,
+        collection_name: str,
+        page_size: Optional[int] = None,
+        fields: Optional[list[str]] = None,
+        filters: Optional[dict] = None,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Yield the documents of a collection page by page, as each scroll request returns.
+        :param collection_name: Name of the collection to retrieve documents from.
+        :param page_size: Number of points fetched per scroll request.
+        :param fields: Payload fields to return, or None for the whole payload.
+        :param filters: Optional payload values the documents must match.
+        :return: Async iterator over pages of payloads.
+        """
+        scroll_filter = to_qdrant_filter(filters)
+        next_offset = None
+        while True:
+            try:
+                points, next_offset = await self.client.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=scroll_filter,
+                    with_payload=fields if fields else True,
+                    limit=page_size or self.scroll_page_size,
+                    offset=next_offset,
+                )
+            except Exception as e:
+                raise_if_not_found(e, collection_name, self.collection_cache)
+                logging.error(
+                    f"Error retrieving documents from collection '{collection_name}': {e}"
+                )
+                raise e
+
+            if not points:
+                return
+
+            yield [point.payload for point in points]
+
+            if not next_offset:
+                return
+
+    async def get_all_documents(
+        self,
+        collection_name: str,
+        batch_size: Optional[int] = None,
+        filters: Optional[dict] = None,
+    ):
+        """
+        Retrieve all documents from a specified collection.
+        :param collection_name: Name of the collection to retrieve documents from.
+        :param batch_size: Number of points fetched per scroll request.
+        :param filters: Optional payload values the documents must match.
+        :return: List of all documents in the collection.
+        """
+        all_documents = []
+        async for page in self.iter_documents(
+            collection_name, page_size=batch_size, filters=filters
+        ):
+            all_documents.extend(page)
+        return all_documents
+
+    async def close(self) -> None:
+        """
+        Closes the underlying HTTP/gRPC connections.
+        """
+        await self.client.close()
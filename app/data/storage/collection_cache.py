@@ -0,0 +1,64 @@
+import time
+import threading
+from typing import Any, Optional
+
+
+class CollectionMetadataCache:
+    """
+    TTL cache of per-collection metadata (existence, vector size, point count).
+
+    Lets the vector store skip a round-trip to check a collection before every
+    operation. Entries are updated explicitly on create/delete, and dropped when
+    an operation reports the collection as missing.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, collection_name: str) -> Optional[dict[str, Any]]:
+        """
+        Returns the cached metadata for a collection, or None if missing or expired.
+        :param collection_name: Name of the collection.
+        :return: A dictionary with the cached metadata fields.
+        """
+        with self._lock:
+            entry = self._entries.get(collection_name)
+            if entry is None:
+                return None
+            stored_at, metadata = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[collection_name]
+                return None
+            return metadata
+
+    def update(self, collection_name: str, **metadata: Any) -> None:
+        """
+        Merges metadata fields into a collection's entry and refreshes its TTL.
+        :param collection_name: Name of the collection.
+        :param metadata: Fields to set, e.g. exists, vector_size, points_count.
+        """
+        with self._lock:
+            current = self._entries.get(collection_name, (0.0, {}))[1]
+            self._entries[collection_name] = (
+                time.monotonic(),
+                {**current, **metadata},
+            )
+
+    def invalidate(self, collection_name: Optional[str] = None) -> None:
+        """
+        Drops one collection's entry, or every entry if no name is given.
+        :param collection_name: Name of the collection to drop.
+        """
+        with self._lock:
+            if collection_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(collection_name, None)
+
+    def clear(self) -> None:
+        """
+        Drops every entry.
+        """
+        self.invalidate()
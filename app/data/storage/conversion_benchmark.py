@@ -0,0 +1,143 @@
+import time
+import argparse
+from typing import Callable, Optional
+
+import ijson
+import numpy as np
+from qdrant_client.models import PointStruct
+
+from app.data.dtos.geo import GEO_FIELD
+from app.data.dtos.trip import TripStepDTO
+from app.data.storage.step_documents import step_payload, step_point
+
+
+def validated_document(step: dict, embedding: list[float]) -> PointStruct:
+    """
+    The previous indexing path: a validated DTO and a validated PointStruct.
+    """
+    dto = TripStepDTO.from_raw_json(step)
+    return PointStruct(
+        id=dto.id,
+        vector={"description": embedding},
+        payload=step_payload(dto),
+    )
+
+
+def dto_document(step: dict, embedding: list[float]) -> PointStruct:
+    """
+    The current indexing path: a validated DTO and a constructed PointStruct.
+    """
+    dto = TripStepDTO.from_raw_json(step)
+    return step_point(dto, embedding)
+
+
+def constructed_dto_document(step: dict, embedding: list[float]) -> PointStruct:
+    """
+    For reference: a DTO built with model_construct instead of validation.
+    """
+    dto = TripStepDTO.model_construct(**TripStepDTO.fields_from_raw(step))
+    return step_point(dto, embedding)
+
+
+def raw_document(step: dict, embedding: list[float]) -> PointStruct:
+    """
+    For reference: the point built straight from the raw step, skipping the DTO.
+    Only the step payload is built; ingest adds tenant and chunk fields on top of it
+    through VectorStore.to_documents, so this is not an indexing path.
+    """
+    payload = TripStepDTO.fields_from_raw(step)
+    payload["step_id"] = payload.pop("id")
+    payload[GEO_FIELD] = {"lat": payload["lat"], "lon": payload["lon"]}
+    return PointStruct.model_construct(
+        id=payload["step_id"], vector={"description": embedding}, payload=payload
+    )
+
+
+def time_per_step(
+    convert: Callable[[dict, list[float]], PointStruct],
+    steps: list[dict],
+    embeddings: list[list[float]],
+    repeat: int,
+) -> float:
+    """
+    Converts every step `repeat` times and keeps the fastest run.
+    :param convert: Function (raw step, embedding) -> PointStruct.
+    :param steps: Raw Polarsteps steps.
+    :param embeddings: One embedding per step.
+    :param repeat: Number of timed runs.
+    :return: Microseconds per step.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for step, embedding in zip(steps, embeddings):
+            convert(step, embedding)
+        best = min(best, time.perf_counter() - start)
+    return best / len(steps) * 1e6
+
+
+def load_steps(trip_path: Optional[str], num_steps: int) -> list[dict]:
+    """
+    Reads the raw steps of a trip.json, or generates synthetic ones.
+    """
+    if trip_path:
+        with open(trip_path, "rb") as f:
+            return list(ijson.items(f, "all_steps.item", use_float=True))
+    return [
+        {
+            "id": i,
+            "display_name": f"Step {i}",
+            "description": "A long day of walking around the old town. " * 10,
+            "location": {
+                "name": "Osaka",
+                "lat": 34.7,
+                "lon": 135.5,
+                "detail": "Japan",
+                "country_code": "JP",
+            },
+            "weather_condition": "sunny",
+            "weather_temperature": 16.5,
+        }
+        for i in range(num_steps)
+    ]
+
+
+def benchmark(steps: list[dict], dimension: int, repeat: int) -> dict:
+    """
+    Compares the per-step cost of turning raw steps into storage points.
+    :param steps: Raw Polarsteps steps.
+    :param dimension: Size of the embedding vectors.
+    :param repeat: Number of timed runs per path.
+    :return: A dictionary with microseconds per step for every path.
+    """
+    embeddings = np.random.default_rng(0).random((len(steps), dimension)).tolist()
+    validated = time_per_step(validated_document, steps, embeddings, repeat)
+    report = {"steps": len(steps), "validated_us_per_step": validated}
+    for name, convert in (
+        ("dto", dto_document),
+        ("constructed_dto", constructed_dto_document),
+        ("raw", raw_document),
+    ):
+        cost = time_per_step(convert, steps, embeddings, repeat)
+        report[f"{name}_us_per_step"] = cost
+        report[f"{name}_speedup"] = validated / cost if cost else 0.0
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the per-step cost of converting raw trip steps into storage points."
+    )
+    parser.add_argument("--trip", help="A trip.json to read steps from (synthetic if omitted).")
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--dimension", type=int, default=768)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    report = benchmark(load_steps(args.trip, args.steps), args.dimension, args.repeat)
+    for key, value in report.items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,554 @@
+import os
+import json
+import math
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+import numpy as np
+
+from app.core.settings import VectorStoreConfig
+from app.data.storage.vector_store_base import VectorStoreBase
+from app.data.storage.qdrant_params import SPARSE_VECTOR_NAME
+from app.data.storage.rank_fusion import reciprocal_rank_fusion
+from app.data.storage.step_documents import step_point
+from app.data.dtos.geo import GeoBoundingBox, GeoRadius
+from app.data.dtos.trip import TripStepDTO
+from app.embeddings.bm25_encoder import SparseEmbedding
+from app.core.exceptions.custom_exceptions import CollectionNotFoundError
+
+VECTOR_NAME = "description"
+
+
+class NumpyCollection:
+    """
+    A single collection held as a row-normalized float32 matrix plus payloads,
+    and optionally one BM25 sparse vector (term id -> weight) per row.
+    """
+
+    def __init__(self, embedding_size: int, capacity: int = 64):
+        self.embedding_size = embedding_size
+        self.vectors = np.zeros((capacity, embedding_size), dtype=np.float32)
+        self.ids: list[Any] = []
+        self.payloads: list[dict] = []
+        self.sparse: list[Optional[dict[int, float]]] = []
+        self.rows: dict[Any, int] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self.vectors[: self.size]
+
+    def upsert(
+        self,
+        point_id: Any,
+        vector: np.ndarray,
+        payload: dict,
+        sparse: Optional[dict[int, float]] = None,
+    ) -> None:
+        """
+        Inserts a point, or replaces it if the id already exists.
+        """
+        row = self.rows.get(point_id)
+        if row is None:
+            row = self.size
+            if row == self.vectors.shape[0] or not self.vectors.flags.writeable:
+                self._grow(max(2 * self.vectors.shape[0], row + 1))
+            self.ids.append(point_id)
+            self.payloads.append(payload)
+            self.sparse.append(sparse)
+            self.rows[point_id] = row
+        else:
+            if not self.vectors.flags.writeable:
+                self._grow(self.vectors.shape[0])
+            self.payloads[row] = payload
+            self.sparse[row] = sparse
+        self.vectors[row] = vector
+
+    def delete(self, point_ids: set) -> int:
+        """
+        Removes points by id, compacting the remaining rows.
+        :return: The number of points removed.
+        """
+        keep = [row for row, point_id in enumerate(self.ids) if point_id not in point_ids]
+        removed = self.size - len(keep)
+        if removed:
+            vectors = np.zeros(
+                (max(len(keep), 1), self.embedding_size), dtype=np.float32
+            )
+            vectors[: len(keep)] = self.vectors[keep]
+            self.vectors = vectors
+            self.ids = [self.ids[row] for row in keep]
+            self.payloads = [self.payloads[row] for row in keep]
+            self.sparse = [self.sparse[row] for row in keep]
+            self.rows = {point_id: row for row, point_id in enumerate(self.ids)}
+        return removed
+
+    def matching_rows(self, filters: Optional[dict]) -> Optional[np.ndarray]:
+        """
+        Returns the rows whose payload matches every filter value, or None for all rows.
+        """
+        if not filters:
+            return None
+        return np.array(
+            [
+                row
+                for row, payload in enumerate(self.payloads)
+                if all(
+                    NumpyCollection._matches(payload.get(key), value)
+                    for key, value in filters.items()
+                )
+            ],
+            dtype=np.int64,
+        )
+
+    @staticmethod
+    def _matches(stored: Any, value: Any) -> bool:
+        """
+        Compares a payload value with a filter value; geo filters match points
+        ({"lat", "lon"} dictionaries) that lie in their area.
+        """
+        if isinstance(value, (GeoRadius, GeoBoundingBox)):
+            return isinstance(stored, dict) and value.contains(
+                stored["lat"], stored["lon"]
+            )
+        return stored == value
+
+    def sparse_scores(self, query: SparseEmbedding) -> np.ndarray:
+        """
+        Scores every row against a BM25 query: the stored term weights of the query
+        terms, each multiplied by the term's inverse document frequency.
+        :return: One score per row; 0 for rows sharing no term with the query.
+        """
+        scores = np.zeros(self.size, dtype=np.float32)
+        indexed = sum(1 for vector in self.sparse if vector)
+        for term in set(query.indices):
+            rows = [
+                row
+                for row, vector in enumerate(self.sparse)
+                if vector and term in vector
+            ]
+            if not rows:
+                continue
+            idf = math.log((indexed - len(rows) + 0.5) / (len(rows) + 0.5) + 1)
+            for row in rows:
+                scores[row] += idf * self.sparse[row][term]
+        return scores
+
+    def _grow(self, capacity: int) -> None:
+        """
+        Copies the vectors into a larger in-memory buffer (also detaches memory maps).
+        """
+        vectors = np.zeros((capacity, self.embedding_size), dtype=np.float32)
+        vectors[: self.size] = self.vectors[: self.size]
+        self.vectors = vectors
+
+
+class NumpyVectorStore(VectorStoreBase):
+    """
+    In-process vector store that answers top-k queries with one matrix-vector product.
+
+    Suited to small tenants and to service-free tests and benchmarks. It accepts the
+    same PointStruct documents and returns the same payloads as QdrantClientWrapper.
+    When a storage path is configured, collections are persisted as .npy/.json pairs
+    and memory-mapped on start-up.
+    """
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, config: VectorStoreConfig):
+        if not self._initialized:
+            self.storage_path = config.numpy_storage_path
+            self.collections: dict[str, NumpyCollection] = {}
+            self._lock = threading.RLock()
+            self._bulk_depth = 0
+            self._dirty: set[str] = set()
+            if self.storage_path:
+                os.makedirs(self.storage_path, exist_ok=True)
+                self._load_collections()
+            self._initialized = True
+            logging.info(
+                f"NumpyVectorStore initialized with storage path: {self.storage_path}"
+            )
+
+    def _get_collection(self, collection_name: str) -> NumpyCollection:
+        collection = self.collections.get(collection_name)
+        if collection is None:
+            raise CollectionNotFoundError(collection_name)
+        return collection
+
+    def collection_exists(self, collection_name: str) -> bool:
+        """
+        Check if a collection exists in the store.
+        :param collection_name: Name of the collection to check.
+        :return: True if the collection exists, False otherwise.
+        """
+        return collection_name in self.collections
+
+    def create_collection(
+        self, collection_name: str, embedding_size: int, sparse_vectors: bool = False
+    ):
+        """
+        Create a new, empty collection. Sparse vectors are stored whenever documents
+        carry them, so `sparse_vectors` needs no setup here.
+        :param collection_name: Name of the collection to create.
+        :param embedding_size: Size of the embedding vectors.
+        :param sparse_vectors: Whether documents also store BM25 sparse vectors.
+        """
+        with self._lock:
+            if collection_name in self.collections:
+                logging.info(f"Collection '{collection_name}' already exists.")
+                return
+            self.collections[collection_name] = NumpyCollection(embedding_size)
+            self._persist(collection_name)
+        logging.info(
+            f"Collection '{collection_name}' created successfully with embedding size {embedding_size}."
+        )
+
+    def delete_collection(self, collection_name: str):
+        """
+        Delete a collection and its persisted files.
+        :param collection_name: Name of the collection to delete.
+        """
+        with self._lock:
+            self.collections.pop(collection_name, None)
+            self._dirty.discard(collection_name)
+            if self.storage_path:
+                for path in self._paths(collection_name):
+                    if os.path.exists(path):
+                        os.remove(path)
+        logging.info(f"Collection '{collection_name}' deleted.")
+
+    def add_documents(self, collection_name: str, documents: list):
+        """
+        Add documents to a collection, replacing points with the same id.
+        :param collection_name: Name of the collection to add documents to.
+        :param documents: List of PointStruct documents to add.
+        """
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            for document in documents:
+                vector, sparse = document.vector, None
+                if isinstance(vector, dict):
+                    sparse = vector.get(SPARSE_VECTOR_NAME)
+                    vector = vector[VECTOR_NAME]
+                collection.upsert(
+                    document.id,
+                    self._normalize(np.asarray(vector, dtype=np.float32)),
+                    dict(document.payload or {}),
+                    dict(zip(sparse.indices, sparse.values)) if sparse else None,
+                )
+            self._persist(collection_name)
+        logging.info(
+            f"Added {len(documents)} documents to collection '{collection_name}'."
+        )
+
+    def delete_documents(self, collection_name: str, ids: list):
+        """
+        Delete documents from a collection by id.
+        :param collection_name: Name of the collection to delete documents from.
+        :param ids: IDs of the documents to delete.
+        """
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            removed = collection.delete(set(ids))
+            if removed:
+                self._persist(collection_name)
+        logging.info(
+            f"Deleted {removed} documents from collection '{collection_name}'."
+        )
+
+    def search(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ):
+        """
+        Perform a cosine similarity search in a collection.
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Embedding of the query to search for.
+        :param k: Number of nearest neighbors to return.
+        :param filters: Optional payload values the results must match.
+        :return: List of payloads of the most similar documents, best first.
+        """
+        return self.search_batch(collection_name, [query_embedding], k, filters)[0]
+
+    def search_batch(
+        self,
+        collection_name: str,
+        query_embeddings: list[list],
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        """
+        Perform several cosine similarity searches with one matrix-matrix product.
+        :param collection_name: Name of the collection to search in.
+        :param query_embeddings: One embedding per query.
+        :param k: Number of nearest neighbors to return for each query.
+        :param filters: Optional payload values the results must match.
+        :return: One list of payloads per query, best first.
+        """
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            rows = collection.matching_rows(filters)
+            candidates = collection.matrix if rows is None else collection.matrix[rows]
+            if candidates.shape[0] == 0 or k <= 0:
+                return [[] for _ in query_embeddings]
+            if len(query_embeddings) == 0:
+                return []
+
+            queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32))
+            scores = candidates @ queries.T
+            results = []
+            for column in range(scores.shape[1]):
+                top = self._top_k(scores[:, column], k)
+                if rows is not None:
+                    top = rows[top]
+                results.append([dict(collection.payloads[i]) for i in top])
+            return results
+
+    def sparse_search(
+        self,
+        collection_name: str,
+        sparse_query: SparseEmbedding,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[dict]:
+        """
+        Perform a BM25 search over the collection's sparse vectors.
+        :param collection_name: Name of the collection to search in.
+        :param sparse_query: BM25 encoding of the query.
+        :param k: Number of documents to return.
+        :param filters: Optional payload values the results must match.
+        :return: List of payloads sharing terms with the query, best first.
+        """
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            rows = self._sparse_rows(collection, sparse_query, k, filters)
+            return [dict(collection.payloads[i]) for i in rows]
+
+    def search_with_vectors(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        k: int = 5,
+        filters: Optional[dict] = None,
+        sparse_query: Optional[SparseEmbedding] = None,
+    ) -> list[tuple[dict, list[float]]]:
+        """
+        Perform a cosine similarity search that also returns the stored vectors,
+        fused with a BM25 search when a sparse query is given.
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Dense embedding of the query.
+        :param k: Number of documents to return.
+        :param filters: Optional payload values the results must match.
+        :param sparse_query: Optional BM25 encoding of the query.
+        :return: List of (payload, normalized vector) pairs, best first.
+        """
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            rows = collection.matching_rows(filters)
+            candidates = collection.matrix if rows is None else collection.matrix[rows]
+            if candidates.shape[0] == 0 or k <= 0:
+                return []
+            query = self._normalize(np.asarray(query_embedding, dtype=np.float32))
+            top = self._top_k(candidates @ query, k)
+            ranked = [int(row) for row in (top if rows is None else rows[top])]
+            if sparse_query is not None:
+                sparse_rows = self._sparse_rows(collection, sparse_query, k, filters)
+                ranked = reciprocal_rank_fusion(
+                    [ranked, sparse_rows], k, key=lambda row: row
+                )
+            return [
+                (dict(collection.payloads[row]), collection.matrix[row].tolist())
+                for row in ranked
+            ]
+
+    def _sparse_rows(
+        self,
+        collection: NumpyCollection,
+        sparse_query: SparseEmbedding,
+        k: int,
+        filters: Optional[dict],
+    ) -> list[int]:
+        """
+        Returns the rows with the k best BM25 scores, best first.
+        """
+        if collection.size == 0 or k <= 0:
+            return []
+        scores = collection.sparse_scores(sparse_query)
+        rows = collection.matching_rows(filters)
+        if rows is None:
+            rows = np.arange(collection.size)
+        rows = rows[scores[rows] > 0]
+        if rows.shape[0] == 0:
+            return []
+        return [int(row) for row in rows[self._top_k(scores[rows], k)]]
+
+    def get_all_documents(self, collection_name: str, filters: Optional[dict] = None):
+        """
+        Retrieve all documents from a collection.
+        :param collection_name: Name of the collection to retrieve documents from.
+        :param filters: Optional payload values the documents must match.
+        :return: List of all payloads in the collection.
+        """
+        return [
+            document
+            for page in self.iter_documents(collection_name, filters=filters)
+            for document in page
+        ]
+
+    def iter_documents(
+        self,
+        collection_name: str,
+        page_size: Optional[int] = None,
+        fields: Optional[list[str]] = None,
+        filters: Optional[dict] = None,
+    ) -> Iterator[list[dict]]:
+        """
+        Yield the documents of a collection page by page.
+        :param collection_name: Name of the collection to retrieve documents from.
+        :param page_size: Maximum number of documents per page.
+        :param fields: Payload fields to return, or None for the whole payload.
+        :param filters: Optional payload values the documents must match.
+        :return: Iterator over pages of payloads.
+        """
+        with self._lock:
+            collection = self._get_collection(collection_name)
+            rows = collection.matching_rows(filters)
+            # A snapshot, so that writes between pages do not shift the rows.
+            payloads = (
+                list(collection.payloads)
+                if rows is None
+                else [collection.payloads[i] for i in rows]
+            )
+        page_size = page_size or len(payloads) or 1
+        for start in range(0, len(payloads), page_size):
+            yield [
+                {field: payload[field] for field in fields if field in payload}
+                if fields
+                else dict(payload)
+                for payload in payloads[start : start + page_size]
+            ]
+
+    @staticmethod
+    def trip_step_to_document(
+        dto: TripStepDTO,
+        embedding: list[float],
+        sparse: Optional[SparseEmbedding] = None,
+    ):
+        """
+        Convert a TripStepDTO to a PointStruct, with the same payload as Qdrant storage.
+        :param dto: TripStepDTO object containing trip step data.
+        :param embedding: Embedding vector for the trip step.
+        :param sparse: Optional BM25 sparse vector stored for hybrid search.
+        :return: PointStruct object ready for storage.
+        """
+        return step_point(dto, embedding, sparse)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.clip(norms, 1e-12, None)
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        Returns the indices of the k highest scores, best first.
+        """
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])]
+
+    def _paths(self, collection_name: str) -> tuple[str, str]:
+        base = os.path.join(self.storage_path, collection_name)
+        return f"{base}.npy", f"{base}.json"
+
+    @contextmanager
+    def bulk_writes(self) -> Iterator[None]:
+        """
+        Defers persistence to the end of the block: each collection written inside
+        it is saved once, instead of rewriting its files on every add_documents.
+        """
+        with self._lock:
+            self._bulk_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._bulk_depth -= 1
+                if self._bulk_depth == 0:
+                    for collection_name in self._dirty:
+                        self._write(collection_name)
+                    self._dirty.clear()
+
+    def _persist(self, collection_name: str) -> None:
+        """
+        Writes a collection to disk, if a storage path is configured. Inside
+        bulk_writes the write is postponed to the end of the block.
+        """
+        if not self.storage_path:
+            return
+        if self._bulk_depth:
+            self._dirty.add(collection_name)
+            return
+        self._write(collection_name)
+
+    def _write(self, collection_name: str) -> None:
+        """
+        Saves a collection as a .npy/.json pair.
+        """
+        collection = self.collections[collection_name]
+        vectors_path, payloads_path = self._paths(collection_name)
+        np.save(vectors_path, collection.matrix)
+        with open(payloads_path, "w") as f:
+            json.dump(
+                {
+                    "embedding_size": collection.embedding_size,
+                    "ids": collection.ids,
+                    "payloads": collection.payloads,
+                    "sparse": [
+                        [list(vector), list(vector.values())] if vector else None
+                        for vector in collection.sparse
+                    ],
+                },
+                f,
+            )
+
+    def _load_collections(self) -> None:
+        """
+        Memory-maps every persisted collection found in the storage path.
+        """
+        for file_name in os.listdir(self.storage_path):
+            if not file_name.endswith(".json"):
+                continue
+            collection_name = file_name[: -len(".json")]
+            vectors_path, payloads_path = self._paths(collection_name)
+            with open(payloads_path, "r") as f:
+                data = json.load(f)
+
+            collection = NumpyCollection(data["embedding_size"], capacity=0)
+            collection.vectors = np.load(vectors_path, mmap_mode="r")
+            collection.ids = data["ids"]
+            collection.payloads = data["payloads"]
+            collection.sparse = [
+                dict(zip(*vector)) if vector else None
+                for vector in data.get("sparse", [None] * len(data["ids"]))
+            ]
+            collection.rows = {point_id: i for i, point_id in enumerate(data["ids"])}
+            self.collections[collection_name] = collection
+            logging.info(
+                f"Loaded collection '{collection_name}' with {collection.size} documents."
+            )
@@ -1,16 +1,36 @@
 import logging
+from typing import AsyncIterator, Iterator, Optional
 
 from app.core.settings import QdrantConfig
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
-from qdrant_client.models import PointStruct
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import GeoIndexParams, KeywordIndexParams
+from qdrant_client.models import PointStruct, PointIdsList
 
 from app.data.storage.vector_store_base import VectorStoreBase
-from app.data.dtos.trip import TripStepDTO
-from app.core.exceptions.custom_exceptions import (
-    QdrantClientError,
-    CollectionNotFoundError,
+from app.data.storage.collection_cache import CollectionMetadataCache
+from app.data.storage.async_qdrant_client import AsyncQdrantClientWrapper
+from app.data.storage.qdrant_filters import to_qdrant_filter
+from app.data.storage.step_documents import step_point
+from app.data.storage.qdrant_errors import (
+    mark_missing,
+    raise_if_not_found,
+    search_error,
+)
+from app.data.storage.qdrant_params import (
+    SPARSE_VECTOR_NAME,
+    batch_request,
+    dense_search_query,
+    hybrid_search_query,
+    search_params,
+    sparse_search_query,
+    sparse_vector_params,
+    vector_params,
+    vector_query,
 )
+from app.data.dtos.trip import TripStepDTO
+from app.embeddings.bm25_encoder import SparseEmbedding
+from app.core.exceptions.custom_exceptions import QdrantClientError
 
 
 class QdrantClientWrapper(VectorStoreBase):
@@ -26,23 +46,87 @@ class QdrantClientWrapper(VectorStoreBase):
 
     def __init__(self, config: QdrantConfig):
         if not self._initialized:
+            self.config = config
             self.client = QdrantClient(url=config.qdrant_url)
+            self._async_client = None
+            self.search_params = search_params(config)
+            self.collection_cache = CollectionMetadataCache(
+                ttl_seconds=config.collection_cache_ttl
+            )
             self._initialized = True
             logging.info(f"QdrantClient initialized with URL: {config.qdrant_url}")
 
+    @property
+    def async_client(self) -> AsyncQdrantClientWrapper:
+        """
+        The async client used by asearch and aget_all_documents, created on first use.
+        It shares this wrapper's collection cache.
+        """
+        if self._async_client is None:
+            self._async_client = AsyncQdrantClientWrapper(
+                self.config, collection_cache=self.collection_cache
+            )
+        return self._async_client
+
     def collection_exists(self, collection_name: str) -> bool:
         """
         Check if a collection exists in the Qdrant vector store.
+        The answer is cached for collection_cache_ttl seconds.
         :param collection_name: Name of the collection to check.
         :return: True if the collection exists, False otherwise.
         """
-        return self.client.collection_exists(collection_name)
+        cached = self.collection_cache.get(collection_name)
+        if cached is not None and "exists" in cached:
+            return cached["exists"]
 
-    def create_collection(self, collection_name: str, embedding_size: int):
+        exists = self.client.collection_exists(collection_name)
+        self.collection_cache.update(collection_name, exists=exists)
+        return exists
+
+    def get_collection_info(self, collection_name: str) -> dict:
+        """
+        Get the vector size, point count and sparse vector support of a collection.
+        The answer is cached for collection_cache_ttl seconds.
+        :param collection_name: Name of the collection.
+        :return: A dictionary with the exists, vector_size, points_count and
+            sparse_vectors fields.
         """
-        Create a new collection in the Qdrant vector store.
+        cached = self.collection_cache.get(collection_name)
+        if (
+            cached is not None
+            and cached.get("points_count") is not None
+            and "sparse_vectors" in cached
+        ):
+            return cached
+
+        try:
+            info = self.client.get_collection(collection_name)
+        except UnexpectedResponse as e:
+            raise_if_not_found(e, collection_name, self.collection_cache)
+            raise QdrantClientError(
+                f"Error getting collection '{collection_name}': {e}"
+            )
+        vectors = info.config.params.vectors
+        vector_params = vectors.get("description") if isinstance(vectors, dict) else vectors
+        metadata = {
+            "exists": True,
+            "vector_size": vector_params.size if vector_params else None,
+            "points_count": info.points_count,
+            "sparse_vectors": SPARSE_VECTOR_NAME
+            in (info.config.params.sparse_vectors or {}),
+        }
+        self.collection_cache.update(collection_name, **metadata)
+        return metadata
+
+    def create_collection(
+        self, collection_name: str, embedding_size: int, sparse_vectors: bool = False
+    ):
+        """
+        Create a new collection in the Qdrant vector store, with the quantization
+        and HNSW settings of QdrantConfig.
         :param collection_name: Name of the collection to create.
         :param embedding_size: Size of the embedding vectors.
+        :param sparse_vectors: Whether to add a "bm25" sparse vector for hybrid search.
         :return: Confirmation message.
         """
         if not self.collection_exists(collection_name):
@@ -50,21 +134,74 @@ class QdrantClientWrapper(VectorStoreBase):
                 self.client.create_collection(
                     collection_name=collection_name,
                     vectors_config={
-                        "description": VectorParams(
-                            size=embedding_size, distance=Distance.COSINE
-                        )
+                        "description": vector_params(self.config, embedding_size)
                     },
+                    sparse_vectors_config=(
+                        {SPARSE_VECTOR_NAME: sparse_vector_params()}
+                        if sparse_vectors
+                        else None
+                    ),
                 )
             except Exception as e:
+                self.collection_cache.invalidate(collection_name)
                 raise QdrantClientError(
                     f"Error creating collection '{collection_name}': {e}"
                 )
+            self.collection_cache.update(
+                collection_name, exists=True, vector_size=embedding_size, points_count=0
+            )
             logging.info(
                 f"Collection '{collection_name}' created successfully with embedding size {embedding_size}."
             )
         else:
             logging.info(f"Collection '{collection_name}' already exists.")
 
+    def delete_collection(self, collection_name: str):
+        """
+        Delete a collection from the Qdrant vector store.
+        :param collection_name: Name of the collection to delete.
+        """
+        try:
+            self.client.delete_collection(collection_name=collection_name)
+        except Exception as e:
+            self.collection_cache.invalidate(collection_name)
+            raise QdrantClientError(
+                f"Error deleting collection '{collection_name}': {e}"
+            )
+        mark_missing(self.collection_cache, collection_name)
+        logging.info(f"Collection '{collection_name}' deleted.")
+
+    def create_payload_index(
+        self,
+        collection_name: str,
+        field_name: str,
+        is_tenant: bool = False,
+        field_type: str = "keyword",
+    ):
+        """
+        Create an index on a payload field so that filtering on it stays fast.
+        :param collection_name: Name of the collection.
+        :param field_name: Name of the payload field to index.
+        :param is_tenant: Whether the field partitions the collection by tenant, which
+            lets Qdrant co-locate each tenant's points on disk.
+        :param field_type: "keyword" for exact matches, "geo" for lat/lon points.
+        """
+        if field_type == "geo":
+            field_schema = GeoIndexParams(type="geo")
+        else:
+            field_schema = KeywordIndexParams(type="keyword", is_tenant=is_tenant)
+        try:
+            self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=field_schema,
+            )
+        except Exception as e:
+            raise QdrantClientError(
+                f"Error indexing field '{field_name}' of collection '{collection_name}': {e}"
+            )
+        logging.info(f"Indexed field '{field_name}' of collection '{collection_name}'.")
+
     def add_documents(self, collection_name: str, documents: list[PointStruct]):
         """
         Add documents to a specified collection in the Qdrant vector store.
@@ -76,33 +213,66 @@ class QdrantClientWrapper(VectorStoreBase):
         try:
             self.client.upload_points(collection_name=collection_name, points=documents)
         except Exception as e:
+            self.collection_cache.invalidate(collection_name)
             raise QdrantClientError(
                 f"Error adding documents to collection '{collection_name}': {e}"
             )
+        self.collection_cache.update(collection_name, exists=True, points_count=None)
         logging.info(
             f"Added {len(documents)} documents to collection '{collection_name}'."
         )
 
-    def search(self, collection_name: str, query_embedding: list, k: int = 5):
+    def delete_documents(self, collection_name: str, ids: list):
+        """
+        Delete documents from a collection by id.
+        :param collection_name: Name of the collection to delete documents from.
+        :param ids: IDs of the documents to delete.
+        """
+        if not ids:
+            return
+        try:
+            self.client.delete(
+                collection_name=collection_name,
+                points_selector=PointIdsList(points=ids),
+            )
+        except UnexpectedResponse as e:
+            raise_if_not_found(e, collection_name, self.collection_cache)
+            raise QdrantClientError(
+                f"Error deleting documents from collection '{collection_name}': {e}"
+            )
+        except Exception as e:
+            raise QdrantClientError(
+                f"Error deleting documents from collection '{collection_name}': {e}"
+            )
+        self.collection_cache.update(collection_name, points_count=None)
+        logging.info(
+            f"Deleted {len(ids)} documents from collection '{collection_name}'."
+        )
+
+    def search(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ):
         """
         Perform a similarity search in a specified collection.
         :param collection_name: Name of the collection to search in.
         :param query_embedding: Embedding of the query to search for.
         :param k: Number of nearest neighbors to return.
+        :param filters: Optional payload values the results must match.
         :return: List of similar documents and their IDs.
         """
-        if not self.collection_exists(collection_name):
-            raise CollectionNotFoundError(collection_name)
         try:
             results = self.client.query_points(
                 collection_name=collection_name,
-                query=query_embedding,
-                using="description",
-                limit=k,
+                **dense_search_query(
+                    query_embedding, k, to_qdrant_filter(filters), self.search_params
+                ),
             )
         except Exception as e:
-            logging.error(f"Error during search in collection '{collection_name}': {e}")
-            raise QdrantClientError("Qdrant search error")
+            raise search_error(e, collection_name, self.collection_cache)
         if not results:
             logging.info(
                 f"No results found for query in collection '{collection_name}'."
@@ -112,60 +282,391 @@ class QdrantClientWrapper(VectorStoreBase):
         results_payload = [point.payload for point in results.points]
         return results_payload
 
-    def get_all_documents(self, collection_name: str, batch_size: int = 50):
+    def search_batch(
+        self,
+        collection_name: str,
+        query_embeddings: list[list],
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[list[dict]]:
         """
-        Retrieve all documents from a specified collection.
+        Perform several similarity searches in one query_batch_points round-trip.
+        :param collection_name: Name of the collection to search in.
+        :param query_embeddings: One embedding per query.
+        :param k: Number of nearest neighbors to return for each query.
+        :param filters: Optional payload values the results must match.
+        :return: One list of similar documents per query, in query order.
+        """
+        if not query_embeddings:
+            return []
+        query_filter = to_qdrant_filter(filters)
+        try:
+            responses = self.client.query_batch_points(
+                collection_name=collection_name,
+                requests=[
+                    batch_request(
+                        dense_search_query(
+                            query_embedding, k, query_filter, self.search_params
+                        )
+                    )
+                    for query_embedding in query_embeddings
+                ],
+            )
+        except Exception as e:
+            raise search_error(
+                e, collection_name, self.collection_cache, "batch search"
+            )
+        return [[point.payload for point in response.points] for response in responses]
+
+    def sparse_search(
+        self,
+        collection_name: str,
+        sparse_query: SparseEmbedding,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[dict]:
+        """
+        Perform a BM25 search over the collection's "bm25" sparse vectors.
+        :param collection_name: Name of the collection to search in.
+        :param sparse_query: BM25 encoding of the query.
+        :param k: Number of documents to return.
+        :param filters: Optional payload values the results must match.
+        :return: List of documents sharing terms with the query, best first.
+        """
+        try:
+            results = self.client.query_points(
+                collection_name=collection_name,
+                **sparse_search_query(sparse_query, k, to_qdrant_filter(filters)),
+            )
+        except Exception as e:
+            raise search_error(
+                e, collection_name, self.collection_cache, "sparse search"
+            )
+        return [point.payload for point in results.points]
+
+    def hybrid_search(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        sparse_query: SparseEmbedding,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[dict]:
+        """
+        Perform a dense and a BM25 search fused with reciprocal rank fusion, in a
+        single query_points request.
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Dense embedding of the query.
+        :param sparse_query: BM25 encoding of the query.
+        :param k: Number of documents to return.
+        :param filters: Optional payload values the results must match.
+        :return: List of documents, best first.
+        """
+        try:
+            results = self.client.query_points(
+                collection_name=collection_name,
+                **hybrid_search_query(
+                    query_embedding,
+                    sparse_query,
+                    k,
+                    to_qdrant_filter(filters),
+                    self.search_params,
+                ),
+            )
+        except Exception as e:
+            raise search_error(
+                e, collection_name, self.collection_cache, "hybrid search"
+            )
+        return [point.payload for point in results.points]
+
+    def hybrid_search_batch(
+        self,
+        collection_name: str,
+        query_embeddings: list[list],
+        sparse_queries: list[SparseEmbedding],
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        """
+        Perform several hybrid searches in one query_batch_points round-trip.
+        :param collection_name: Name of the collection to search in.
+        :param query_embeddings: One dense embedding per query.
+        :param sparse_queries: One BM25 encoding per query.
+        :param k: Number of documents to return for each query.
+        :param filters: Optional payload values the results must match.
+        :return: One list of documents per query, in query order.
+        """
+        if not query_embeddings:
+            return []
+        query_filter = to_qdrant_filter(filters)
+        try:
+            responses = self.client.query_batch_points(
+                collection_name=collection_name,
+                requests=[
+                    batch_request(
+                        hybrid_search_query(
+                            query_embedding,
+                            sparse_query,
+                            k,
+                            query_filter,
+                            self.search_params,
+                        )
+                    )
+                    for query_embedding, sparse_query in zip(
+                        query_embeddings, sparse_queries
+                    )
+                ],
+            )
+        except Exception as e:
+            raise search_error(
+                e, collection_name, self.collection_cache, "batch hybrid search"
+            )
+        return [[point.payload for point in response.points] for response in responses]
+
+    def search_with_vectors(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        k: int = 5,
+        filters: Optional[dict] = None,
+        sparse_query: Optional[SparseEmbedding] = None,
+    ) -> list[tuple[dict, list[float]]]:
+        """
+        Perform a similarity search that also returns each point's "description" vector.
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Dense embedding of the query.
+        :param k: Number of documents to return.
+        :param filters: Optional payload values the results must match.
+        :param sparse_query: Optional BM25 encoding of the query, to fuse a
+            sparse search in as hybrid_search does.
+        :return: List of (payload, vector) pairs, best first.
+        """
+        try:
+            results = self.client.query_points(
+                collection_name=collection_name,
+                **vector_query(
+                    query_embedding,
+                    sparse_query,
+                    k,
+                    to_qdrant_filter(filters),
+                    self.search_params,
+                ),
+            )
+        except Exception as e:
+            raise search_error(e, collection_name, self.collection_cache)
+        return [
+            (point.payload, point.vector["description"]) for point in results.points
+        ]
+
+    async def asearch(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ):
+        """
+        Perform a similarity search without blocking the event loop.
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Embedding of the query to search for.
+        :param k: Number of nearest neighbors to return.
+        :param filters: Optional payload values the results must match.
+        :return: List of similar documents.
+        """
+        return await self.async_client.search(
+            collection_name, query_embedding, k, filters
+        )
+
+    async def asearch_batch(
+        self,
+        collection_name: str,
+        query_embeddings: list[list],
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        """
+        Perform several similarity searches in one round-trip without blocking the event loop.
+        :param collection_name: Name of the collection to search in.
+        :param query_embeddings: One embedding per query.
+        :param k: Number of nearest neighbors to return for each query.
+        :param filters: Optional payload values the results must match.
+        :return: One list of similar documents per query, in query order.
+        """
+        return await self.async_client.search_batch(
+            collection_name, query_embeddings, k, filters
+        )
+
+    async def ahybrid_search(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        sparse_query: SparseEmbedding,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[dict]:
+        """
+        Perform a hybrid search without blocking the event loop.
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Dense embedding of the query.
+        :param sparse_query: BM25 encoding of the query.
+        :param k: Number of documents to return.
+        :param filters: Optional payload values the results must match.
+        :return: List of documents, best first.
+        """
+        return await self.async_client.hybrid_search(
+            collection_name, query_embedding, sparse_query, k, filters
+        )
+
+    async def ahybrid_search_batch(
+        self,
+        collection_name: str,
+        query_embeddings: list[list],
+        sparse_queries: list[SparseEmbedding],
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[list[dict]]:
+        """
+        Perform several hybrid searches in one round-trip without blocking the event loop.
+        :param collection_name: Name of the collection to search in.
+        :param query_embeddings: One dense embedding per query.
+        :param sparse_queries: One BM25 encoding per query.
+        :param k: Number of documents to return for each query.
+        :param filters: Optional payload values the results must match.
+        :return: One list of documents per query, in query order.
+        """
+        return await self.async_client.hybrid_search_batch(
+            collection_name, query_embeddings, sparse_queries, k, filters
+        )
+
+    async def asearch_with_vectors(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        k: int = 5,
+        filters: Optional[dict] = None,
+        sparse_query: Optional[SparseEmbedding] = None,
+    ) -> list[tuple[dict, list[float]]]:
+        """
+        Perform a search returning stored vectors without blocking the event loop.
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Dense embedding of the query.
+        :param k: Number of documents to return.
+        :param filters: Optional payload values the results must match.
+        :param sparse_query: Optional BM25 encoding of the query for hybrid ranking.
+        :return: List of (payload, vector) pairs, best first.
+        """
+        return await self.async_client.search_with_vectors(
+            collection_name, query_embedding, k, filters, sparse_query
+        )
+
+    async def aget_all_documents(
+        self,
+        collection_name: str,
+        batch_size: Optional[int] = None,
+        filters: Optional[dict] = None,
+    ):
+        """
+        Retrieve all documents from a collection without blocking the event loop.
         :param collection_name: Name of the collection to retrieve documents from.
+        :param batch_size: Number of points fetched per scroll request.
+        :param filters: Optional payload values the documents must match.
         :return: List of all documents in the collection.
         """
-        if not self.collection_exists(collection_name):
-            raise CollectionNotFoundError(collection_name)
-        try:
-            all_documents = []
-            next_offset = None
+        return await self.async_client.get_all_documents(
+            collection_name, batch_size, filters
+        )
 
-            while True:
+    async def aiter_documents(
+        self,
+        collection_name: str,
+        page_size: Optional[int] = None,
+        fields: Optional[list[str]] = None,
+        filters: Optional[dict] = None,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Yield the documents of a collection page by page without blocking the event loop.
+        :param collection_name: Name of the collection to retrieve documents from.
+        :param page_size: Number of points fetched per scroll request.
+        :param fields: Payload fields to return, or None for the whole payload.
+        :param filters: Optional payload values the documents must match.
+        :return: Async iterator over pages of payloads.
+        """
+        async for page in self.async_client.iter_documents(
+            collection_name, page_size, fields, filters
+        ):
+            yield page
+
+    def iter_documents(
+        self,
+        collection_name: str,
+        page_size: Optional[int] = None,
+        fields: Optional[list[str]] = None,
+        filters: Optional[dict] = None,
+    ) -> Iterator[list[dict]]:
+        """
+        Yield the documents of a collection page by page, as each scroll request returns.
+        :param collection_name: Name of the collection to retrieve documents from.
+        :param page_size: Number of points fetched per scroll request.
+        :param fields: Payload fields to return, or None for the whole payload.
+        :param filters: Optional payload values the documents must match.
+        :return: Iterator over pages of payloads.
+        """
+        scroll_filter = to_qdrant_filter(filters)
+        next_offset = None
+        while True:
+            try:
                 points, next_offset = self.client.scroll(
                     collection_name=collection_name,
-                    with_payload=True,
-                    limit=batch_size,
+                    scroll_filter=scroll_filter,
+                    with_payload=fields if fields else True,
+                    limit=page_size or self.config.scroll_page_size,
                     offset=next_offset,
                 )
+            except Exception as e:
+                raise_if_not_found(e, collection_name, self.collection_cache)
+                logging.error(
+                    f"Error retrieving documents from collection '{collection_name}': {e}"
+                )
+                raise e
 
-                if not points:
-                    break
+            if not points:
+                return
 
-                all_documents.extend([point.payload for point in points])
+            yield [point.payload for point in points]
 
-                if not next_offset:
-                    break
+            if not next_offset:
+                return
 
-            return all_documents
-        except Exception as e:
-            logging.error(
-                f"Error retrieving documents from collection '{collection_name}': {e}"
-            )
-            raise e
+    def get_all_documents(
+        self,
+        collection_name: str,
+        batch_size: Optional[int] = None,
+        filters: Optional[dict] = None,
+    ):
+        """
+        Retrieve all documents from a specified collection.
+        :param collection_name: Name of the collection to retrieve documents from.
+        :param batch_size: Number of points fetched per scroll request.
+        :param filters: Optional payload values the documents must match.
+        :return: List of all documents in the collection.
+        """
+        all_documents = []
+        for page in self.iter_documents(
+            collection_name, page_size=batch_size, filters=filters
+        ):
+            all_documents.extend(page)
+        return all_documents
 
     @staticmethod
-    def trip_step_to_document(dto: TripStepDTO, embedding: list[float]) -> PointStruct:
+    def trip_step_to_document(
+        dto: TripStepDTO,
+        embedding: list[float],
+        sparse: Optional[SparseEmbedding] = None,
+    ) -> PointStruct:
         """Convert a TripStepDTO to a PointStruct for Qdrant storage.
         :param dto: TripStepDTO object containing trip step data.
         :param embedding: Embedding vector for the trip step.
+        :param sparse: Optional BM25 sparse vector, stored as the "bm25" vector.
         :return: PointStruct object ready for Qdrant storage.
         """
-        return PointStruct(
-            id=dto.id,  # or uuid.uuid4().int if you want unique auto IDs
-            vector={"description": embedding},
-            payload={
-                "display_name": dto.display_name,
-                "description": dto.description,
-                "location_name": dto.location_name,
-                "lat": dto.lat,
-                "lon": dto.lon,
-                "detail": dto.detail,
-                "country_code": dto.country_code,
-                "weather_condition": dto.weather_condition,
-                "weather_temperature": dto.weather_temperature,
-            },
-        )
+        return step_point(dto, embedding, sparse)
@@ -0,0 +1,71 @@
+import logging
+
+import grpc
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from app.data.storage.collection_cache import CollectionMetadataCache
+from app.core.exceptions.custom_exceptions import (
+    QdrantClientError,
+    CollectionNotFoundError,
+)
+
+
+def is_not_found(error: Exception) -> bool:
+    """
+    Checks whether an error is Qdrant's "collection not found" over REST or gRPC.
+    :param error: The error raised by the Qdrant client.
+    :return: True if the collection does not exist.
+    """
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 404
+    if isinstance(error, grpc.RpcError):
+        return error.code() == grpc.StatusCode.NOT_FOUND
+    return False
+
+
+def mark_missing(cache: CollectionMetadataCache, collection_name: str) -> None:
+    """
+    Records that a collection does not exist, dropping any other cached metadata.
+    :param cache: The collection metadata cache of the client.
+    :param collection_name: Name of the collection.
+    """
+    cache.invalidate(collection_name)
+    cache.update(collection_name, exists=False)
+
+
+def raise_if_not_found(
+    error: Exception, collection_name: str, cache: CollectionMetadataCache
+) -> None:
+    """
+    Translates a "collection not found" error into CollectionNotFoundError and
+    records the collection as missing.
+    :param error: The error raised by the Qdrant client.
+    :param collection_name: Name of the collection the operation targeted.
+    :param cache: The collection metadata cache of the client.
+    """
+    if is_not_found(error):
+        mark_missing(cache, collection_name)
+        raise CollectionNotFoundError(collection_name)
+
+
+def search_error(
+    error: Exception,
+    collection_name: str,
+    cache: CollectionMetadataCache,
+    operation: str = "search",
+) -> QdrantClientError:
+    """
+    Translates an error raised by a search request. Missing collections raise
+    CollectionNotFoundError; anything else is logged and returned for the caller
+    to raise.
+    :param error: The error raised by the Qdrant client.
+    :param collection_name: Name of the collection that was searched.
+    :param cache: The collection metadata cache of the client.
+    :param operation: Name of the search, for the log message.
+    :return: The QdrantClientError to raise.
+    """
+    raise_if_not_found(error, collection_name, cache)
+    logging.error(
+        f"Error during {operation} in collection '{collection_name}': {error}"
+    )
+    return QdrantClientError("Qdrant search error")
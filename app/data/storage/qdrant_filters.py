@@ -0,0 +1,51 @@
+from typing import Optional
+
+from qdrant_client.models import (
+    FieldCondition,
+    Filter,
+    GeoBoundingBox as QdrantGeoBoundingBox,
+    GeoPoint,
+    GeoRadius as QdrantGeoRadius,
+    MatchValue,
+)
+
+from app.data.dtos.geo import GeoBoundingBox, GeoRadius
+
+
+def to_qdrant_condition(key: str, value) -> FieldCondition:
+    """
+    Converts one filter value into a Qdrant field condition: an equality match,
+    or a geo condition for GeoRadius and GeoBoundingBox values.
+    """
+    if isinstance(value, GeoRadius):
+        return FieldCondition(
+            key=key,
+            geo_radius=QdrantGeoRadius(
+                center=GeoPoint(lat=value.lat, lon=value.lon),
+                radius=value.radius_km * 1000,
+            ),
+        )
+    if isinstance(value, GeoBoundingBox):
+        return FieldCondition(
+            key=key,
+            geo_bounding_box=QdrantGeoBoundingBox(
+                top_left=GeoPoint(lat=value.max_lat, lon=value.min_lon),
+                bottom_right=GeoPoint(lat=value.min_lat, lon=value.max_lon),
+            ),
+        )
+    return FieldCondition(key=key, match=MatchValue(value=value))
+
+
+def to_qdrant_filter(filters: Optional[dict]) -> Optional[Filter]:
+    """
+    Converts a dictionary of payload field -> value pairs into a Qdrant filter
+    that matches documents equal on every field. Geo values match documents whose
+    point lies in the area instead.
+    :param filters: Payload values to match, or None.
+    :return: The Qdrant filter, or None when there is nothing to filter on.
+    """
+    if not filters:
+        return None
+    return Filter(
+        must=[to_qdrant_condition(key, value) for key, value in filters.items()]
+    )
@@ -0,0 +1,251 @@
+from typing import Any, Optional
+
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Distance,
+    Filter,
+    Fusion,
+    FusionQuery,
+    HnswConfigDiff,
+    Modifier,
+    Prefetch,
+    QueryRequest,
+    QuantizationConfig,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    SparseVector,
+    SparseVectorParams,
+    VectorParams,
+)
+
+from app.core.settings import QdrantConfig
+from app.embeddings.bm25_encoder import SparseEmbedding
+
+NO_QUANTIZATION = "none"
+SCALAR_QUANTIZATION = "scalar"
+BINARY_QUANTIZATION = "binary"
+QUANTIZATION_TYPES = (NO_QUANTIZATION, SCALAR_QUANTIZATION, BINARY_QUANTIZATION)
+
+SPARSE_VECTOR_NAME = "bm25"
+
+
+def quantization_config(config: QdrantConfig) -> Optional[QuantizationConfig]:
+    """
+    Returns the quantization configured for new collections.
+    :param config: The Qdrant settings.
+    :return: Scalar (int8) or binary quantization, or None.
+    """
+    if config.quantization not in QUANTIZATION_TYPES:
+        raise ValueError(
+            f"Unknown quantization '{config.quantization}'. Available types: {list(QUANTIZATION_TYPES)}"
+        )
+    if config.quantization == SCALAR_QUANTIZATION:
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=0.99,
+                always_ram=config.quantization_always_ram,
+            )
+        )
+    if config.quantization == BINARY_QUANTIZATION:
+        return BinaryQuantization(
+            binary=BinaryQuantizationConfig(always_ram=config.quantization_always_ram)
+        )
+    return None
+
+
+def vector_params(config: QdrantConfig, embedding_size: int) -> VectorParams:
+    """
+    Returns the parameters of the "description" vector of a new collection.
+    Settings left at their defaults are not sent, so Qdrant's own defaults apply.
+    :param config: The Qdrant settings.
+    :param embedding_size: Size of the embedding vectors.
+    :return: The vector parameters.
+    """
+    hnsw_config = None
+    if config.hnsw_m is not None or config.hnsw_ef_construct is not None:
+        hnsw_config = HnswConfigDiff(
+            m=config.hnsw_m, ef_construct=config.hnsw_ef_construct
+        )
+    return VectorParams(
+        size=embedding_size,
+        distance=Distance.COSINE,
+        on_disk=True if config.vectors_on_disk else None,
+        hnsw_config=hnsw_config,
+        quantization_config=quantization_config(config),
+    )
+
+
+def search_params(config: QdrantConfig) -> Optional[SearchParams]:
+    """
+    Returns the parameters sent with every search.
+    :param config: The Qdrant settings.
+    :return: Rescoring and oversampling for quantized collections and the HNSW
+        search beam, or None when everything is left at Qdrant's defaults.
+    """
+    quantization = None
+    if quantization_config(config) is not None:
+        quantization = QuantizationSearchParams(
+            rescore=config.search_rescore,
+            oversampling=config.search_oversampling,
+        )
+    if quantization is None and config.search_hnsw_ef is None:
+        return None
+    return SearchParams(hnsw_ef=config.search_hnsw_ef, quantization=quantization)
+
+
+def sparse_vector_params() -> SparseVectorParams:
+    """
+    Returns the parameters of the "bm25" sparse vector of a new collection.
+    Stored vectors hold BM25 term frequencies; Qdrant multiplies them by each
+    term's inverse document frequency at query time.
+    :return: The sparse vector parameters.
+    """
+    return SparseVectorParams(modifier=Modifier.IDF)
+
+
+def hybrid_prefetch(
+    query_embedding: list,
+    sparse_query: SparseEmbedding,
+    limit: int,
+    query_filter: Optional[Filter] = None,
+    params: Optional[SearchParams] = None,
+) -> list[Prefetch]:
+    """
+    Returns the dense and sparse sub-queries of a hybrid search, to be fused
+    server-side with a FusionQuery.
+    :param query_embedding: Dense embedding of the query.
+    :param sparse_query: BM25 encoding of the query.
+    :param limit: Number of candidates each sub-query contributes.
+    :param query_filter: Optional filter applied to both sub-queries.
+    :param params: Search parameters of the dense sub-query.
+    :return: The two prefetch queries.
+    """
+    return [
+        Prefetch(
+            query=query_embedding,
+            using="description",
+            filter=query_filter,
+            params=params,
+            limit=limit,
+        ),
+        Prefetch(
+            query=SparseVector(
+                indices=sparse_query.indices, values=sparse_query.values
+            ),
+            using=SPARSE_VECTOR_NAME,
+            filter=query_filter,
+            limit=limit,
+        ),
+    ]
+
+
+def dense_search_query(
+    query_embedding: list,
+    limit: int,
+    query_filter: Optional[Filter] = None,
+    params: Optional[SearchParams] = None,
+) -> dict[str, Any]:
+    """
+    Returns the query_points arguments of a search on the "description" vector.
+    :param query_embedding: Dense embedding of the query.
+    :param limit: Number of points to return.
+    :param query_filter: Optional filter the points must match.
+    :param params: Search parameters of the dense search.
+    :return: Keyword arguments for query_points.
+    """
+    return dict(
+        query=query_embedding,
+        using="description",
+        query_filter=query_filter,
+        search_params=params,
+        limit=limit,
+    )
+
+
+def sparse_search_query(
+    sparse_query: SparseEmbedding,
+    limit: int,
+    query_filter: Optional[Filter] = None,
+) -> dict[str, Any]:
+    """
+    Returns the query_points arguments of a search on the "bm25" sparse vector.
+    :param sparse_query: BM25 encoding of the query.
+    :param limit: Number of points to return.
+    :param query_filter: Optional filter the points must match.
+    :return: Keyword arguments for query_points.
+    """
+    return dict(
+        query=SparseVector(indices=sparse_query.indices, values=sparse_query.values),
+        using=SPARSE_VECTOR_NAME,
+        query_filter=query_filter,
+        limit=limit,
+    )
+
+
+def hybrid_search_query(
+    query_embedding: list,
+    sparse_query: SparseEmbedding,
+    limit: int,
+    query_filter: Optional[Filter] = None,
+    params: Optional[SearchParams] = None,
+) -> dict[str, Any]:
+    """
+    Returns the query_points arguments of a dense and a sparse search fused
+    server-side with reciprocal rank fusion.
+    :param query_embedding: Dense embedding of the query.
+    :param sparse_query: BM25 encoding of the query.
+    :param limit: Number of points to return.
+    :param query_filter: Optional filter applied to both sub-queries.
+    :param params: Search parameters of the dense sub-query.
+    :return: Keyword arguments for query_points.
+    """
+    return dict(
+        prefetch=hybrid_prefetch(
+            query_embedding, sparse_query, limit, query_filter, params
+        ),
+        query=FusionQuery(fusion=Fusion.RRF),
+        limit=limit,
+    )
+
+
+def batch_request(query: dict[str, Any]) -> QueryRequest:
+    """
+    Turns query_points arguments into a request of query_batch_points.
+    :param query: Keyword arguments built for query_points.
+    :return: The equivalent QueryRequest, returning payloads.
+    """
+    query = dict(query)
+    query_filter = query.pop("query_filter", None)
+    params = query.pop("search_params", None)
+    return QueryRequest(**query, filter=query_filter, params=params, with_payload=True)
+
+
+def vector_query(
+    query_embedding: list,
+    sparse_query: Optional[SparseEmbedding],
+    limit: int,
+    query_filter: Optional[Filter] = None,
+    params: Optional[SearchParams] = None,
+) -> dict[str, Any]:
+    """
+    Returns the query_points arguments of a search that returns stored dense
+    vectors: a dense search, or a fused hybrid search if a sparse query is given.
+    :param query_embedding: Dense embedding of the query.
+    :param sparse_query: BM25 encoding of the query, or None.
+    :param limit: Number of points to return.
+    :param query_filter: Optional filter the points must match.
+    :param params: Search parameters of the dense search.
+    :return: Keyword arguments for query_points.
+    """
+    if sparse_query is None:
+        query = dense_search_query(query_embedding, limit, query_filter, params)
+    else:
+        query = hybrid_search_query(
+            query_embedding, sparse_query, limit, query_filter, params
+        )
+    return {**query, "with_vectors": ["description"]}
@@ -0,0 +1,220 @@
+import time
+import uuid
+import argparse
+from typing import Optional
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    CollectionStatus,
+    PointStruct,
+    QuantizationSearchParams,
+    SearchParams,
+)
+
+from app.core.settings import QdrantConfig
+from app.data.storage.qdrant_client import QdrantClientWrapper
+from app.data.storage.qdrant_params import (
+    BINARY_QUANTIZATION,
+    SCALAR_QUANTIZATION,
+    search_params,
+    vector_params,
+)
+
+# Bytes per vector component kept in RAM for each storage format.
+BYTES_PER_COMPONENT = {"float32": 4.0, SCALAR_QUANTIZATION: 1.0, BINARY_QUANTIZATION: 1 / 8}
+
+
+def load_vectors(
+    client: QdrantClient,
+    source_collection: Optional[str],
+    num_points: int,
+    dimension: int,
+) -> np.ndarray:
+    """
+    Reads up to `num_points` stored embeddings, or generates random ones.
+    Real embeddings give a much more faithful recall figure than random vectors.
+    """
+    if not source_collection:
+        return np.random.default_rng(1).standard_normal((num_points, dimension))
+    points, _ = client.scroll(
+        collection_name=source_collection,
+        with_vectors=["description"],
+        with_payload=False,
+        limit=num_points,
+    )
+    return np.array([point.vector["description"] for point in points])
+
+
+def wait_until_indexed(client: QdrantClient, collection_name: str, timeout: float = 300.0):
+    """
+    Waits for Qdrant to finish building the HNSW graph and the quantized vectors.
+    """
+    deadline = time.monotonic() + timeout
+    while client.get_collection(collection_name).status != CollectionStatus.GREEN:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Collection '{collection_name}' is still being indexed.")
+        time.sleep(0.5)
+
+
+def run_queries(
+    client: QdrantClient,
+    collection_name: str,
+    queries: np.ndarray,
+    k: int,
+    params: Optional[SearchParams],
+) -> tuple[list[list], list[float]]:
+    """
+    Runs every query and records its latency.
+    :return: The result ids of each query and the latencies in milliseconds.
+    """
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        response = client.query_points(
+            collection_name=collection_name,
+            query=query.tolist(),
+            using="description",
+            search_params=params,
+            limit=k,
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([point.id for point in response.points])
+    return results, latencies
+
+
+def recall_at_k(results: list[list], ground_truth: list[list]) -> float:
+    """
+    Returns the share of the exact top-k neighbours that a search found.
+    """
+    found = sum(len(set(r) & set(t)) for r, t in zip(results, ground_truth))
+    total = sum(len(t) for t in ground_truth)
+    return found / total if total else 0.0
+
+
+def benchmark(
+    client: QdrantClient,
+    config: QdrantConfig,
+    vectors: np.ndarray,
+    num_queries: int,
+    k: int,
+) -> list[dict]:
+    """
+    Loads `vectors` into a collection laid out with `config`, then compares recall
+    and latency of the float32 HNSW index, the quantized index, and the quantized
+    index with rescoring against an exact search.
+    :param client: A Qdrant client.
+    :param config: Qdrant settings with the quantization and HNSW options to test.
+    :param vectors: The vectors to index, one per row.
+    :param num_queries: Number of queries, sampled from the vectors with some noise.
+    :param k: Number of neighbours per query.
+    :return: One report row per search mode.
+    """
+    num_points, dimension = vectors.shape
+    collection_name = f"quantization_benchmark_{uuid.uuid4().hex[:8]}"
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config={"description": vector_params(config, dimension)},
+    )
+    try:
+        for start in range(0, num_points, 256):
+            client.upsert(
+                collection_name=collection_name,
+                points=[
+                    PointStruct(id=start + i, vector={"description": vector.tolist()})
+                    for i, vector in enumerate(vectors[start : start + 256])
+                ],
+            )
+        wait_until_indexed(client, collection_name)
+
+        rng = np.random.default_rng(2)
+        picks = rng.choice(num_points, size=min(num_queries, num_points), replace=False)
+        queries = vectors[picks] + 0.1 * vectors.std() * rng.standard_normal(
+            (len(picks), dimension)
+        )
+
+        ground_truth, _ = run_queries(
+            client, collection_name, queries, k, SearchParams(exact=True)
+        )
+        modes = {
+            "float32": SearchParams(
+                hnsw_ef=config.search_hnsw_ef,
+                quantization=QuantizationSearchParams(ignore=True),
+            ),
+            f"{config.quantization}": SearchParams(
+                hnsw_ef=config.search_hnsw_ef,
+                quantization=QuantizationSearchParams(rescore=False),
+            ),
+            f"{config.quantization}+rescore": search_params(config),
+        }
+        report = []
+        for mode, params in modes.items():
+            results, latencies = run_queries(
+                client, collection_name, queries, k, params
+            )
+            storage = mode.split("+")[0]
+            report.append(
+                {
+                    "mode": mode,
+                    f"recall@{k}": recall_at_k(results, ground_truth),
+                    "p50_ms": float(np.percentile(latencies, 50)),
+                    "p95_ms": float(np.percentile(latencies, 95)),
+                    "vector_ram_mb": num_points
+                    * dimension
+                    * BYTES_PER_COMPONENT[storage]
+                    / 2**20,
+                }
+            )
+        return report
+    finally:
+        client.delete_collection(collection_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure recall and latency of quantized Qdrant collections against exact search."
+    )
+    parser.add_argument(
+        "--quantization",
+        choices=[SCALAR_QUANTIZATION, BINARY_QUANTIZATION],
+        default=SCALAR_QUANTIZATION,
+    )
+    parser.add_argument("--oversampling", type=float, default=None)
+    parser.add_argument("--hnsw-m", type=int, default=None)
+    parser.add_argument("--hnsw-ef-construct", type=int, default=None)
+    parser.add_argument(
+        "--source-collection",
+        default=None,
+        help="Read vectors from an existing collection instead of generating random ones.",
+    )
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--dimension", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    overrides = {
+        "quantization": args.quantization,
+        "hnsw_m": args.hnsw_m,
+        "hnsw_ef_construct": args.hnsw_ef_construct,
+    }
+    if args.oversampling is not None:
+        overrides["search_oversampling"] = args.oversampling
+    config = QdrantConfig(**overrides)
+    wrapper = QdrantClientWrapper(QdrantConfig())
+    vectors = load_vectors(
+        wrapper.client, args.source_collection, args.points, args.dimension
+    )
+    report = benchmark(wrapper.client, config, vectors, args.queries, args.k)
+
+    for row in report:
+        print(
+            ", ".join(
+                f"{key}: {value:.3f}" if isinstance(value, float) else f"{key}: {value}"
+                for key, value in row.items()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
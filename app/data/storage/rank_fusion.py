@@ -0,0 +1,40 @@
+import json
+from typing import Any, Callable
+
+# Rank offset of reciprocal rank fusion; 60 is the value from the original paper.
+RRF_K = 60
+
+
+def document_key(document: dict) -> Any:
+    """
+    Identifies a stored document by its step and chunk, falling back to its payload.
+    """
+    if "step_id" in document:
+        return document["step_id"], document.get("chunk_index", 0)
+    return json.dumps(document, sort_keys=True, default=str)
+
+
+def reciprocal_rank_fusion(
+    result_lists: list[list],
+    k: int,
+    rrf_k: int = RRF_K,
+    key: Callable[[Any], Any] = document_key,
+) -> list:
+    """
+    Merges ranked result lists: each document scores the sum of 1 / (rrf_k + rank)
+    over the lists it appears in, so documents ranked well by several searches win.
+    :param result_lists: Ranked lists of documents, best first.
+    :param k: Number of documents to return.
+    :param rrf_k: Rank offset that dampens the weight of the top ranks.
+    :param key: Identifies a document across lists.
+    :return: The fused documents, best first.
+    """
+    scores: dict[Any, float] = {}
+    documents: dict[Any, Any] = {}
+    for results in result_lists:
+        for rank, document in enumerate(results, start=1):
+            document_id = key(document)
+            scores[document_id] = scores.get(document_id, 0.0) + 1.0 / (rrf_k + rank)
+            documents.setdefault(document_id, document)
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [documents[document_id] for document_id in ranked[:k]]
@@ -0,0 +1,116 @@
+import time
+import uuid
+import asyncio
+import argparse
+
+import numpy as np
+from qdrant_client.models import PointStruct
+
+from app.core.settings import QdrantConfig
+from app.data.storage.qdrant_client import QdrantClientWrapper
+
+
+async def run_searches(
+    search, queries: np.ndarray, collection_name: str, concurrency: int
+) -> float:
+    """
+    Runs one search per query with at most `concurrency` requests in flight,
+    the way concurrent requests would hit a single uvicorn worker.
+    :param search: Coroutine function (collection_name, query_embedding, k) -> results.
+    :param queries: Query embeddings, one per row.
+    :param collection_name: Name of the collection to search in.
+    :param concurrency: Maximum number of searches in flight.
+    :return: Completed searches per second.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(query: np.ndarray):
+        async with semaphore:
+            await search(collection_name, query.tolist(), 5)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(query) for query in queries))
+    return len(queries) / (time.perf_counter() - start)
+
+
+async def benchmark(
+    wrapper: QdrantClientWrapper,
+    collection_name: str,
+    dimension: int,
+    num_requests: int,
+    concurrency: int,
+) -> dict:
+    """
+    Compares searches through the blocking client with the async client.
+    :param wrapper: The Qdrant client wrapper to benchmark.
+    :param collection_name: Name of a populated collection.
+    :param dimension: Size of the collection's vectors.
+    :param num_requests: Number of searches per run.
+    :param concurrency: Maximum number of searches in flight.
+    :return: A dictionary with requests/second for both paths.
+    """
+    queries = np.random.default_rng(0).random((num_requests, dimension))
+
+    async def blocking_search(*args):
+        # What an async handler calling the synchronous client does: the loop stalls.
+        return wrapper.search(*args)
+
+    # Warm both connection pools up before timing.
+    await run_searches(blocking_search, queries[:10], collection_name, concurrency)
+    await run_searches(wrapper.asearch, queries[:10], collection_name, concurrency)
+
+    sync_rps = await run_searches(
+        blocking_search, queries, collection_name, concurrency
+    )
+    async_rps = await run_searches(
+        wrapper.asearch, queries, collection_name, concurrency
+    )
+    return {
+        "requests": num_requests,
+        "concurrency": concurrency,
+        "sync_requests_per_second": sync_rps,
+        "async_requests_per_second": async_rps,
+        "speedup": async_rps / sync_rps if sync_rps else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure concurrent search throughput of the sync and async Qdrant clients."
+    )
+    parser.add_argument("--points", type=int, default=2000)
+    parser.add_argument("--dimension", type=int, default=768)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    wrapper = QdrantClientWrapper(QdrantConfig())
+    collection_name = f"search_benchmark_{uuid.uuid4().hex[:8]}"
+    wrapper.create_collection(collection_name, args.dimension)
+    try:
+        vectors = np.random.default_rng(1).random((args.points, args.dimension))
+        wrapper.add_documents(
+            collection_name,
+            [
+                PointStruct(
+                    id=i,
+                    vector={"description": vector.tolist()},
+                    payload={"description": f"step {i}"},
+                )
+                for i, vector in enumerate(vectors)
+            ],
+        )
+        report = asyncio.run(
+            benchmark(
+                wrapper, collection_name, args.dimension, args.requests, args.concurrency
+            )
+        )
+    finally:
+        wrapper.delete_collection(collection_name)
+
+    for key, value in report.items():
+        print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+from typing import Optional
+
+from qdrant_client.models import PointStruct, SparseVector
+
+from app.data.dtos.geo import GEO_FIELD
+from app.data.dtos.trip import TripStepDTO
+from app.data.storage.qdrant_params import SPARSE_VECTOR_NAME
+from app.embeddings.bm25_encoder import SparseEmbedding
+
+
+def step_payload(dto: TripStepDTO) -> dict:
+    """
+    Returns the payload stored with a trip step.
+    :param dto: TripStepDTO object containing trip step data.
+    :return: The payload dictionary.
+    """
+    return {
+        "step_id": dto.id,
+        "display_name": dto.display_name,
+        "description": dto.description,
+        "location_name": dto.location_name,
+        "lat": dto.lat,
+        "lon": dto.lon,
+        "detail": dto.detail,
+        "country_code": dto.country_code,
+        "weather_condition": dto.weather_condition,
+        "weather_temperature": dto.weather_temperature,
+        GEO_FIELD: {"lat": dto.lat, "lon": dto.lon},
+    }
+
+
+def step_point(
+    dto: TripStepDTO,
+    embedding: list[float],
+    sparse: Optional[SparseEmbedding] = None,
+) -> PointStruct:
+    """
+    Converts a TripStepDTO to a PointStruct, the document format shared by every
+    storage backend.
+    The point is constructed without validation: the DTO is already validated and
+    embeddings are plain lists of floats, and validating every vector component
+    costs more than building the point.
+    :param dto: TripStepDTO object containing trip step data.
+    :param embedding: Embedding vector for the trip step.
+    :param sparse: Optional BM25 sparse vector, stored as the "bm25" vector.
+    :return: PointStruct object ready for storage.
+    """
+    vector = {"description": embedding}
+    if sparse is not None:
+        vector[SPARSE_VECTOR_NAME] = SparseVector.model_construct(
+            indices=sparse.indices, values=sparse.values
+        )
+    return PointStruct.model_construct(
+        id=dto.id, vector=vector, payload=step_payload(dto)
+    )
@@ -1,10 +1,18 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, ContextManager, Iterator, Optional
+
+from app.data.storage.rank_fusion import reciprocal_rank_fusion
+from app.embeddings.bm25_encoder import SparseEmbedding
 
 
 class VectorStoreBase(ABC):
     """
     Base class for storage clients.
+
+    Read methods take an optional `filters` dictionary of payload field -> value
+    pairs; only documents whose payload matches every pair are considered.
     """
 
     @abstractmethod
@@ -15,27 +23,324 @@ class VectorStoreBase(ABC):
         pass
 
     @abstractmethod
-    def search(self, collection_name: str, query_embedding: list, k: int = 5):
+    def delete_documents(self, collection_name: str, ids: list):
+        """
+        Delete documents from the storage by id.
+
+        :param collection_name: Name of the collection to delete documents from.
+        :param ids: IDs of the documents to delete.
+        """
+        pass
+
+    @abstractmethod
+    def search(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ):
         """
         Perform a similarity search in the storage.
 
         :param query: The query string to search for.
-        :param metadata: Optional metadata to filter results.
         :param k: The number of nearest neighbors to return.
+        :param filters: Optional payload values the results must match.
         :return: A list of documents that are similar to the query.
         """
         pass
 
     @abstractmethod
-    def get_all_documents(self, collection_name: str):
+    def get_all_documents(self, collection_name: str, filters: Optional[dict] = None):
         """
         Retrieve all documents from a specified collection.
 
         :param collection_name: Name of the collection to retrieve documents from.
+        :param filters: Optional payload values the documents must match.
         :return: List of all documents in the collection.
         """
         pass
 
+    def search_batch(
+        self,
+        collection_name: str,
+        query_embeddings: list[list],
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[list]:
+        """
+        Perform one similarity search per query embedding. Backends override this
+        to answer all queries in a single round-trip.
+
+        :param collection_name: Name of the collection to search in.
+        :param query_embeddings: One embedding per query.
+        :param k: The number of nearest neighbors to return for each query.
+        :param filters: Optional payload values the results must match.
+        :return: One list of similar documents per query, in query order.
+        """
+        return [
+            self.search(collection_name, query_embedding, k, filters)
+            for query_embedding in query_embeddings
+        ]
+
+    @abstractmethod
+    def sparse_search(
+        self,
+        collection_name: str,
+        sparse_query: SparseEmbedding,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list:
+        """
+        Perform a lexical search over the collection's BM25 sparse vectors.
+
+        :param collection_name: Name of the collection to search in.
+        :param sparse_query: BM25 encoding of the query.
+        :param k: The number of best matching documents to return.
+        :param filters: Optional payload values the results must match.
+        :return: A list of documents sharing terms with the query, best first.
+        """
+        pass
+
+    def hybrid_search(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        sparse_query: SparseEmbedding,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list:
+        """
+        Perform a dense and a sparse search and fuse their rankings with reciprocal
+        rank fusion. Backends override this to fuse server-side.
+
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Dense embedding of the query.
+        :param sparse_query: BM25 encoding of the query.
+        :param k: The number of documents to return.
+        :param filters: Optional payload values the results must match.
+        :return: A list of documents, best first.
+        """
+        return reciprocal_rank_fusion(
+            [
+                self.search(collection_name, query_embedding, k, filters),
+                self.sparse_search(collection_name, sparse_query, k, filters),
+            ],
+            k,
+        )
+
+    def hybrid_search_batch(
+        self,
+        collection_name: str,
+        query_embeddings: list[list],
+        sparse_queries: list[SparseEmbedding],
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[list]:
+        """
+        Perform one hybrid search per query.
+
+        :param collection_name: Name of the collection to search in.
+        :param query_embeddings: One dense embedding per query.
+        :param sparse_queries: One BM25 encoding per query.
+        :param k: The number of documents to return for each query.
+        :param filters: Optional payload values the results must match.
+        :return: One list of documents per query, in query order.
+        """
+        return [
+            self.hybrid_search(collection_name, query_embedding, sparse_query, k, filters)
+            for query_embedding, sparse_query in zip(query_embeddings, sparse_queries)
+        ]
+
+    @abstractmethod
+    def search_with_vectors(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        k: int = 5,
+        filters: Optional[dict] = None,
+        sparse_query: Optional[SparseEmbedding] = None,
+    ) -> list[tuple[dict, list[float]]]:
+        """
+        Perform a similarity search that also returns the stored dense vector of each
+        result, for re-ranking on the caller's side.
+
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Dense embedding of the query.
+        :param k: The number of documents to return.
+        :param filters: Optional payload values the results must match.
+        :param sparse_query: Optional BM25 encoding of the query, to rank the
+            results by hybrid search.
+        :return: A list of (document, vector) pairs, best first.
+        """
+        pass
+
+    def iter_documents(
+        self,
+        collection_name: str,
+        page_size: Optional[int] = None,
+        fields: Optional[list[str]] = None,
+        filters: Optional[dict] = None,
+    ) -> Iterator[list[dict]]:
+        """
+        Yield the documents of a collection page by page. Backends that page
+        natively override this so the first page is available before the last
+        one is fetched.
+
+        :param collection_name: Name of the collection to retrieve documents from.
+        :param page_size: Maximum number of documents per page.
+        :param fields: Payload fields to return, or None for the whole document.
+        :param filters: Optional payload values the documents must match.
+        :return: Iterator over pages of documents.
+        """
+        documents = self.get_all_documents(collection_name, filters=filters)
+        page_size = page_size or len(documents) or 1
+        for start in range(0, len(documents), page_size):
+            page = documents[start : start + page_size]
+            if fields:
+                page = [
+                    {field: doc[field] for field in fields if field in doc}
+                    for doc in page
+                ]
+            yield page
+
+    async def asearch(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ):
+        """
+        Async variant of search. Backends without a native async client run the
+        synchronous search in a worker thread.
+
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Embedding of the query to search for.
+        :param k: The number of nearest neighbors to return.
+        :param filters: Optional payload values the results must match.
+        :return: A list of documents that are similar to the query.
+        """
+        return await asyncio.to_thread(
+            self.search, collection_name, query_embedding, k, filters
+        )
+
+    async def asearch_batch(
+        self,
+        collection_name: str,
+        query_embeddings: list[list],
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[list]:
+        """
+        Async variant of search_batch, run in a worker thread by default.
+
+        :param collection_name: Name of the collection to search in.
+        :param query_embeddings: One embedding per query.
+        :param k: The number of nearest neighbors to return for each query.
+        :param filters: Optional payload values the results must match.
+        :return: One list of similar documents per query, in query order.
+        """
+        return await asyncio.to_thread(
+            self.search_batch, collection_name, query_embeddings, k, filters
+        )
+
+    async def ahybrid_search(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        sparse_query: SparseEmbedding,
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list:
+        """
+        Async variant of hybrid_search, run in a worker thread by default.
+
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Dense embedding of the query.
+        :param sparse_query: BM25 encoding of the query.
+        :param k: The number of documents to return.
+        :param filters: Optional payload values the results must match.
+        :return: A list of documents, best first.
+        """
+        return await asyncio.to_thread(
+            self.hybrid_search,
+            collection_name,
+            query_embedding,
+            sparse_query,
+            k,
+            filters,
+        )
+
+    async def ahybrid_search_batch(
+        self,
+        collection_name: str,
+        query_embeddings: list[list],
+        sparse_queries: list[SparseEmbedding],
+        k: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[list]:
+        """
+        Async variant of hybrid_search_batch, run in a worker thread by default.
+
+        :param collection_name: Name of the collection to search in.
+        :param query_embeddings: One dense embedding per query.
+        :param sparse_queries: One BM25 encoding per query.
+        :param k: The number of documents to return for each query.
+        :param filters: Optional payload values the results must match.
+        :return: One list of documents per query, in query order.
+        """
+        return await asyncio.to_thread(
+            self.hybrid_search_batch,
+            collection_name,
+            query_embeddings,
+            sparse_queries,
+            k,
+            filters,
+        )
+
+    async def asearch_with_vectors(
+        self,
+        collection_name: str,
+        query_embedding: list,
+        k: int = 5,
+        filters: Optional[dict] = None,
+        sparse_query: Optional[SparseEmbedding] = None,
+    ) -> list[tuple[dict, list[float]]]:
+        """
+        Async variant of search_with_vectors, run in a worker thread by default.
+
+        :param collection_name: Name of the collection to search in.
+        :param query_embedding: Dense embedding of the query.
+        :param k: The number of documents to return.
+        :param filters: Optional payload values the results must match.
+        :param sparse_query: Optional BM25 encoding of the query, to rank the
+            results by hybrid search.
+        :return: A list of (document, vector) pairs, best first.
+        """
+        return await asyncio.to_thread(
+            self.search_with_vectors,
+            collection_name,
+            query_embedding,
+            k,
+            filters,
+            sparse_query,
+        )
+
+    async def aget_all_documents(
+        self, collection_name: str, filters: Optional[dict] = None
+    ):
+        """
+        Async variant of get_all_documents, run in a worker thread by default.
+
+        :param collection_name: Name of the collection to retrieve documents from.
+        :param filters: Optional payload values the documents must match.
+        :return: List of all documents in the collection.
+        """
+        return await asyncio.to_thread(
+            self.get_all_documents, collection_name, filters=filters
+        )
+
     @abstractmethod
     def collection_exists(self, collection_name: str) -> bool:
         """
@@ -47,23 +352,88 @@ class VectorStoreBase(ABC):
         pass
 
     @abstractmethod
-    def create_collection(self, collection_name: str, embedding_size: int):
+    def create_collection(
+        self, collection_name: str, embedding_size: int, sparse_vectors: bool = False
+    ):
         """
         Create a new collection in the storage.
 
         :param collection_name: Name of the collection to create.
         :param embedding_size: Size of the embeddings used in the collection.
+        :param sparse_vectors: Whether documents also store BM25 sparse vectors.
         """
         pass
 
+    @abstractmethod
+    def delete_collection(self, collection_name: str):
+        """
+        Delete a collection and all of its documents from the storage.
+
+        :param collection_name: Name of the collection to delete.
+        """
+        pass
+
+    def create_payload_index(
+        self,
+        collection_name: str,
+        field_name: str,
+        is_tenant: bool = False,
+        field_type: str = "keyword",
+    ):
+        """
+        Index a payload field so that filtering on it stays fast. Backends that
+        filter by scanning ignore this.
+
+        :param collection_name: Name of the collection.
+        :param field_name: Name of the payload field to index.
+        :param is_tenant: Whether the field partitions the collection by tenant.
+        :param field_type: "keyword" for exact matches, "geo" for lat/lon points.
+        """
+        pass
+
+    def bulk_writes(self) -> ContextManager[None]:
+        """
+        Groups the writes of a bulk ingest. Backends that persist on every write
+        defer persistence to the end of the block; others ignore this.
+
+        :return: A context manager wrapping the writes.
+        """
+        return nullcontext()
+
+    async def aiter_documents(
+        self,
+        collection_name: str,
+        page_size: Optional[int] = None,
+        fields: Optional[list[str]] = None,
+        filters: Optional[dict] = None,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Async variant of iter_documents. Each page is fetched in a worker thread.
+
+        :param collection_name: Name of the collection to retrieve documents from.
+        :param page_size: Maximum number of documents per page.
+        :param fields: Payload fields to return, or None for the whole document.
+        :param filters: Optional payload values the documents must match.
+        :return: Async iterator over pages of documents.
+        """
+        pages = self.iter_documents(collection_name, page_size, fields, filters)
+        while True:
+            page = await asyncio.to_thread(next, pages, None)
+            if page is None:
+                return
+            yield page
+
     @staticmethod
     @abstractmethod
-    def trip_step_to_document(dto, embedding: list[float]) -> Any:
+    def trip_step_to_document(
+        dto, embedding: list[float], sparse: Optional[SparseEmbedding] = None
+    ) -> Any:
         """
         Convert a TripStepDTO to a document format suitable for storage.
 
         :param dto: TripStepDTO object containing trip step data.
         :param embedding: Embedding vector for the trip step.
+        :param sparse: Optional BM25 sparse vector stored for hybrid search.
         :return: Document in the format required by the storage.
         """
         pass
@@ -0,0 +1,22 @@
+from app.core.settings import QdrantConfig, VectorStoreConfig
+from app.data.storage.vector_store_base import VectorStoreBase
+
+
+def create_vector_store_client(config: VectorStoreConfig) -> VectorStoreBase:
+    """
+    Builds the vector store client for the configured backend.
+    Backends are imported here because qdrant_client is slow to import.
+    :param config: The vector store configuration.
+    :return: The vector store client.
+    """
+    if config.backend == "qdrant":
+        from app.data.storage.qdrant_client import QdrantClientWrapper
+
+        return QdrantClientWrapper(QdrantConfig())
+    if config.backend == "numpy":
+        from app.data.storage.numpy_vector_store import NumpyVectorStore
+
+        return NumpyVectorStore(config)
+    raise ValueError(
+        f"Unknown vector store backend '{config.backend}'. Available backends: ['qdrant', 'numpy']"
+    )
@@ -0,0 +1,137 @@
+import time
+import queue
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Union
+
+from app.core.settings import EmbeddingConfig
+from app.embeddings.embedding_base import EmbeddingBase
+
+
+class BatchingEmbeddings(EmbeddingBase):
+    """
+    Embedding model wrapper that coalesces concurrent single-text embed calls.
+
+    Single texts are queued and a background worker encodes them together once
+    max_batch_size texts are waiting or max_wait_ms has passed since the first
+    one arrived. Each caller receives its own vector. Lists are passed straight
+    through since they are already batched.
+    """
+
+    def __init__(self, embeddings: EmbeddingBase, config: EmbeddingConfig):
+        self.embeddings = embeddings
+        self.max_batch_size = config.batch_max_size
+        self.max_wait = config.batch_max_wait_ms / 1000
+        self.batches = 0
+        self.batched_texts = 0
+        self._queue: queue.Queue[tuple[str, Future]] = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._run, name="embedding-batcher", daemon=True
+        )
+        self._worker.start()
+        logging.info(
+            f"BatchingEmbeddings initialized with max_batch_size: {self.max_batch_size}, "
+            f"max_wait_ms: {config.batch_max_wait_ms}"
+        )
+
+    def submit(self, text: str) -> Future:
+        """
+        Queues a single text for the next batch.
+        :param text: The text to embed.
+        :return: A future resolving to the text's vector.
+        """
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: Union[str, list[str]]) -> list[list[float]]:
+        """
+        Converts text into a vector representation, batching single texts.
+        """
+        if isinstance(text, str):
+            return self.submit(text).result()
+        return self.embeddings.embed(text)
+
+    async def aembed(self, text: Union[str, list[str]]) -> list[list[float]]:
+        """
+        Converts text into a vector representation without blocking the event loop.
+        """
+        if isinstance(text, str):
+            return await asyncio.wrap_future(self.submit(text))
+        return await super().aembed(text)
+
+    def _run(self) -> None:
+        """
+        Worker loop: collects a batch within the wait window and encodes it.
+        """
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._encode_batch(batch)
+            except Exception as e:
+                logging.error(f"Embedding batcher failed on a batch: {str(e)}")
+
+    def _encode_batch(self, batch: list[tuple[str, Future]]) -> None:
+        """
+        Encodes a batch in one model call and resolves each caller's future.
+        Texts whose caller has already given up (e.g. a cancelled aembed) are
+        skipped; the others can no longer be cancelled once encoding starts.
+        :param batch: The queued (text, future) pairs.
+        """
+        batch = [
+            (text, future)
+            for text, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+        try:
+            vectors = self.embeddings.embed([text for text, _ in batch])
+        except Exception as e:
+            logging.error(f"Error embedding batch of {len(batch)} texts: {str(e)}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.batched_texts += len(batch)
+        for (_, future), vector in zip(batch, vectors):
+            future.set_result(vector)
+
+    def stats(self) -> dict:
+        """
+        Returns the batching counters.
+        :return: A dictionary with the number of batches and the mean batch size.
+        """
+        return {
+            "batches": self.batches,
+            "batched_texts": self.batched_texts,
+            "mean_batch_size": (
+                self.batched_texts / self.batches if self.batches else 0.0
+            ),
+            "queue_depth": self._queue.qsize(),
+        }
+
+    def get_embedding_dimension(self) -> int:
+        """
+        Returns the dimension of the embedding vectors.
+        """
+        return self.embeddings.get_embedding_dimension()
+
+    @property
+    def model_name(self) -> str:
+        """
+        Returns the name of the underlying embedding model.
+        """
+        return self.embeddings.model_name
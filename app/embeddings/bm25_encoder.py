@@ -0,0 +1,91 @@
+import re
+import zlib
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+
+TOKEN = re.compile(r"\w+")
+
+
+@dataclass
+class SparseEmbedding:
+    indices: list[int]
+    values: list[float]
+
+
+class BM25Encoder:
+    """
+    Encodes texts as sparse BM25 term-weight vectors for lexical search.
+
+    Documents carry the saturated, length-normalised term frequency of BM25; queries
+    carry a weight of 1 per term. The inverse document frequency depends on the
+    whole collection, so the vector store applies it at query time (Qdrant's IDF
+    modifier). Terms are hashed to stable ids, so no vocabulary has to be stored.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, avg_doc_length: float = 40.0):
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_length = avg_doc_length
+
+    @property
+    def name(self) -> str:
+        """
+        Identifies the encoding, so that stored vectors are rebuilt when it changes.
+        """
+        return f"bm25(k1={self.k1},b={self.b},avgdl={self.avg_doc_length})"
+
+    @staticmethod
+    def tokenize(text: str) -> list[str]:
+        """
+        Splits a text into lowercase words with accents removed, so that
+        "São Paulo" and "sao paulo" match.
+        :param text: The text to tokenize.
+        :return: The tokens, in text order.
+        """
+        normalized = unicodedata.normalize("NFKD", text.casefold())
+        stripped = "".join(c for c in normalized if not unicodedata.combining(c))
+        return TOKEN.findall(stripped)
+
+    @staticmethod
+    def token_id(token: str) -> int:
+        """
+        Returns a stable 32-bit id for a token.
+        """
+        return zlib.crc32(token.encode("utf-8"))
+
+    def encode_document(self, text: str) -> SparseEmbedding:
+        """
+        Encodes a stored text with BM25 term-frequency weights.
+        :param text: The text to encode.
+        :return: The sparse vector, with indices in ascending order.
+        """
+        tokens = self.tokenize(text or "")
+        norm = self.k1 * (1 - self.b + self.b * len(tokens) / self.avg_doc_length)
+        weights: dict[int, float] = {}
+        for token, count in Counter(tokens).items():
+            index = self.token_id(token)
+            weights[index] = weights.get(index, 0.0) + count
+        return SparseEmbedding(
+            indices=sorted(weights),
+            values=[
+                weights[i] * (self.k1 + 1) / (weights[i] + norm) for i in sorted(weights)
+            ],
+        )
+
+    def encode_documents(self, texts: list[str]) -> list[SparseEmbedding]:
+        """
+        Encodes several stored texts.
+        :param texts: The texts to encode.
+        :return: One sparse vector per text.
+        """
+        return [self.encode_document(text) for text in texts]
+
+    def encode_query(self, text: str) -> SparseEmbedding:
+        """
+        Encodes a query: every distinct term gets a weight of 1.
+        :param text: The query to encode.
+        :return: The sparse vector, with indices in ascending order.
+        """
+        indices = sorted({self.token_id(token) for token in self.tokenize(text)})
+        return SparseEmbedding(indices=indices, values=[1.0] * len(indices))
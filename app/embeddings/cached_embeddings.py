@@ -0,0 +1,77 @@
+import logging
+from typing import Union
+
+from app.core.settings import EmbeddingConfig
+from app.embeddings.embedding_base import EmbeddingBase
+from app.embeddings.embedding_cache import EmbeddingCache
+
+
+class CachedEmbeddings(EmbeddingBase):
+    """
+    Embedding model wrapper that serves repeated texts from an EmbeddingCache
+    and only sends unseen texts to the underlying model.
+    """
+
+    def __init__(self, embeddings: EmbeddingBase, config: EmbeddingConfig):
+        self.embeddings = embeddings
+        self.cache = EmbeddingCache(
+            max_bytes=config.cache_max_bytes, disk_path=config.cache_disk_path
+        )
+        logging.info(
+            f"CachedEmbeddings initialized with max_bytes: {config.cache_max_bytes}"
+        )
+
+    def embed(self, text: Union[str, list[str]]) -> list[list[float]]:
+        """
+        Converts text into a vector representation, using cached vectors where possible.
+        """
+        texts = [text] if isinstance(text, str) else list(text)
+        keys = [EmbeddingCache.make_key(self.model_name, t) for t in texts]
+        vectors = [self.cache.get(key) for key in keys]
+
+        missing: dict[str, list[int]] = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(keys[i], []).append(i)
+
+        if missing:
+            positions = list(missing.values())
+            if len(positions) == 1:
+                # A single text goes through as a str, so that a batching model
+                # can coalesce it with concurrent callers.
+                computed = [self.embeddings.embed(texts[positions[0][0]])]
+            else:
+                computed = self.embeddings.embed([texts[p[0]] for p in positions])
+            for key, indices, vector in zip(missing.keys(), positions, computed):
+                self.cache.put(key, vector)
+                for i in indices:
+                    vectors[i] = vector
+
+        return vectors[0] if isinstance(text, str) else vectors
+
+    async def aembed(self, text: Union[str, list[str]]) -> list[list[float]]:
+        """
+        Converts text into a vector representation without blocking the event loop.
+        """
+        if not isinstance(text, str):
+            return await super().aembed(text)
+
+        key = EmbeddingCache.make_key(self.model_name, text)
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = await self.embeddings.aembed(text)
+            self.cache.put(key, vector)
+        return vector
+
+    def get_embedding_dimension(self) -> int:
+        """
+        Returns the dimension of the embedding vectors.
+        """
+        return self.embeddings.get_embedding_dimension()
+
+    @property
+    def model_name(self) -> str:
+        """
+        Returns the name of the underlying embedding model.
+        """
+        return self.embeddings.model_name
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Union
 
@@ -14,9 +15,23 @@ class EmbeddingBase(ABC):
         """
         pass
 
+    async def aembed(self, text: Union[str, list[str]]) -> list[list[float]]:
+        """
+        Converts text into a vector representation without blocking the event loop.
+        """
+        return await asyncio.to_thread(self.embed, text)
+
     @abstractmethod
     def get_embedding_dimension(self) -> int:
         """
         Returns the dimension of the embedding vectors.
         """
         pass
+
+    @property
+    @abstractmethod
+    def model_name(self) -> str:
+        """
+        Returns the name of the underlying embedding model.
+        """
+        pass
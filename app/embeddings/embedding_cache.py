@@ -0,0 +1,148 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache for embedding vectors.
+
+    Vectors are keyed on the model name and a hash of the normalized text. The
+    in-process tier is an LRU bounded by the number of bytes held; the optional
+    SQLite tier survives restarts and is shared by processes on the same pod.
+    """
+
+    def __init__(self, max_bytes: int, disk_path: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._disk: Optional[sqlite3.Connection] = None
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._disk.commit()
+            logging.info(f"EmbeddingCache disk tier opened at: {disk_path}")
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """
+        Normalizes text so that trivially different inputs share a cache entry.
+        :param text: The text to normalize.
+        :return: The NFC-normalized text with collapsed whitespace.
+        """
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """
+        Builds the cache key for a text embedded with a given model.
+        :param model_name: The name of the embedding model.
+        :param text: The text to embed.
+        :return: A hex digest identifying the (model, text) pair.
+        """
+        normalized = EmbeddingCache.normalize_text(text)
+        return hashlib.sha256(f"{model_name}\x00{normalized}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[list[float]]:
+        """
+        Looks up a vector, promoting disk hits into the in-process tier.
+        :param key: The cache key.
+        :return: The cached vector, or None on a miss.
+        """
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector.tolist()
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    vector = np.frombuffer(row[0], dtype=np.float32)
+                    self._put_memory(key, vector)
+                    self.disk_hits += 1
+                    return vector.tolist()
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, vector: list[float]) -> None:
+        """
+        Stores a vector in all cache tiers.
+        :param key: The cache key.
+        :param vector: The embedding vector.
+        """
+        array = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._put_memory(key, array)
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    (key, array.tobytes()),
+                )
+                self._disk.commit()
+
+    def _put_memory(self, key: str, vector: np.ndarray) -> None:
+        """
+        Inserts a vector into the LRU tier and evicts until it fits in max_bytes.
+        Must be called with the lock held.
+        """
+        if vector.nbytes > self.max_bytes:
+            return
+
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._current_bytes -= previous.nbytes
+
+        self._memory[key] = vector
+        self._current_bytes += vector.nbytes
+
+        while self._current_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._current_bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drops every entry from the in-process tier and resets the counters.
+        """
+        with self._lock:
+            self._memory.clear()
+            self._current_bytes = 0
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+        :return: A dictionary with hit/miss counters and memory usage.
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "entries": len(self._memory),
+                "bytes": self._current_bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,71 @@
+import threading
+from typing import Optional
+
+from app.core.settings import EmbeddingConfig, VectorStoreConfig
+from app.embeddings.embedding_base import EmbeddingBase
+from app.embeddings.batching_embeddings import BatchingEmbeddings
+from app.embeddings.bm25_encoder import BM25Encoder
+from app.embeddings.cached_embeddings import CachedEmbeddings
+from app.embeddings.huggingface_embeddings import HuggingFaceEmbeddings
+
+# One embedding stack per configuration, so that every caller shares its batcher
+# and cache.
+_embeddings: dict[str, EmbeddingBase] = {}
+_embeddings_lock = threading.Lock()
+
+
+def create_base_embeddings(config: EmbeddingConfig) -> EmbeddingBase:
+    """
+    Builds the bare embedding model for the configured backend.
+    :param config: The embedding configuration.
+    :return: The embedding model without caching or batching.
+    """
+    if config.backend == "huggingface":
+        return HuggingFaceEmbeddings(config.model_name)
+    if config.backend == "onnx":
+        # Imported here so onnxruntime is only loaded when the backend is selected.
+        from app.embeddings.onnx_embeddings import OnnxEmbeddings
+
+        return OnnxEmbeddings(
+            model_name=config.model_name,
+            model_dir=config.onnx_model_dir,
+            quantize=config.onnx_quantize,
+            max_seq_length=config.max_seq_length,
+        )
+    raise ValueError(
+        f"Unknown embedding backend '{config.backend}'. Available backends: ['huggingface', 'onnx']"
+    )
+
+
+def create_embeddings(config: EmbeddingConfig) -> EmbeddingBase:
+    """
+    Builds the embedding model described by the configuration, once per distinct
+    configuration: later calls with an equal configuration return the same instance.
+    Cache hits are answered before reaching the batcher, so only misses are coalesced.
+    :param config: The embedding configuration.
+    :return: The embedding model, wrapped in a batcher and a cache if enabled.
+    """
+    key = config.model_dump_json()
+    with _embeddings_lock:
+        embeddings = _embeddings.get(key)
+        if embeddings is None:
+            embeddings = create_base_embeddings(config)
+            if config.batch_enabled:
+                embeddings = BatchingEmbeddings(embeddings, config)
+            if config.cache_enabled:
+                embeddings = CachedEmbeddings(embeddings, config)
+            _embeddings[key] = embeddings
+    return embeddings
+
+
+def create_sparse_encoder(config: VectorStoreConfig) -> Optional[BM25Encoder]:
+    """
+    Builds the BM25 encoder used for hybrid search.
+    :param config: The vector store configuration.
+    :return: The encoder, or None if hybrid search is disabled.
+    """
+    if not config.hybrid_search:
+        return None
+    return BM25Encoder(
+        k1=config.bm25_k1, b=config.bm25_b, avg_doc_length=config.bm25_avg_doc_length
+    )
@@ -0,0 +1,132 @@
+import os
+import sys
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+from app.core.settings import EmbeddingConfig
+from app.embeddings.embedding_base import EmbeddingBase
+from app.embeddings.embedding_factory import create_base_embeddings
+
+_worker_embeddings: Optional[EmbeddingBase] = None
+
+
+def _init_worker(
+    config_data: dict,
+    threads_per_worker: int,
+    embeddings: Optional[EmbeddingBase] = None,
+) -> None:
+    """
+    Loads one embedding model per worker process.
+    :param config_data: The dumped EmbeddingConfig.
+    :param threads_per_worker: Intra-op threads per worker, to avoid oversubscribing cores.
+    :param embeddings: A pickled model to use instead of loading one from config_data.
+    """
+    global _worker_embeddings
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(threads_per_worker)
+    if embeddings is None:
+        embeddings = create_base_embeddings(EmbeddingConfig(**config_data))
+    _worker_embeddings = embeddings
+    logging.info(f"Embedding worker {os.getpid()} loaded {_worker_embeddings.model_name}")
+
+
+def _embed_in_worker(texts: list[str]) -> list[list[float]]:
+    """
+    Embeds a batch of texts with the worker's model.
+    """
+    assert _worker_embeddings is not None, "Embedding worker was not initialized."
+    return _worker_embeddings.embed(texts)
+
+
+def _dimension_in_worker() -> int:
+    """
+    Returns the embedding dimension of the worker's model.
+    """
+    assert _worker_embeddings is not None, "Embedding worker was not initialized."
+    return _worker_embeddings.get_embedding_dimension()
+
+
+class EmbeddingPool:
+    """
+    Pool of worker processes, each holding its own embedding model, for bulk indexing.
+
+    Batches are streamed through the pool in order with a bounded number of
+    batches in flight, so memory stays flat regardless of the input size.
+    With num_workers=0 batches are embedded in the calling process instead. A
+    picklable embeddings model can be passed to use instead of loading one from the
+    configuration; it is copied into every worker.
+    Use as a context manager so the workers are shut down.
+    """
+
+    def __init__(
+        self,
+        config: EmbeddingConfig,
+        num_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        embeddings: Optional[EmbeddingBase] = None,
+    ):
+        if num_workers == 0:
+            self.num_workers = 0
+            self.max_in_flight = 1
+            self._executor = None
+            self._embeddings = (
+                embeddings if embeddings is not None else create_base_embeddings(config)
+            )
+            return
+
+        self.num_workers = num_workers or max(1, (os.cpu_count() or 2) // 2)
+        self.max_in_flight = max_in_flight or 2 * self.num_workers
+        threads_per_worker = max(1, (os.cpu_count() or 1) // self.num_workers)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(config.model_dump(), threads_per_worker, embeddings),
+        )
+        logging.info(
+            f"EmbeddingPool started with {self.num_workers} workers "
+            f"({threads_per_worker} threads each)."
+        )
+
+    def __enter__(self) -> "EmbeddingPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shuts the worker processes down.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def get_embedding_dimension(self) -> int:
+        """
+        Returns the dimension of the embedding vectors.
+        """
+        if self._executor is None:
+            return self._embeddings.get_embedding_dimension()
+        return self._executor.submit(_dimension_in_worker).result()
+
+    def imap(self, batches: Iterable[list[str]]) -> Iterator[list[list[float]]]:
+        """
+        Embeds batches of texts across the pool, yielding results in input order.
+        :param batches: An iterable of text batches; consumed lazily.
+        :return: An iterator over the vectors of each batch.
+        """
+        if self._executor is None:
+            for batch in batches:
+                yield self._embeddings.embed(batch)
+            return
+
+        in_flight: deque[Future] = deque()
+        for batch in batches:
+            in_flight.append(self._executor.submit(_embed_in_worker, batch))
+            if len(in_flight) >= self.max_in_flight:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
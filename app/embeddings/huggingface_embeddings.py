@@ -1,7 +1,7 @@
 import logging
+import threading
 
-from typing import Union
-from sentence_transformers import SentenceTransformer
+from typing import Any, Union
 
 from app.embeddings.embedding_base import EmbeddingBase
 
@@ -9,6 +9,7 @@ from app.embeddings.embedding_base import EmbeddingBase
 class HuggingFaceEmbeddings(EmbeddingBase):
     """
     Class for Hugging Face embeddings.
+    The SentenceTransformer model is loaded on first use, so constructing this class is cheap.
     """
 
     _instance = None
@@ -21,10 +22,28 @@ class HuggingFaceEmbeddings(EmbeddingBase):
 
     def __init__(self, model_name: str = "sentence-transformers/all-mpnet-base-v2"):
         if not self._initialized:
-            self.model = SentenceTransformer(model_name)
+            self._model: Any = None
+            self._model_lock = threading.Lock()
+            self._model_name = model_name
             self._initialized = True
             logging.info(f"HuggingFaceEmbeddings initialized with model: {model_name}")
 
+    @property
+    def model(self) -> Any:
+        """
+        Returns the SentenceTransformer model, loading it on first access.
+        """
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    # Imported here: sentence_transformers pulls in torch, which
+                    # dominates process start-up time.
+                    from sentence_transformers import SentenceTransformer
+
+                    self._model = SentenceTransformer(self._model_name)
+                    logging.info(f"Loaded SentenceTransformer model: {self._model_name}")
+        return self._model
+
     def embed(self, text: Union[str, list[str]]) -> list[list[float]]:
         """
         Converts text into a vector representation.
@@ -38,3 +57,10 @@ class HuggingFaceEmbeddings(EmbeddingBase):
         Returns the dimension of the embedding vectors.
         """
         return self.model.get_sentence_embedding_dimension()
+
+    @property
+    def model_name(self) -> str:
+        """
+        Returns the name of the underlying embedding model.
+        """
+        return self._model_name
@@ -0,0 +1,215 @@
+import os
+import logging
+import threading
+from typing import Optional, Union
+
+import numpy as np
+import onnxruntime as ort
+from tokenizers import Tokenizer
+
+from app.embeddings.embedding_base import EmbeddingBase
+
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+def onnx_model_path(model_dir: str, model_name: str) -> str:
+    """
+    Returns the directory the ONNX export of a model lives in, so that changing the
+    configured model does not load the export of the previous one.
+    :param model_dir: The base directory for ONNX models.
+    :param model_name: The Hugging Face model name, e.g. "sentence-transformers/x".
+    :return: A subdirectory of model_dir named after the model.
+    """
+    return os.path.join(model_dir, model_name.replace("/", "--"))
+
+
+def export_onnx_model(model_name: str, output_dir: str, quantize: bool = True) -> None:
+    """
+    Exports a Hugging Face sentence-transformers model to ONNX, optionally with an
+    int8 dynamically quantized copy. Only this step needs PyTorch; serving does not.
+    :param model_name: The Hugging Face model to export.
+    :param output_dir: Directory to write the ONNX model and tokenizer to.
+    :param quantize: Whether to also write an int8 dynamically quantized model.
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name)
+    model.eval()
+
+    class _TokenEmbeddings(torch.nn.Module):
+        """Exposes only the inputs and output the ONNX graph needs."""
+
+        def __init__(self, encoder):
+            super().__init__()
+            self.encoder = encoder
+
+        def forward(self, input_ids, attention_mask):
+            return self.encoder(
+                input_ids=input_ids, attention_mask=attention_mask
+            ).last_hidden_state
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    model_path = os.path.join(output_dir, MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            _TokenEmbeddings(model),
+            (sample["input_ids"], sample["attention_mask"]),
+            model_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=17,
+            dynamo=False,
+        )
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, TOKENIZER_FILE))
+    logging.info(f"Exported ONNX model for {model_name} to {model_path}")
+
+    if quantize:
+        quantized_path = os.path.join(output_dir, QUANTIZED_MODEL_FILE)
+        quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+        logging.info(f"Wrote int8 quantized ONNX model to {quantized_path}")
+
+
+class OnnxEmbeddings(EmbeddingBase):
+    """
+    Class for sentence-transformers embeddings served with ONNX Runtime.
+    Produces the same mean-pooled, L2-normalized vectors as HuggingFaceEmbeddings.
+    Each model is exported to its own subdirectory of model_dir.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-mpnet-base-v2",
+        model_dir: str = "models/onnx",
+        quantize: bool = True,
+        max_seq_length: int = 384,
+        batch_size: int = 32,
+    ):
+        model_dir = onnx_model_path(model_dir, model_name)
+        model_file = QUANTIZED_MODEL_FILE if quantize else MODEL_FILE
+        self._model_dir = model_dir
+        self._model_path = os.path.join(model_dir, model_file)
+        self._quantize = quantize
+        self._max_seq_length = max_seq_length
+        self._tokenizer: Optional[Tokenizer] = None
+        self._session: Optional[ort.InferenceSession] = None
+        self._dimension: Optional[int] = None
+        self._load_lock = threading.Lock()
+        self._base_model_name = model_name
+        self.batch_size = batch_size
+        self._model_name = f"{model_name}:onnx{'-int8' if quantize else ''}"
+        logging.info(f"OnnxEmbeddings initialized with model: {self._model_path}")
+
+    def _load(self) -> None:
+        """
+        Exports the model if needed, then loads the tokenizer and the ONNX session.
+        Called on first use, so that constructing the embeddings stays cheap.
+        """
+        with self._load_lock:
+            if self._session is not None:
+                return
+            if not os.path.exists(self._model_path):
+                logging.info(
+                    f"No ONNX model found at {self._model_path}, exporting it."
+                )
+                export_onnx_model(
+                    self._base_model_name, self._model_dir, quantize=self._quantize
+                )
+
+            tokenizer = Tokenizer.from_file(
+                os.path.join(self._model_dir, TOKENIZER_FILE)
+            )
+            tokenizer.enable_truncation(max_length=self._max_seq_length)
+            tokenizer.enable_padding()
+
+            session_options = ort.SessionOptions()
+            session_options.graph_optimization_level = (
+                ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            )
+            self._tokenizer = tokenizer
+            self._session = ort.InferenceSession(
+                self._model_path,
+                sess_options=session_options,
+                providers=["CPUExecutionProvider"],
+            )
+            logging.info(f"Loaded ONNX model: {self._model_path}")
+
+    @property
+    def tokenizer(self) -> Tokenizer:
+        """
+        Returns the tokenizer, loading the model on first access.
+        """
+        if self._tokenizer is None:
+            self._load()
+        return self._tokenizer
+
+    @property
+    def session(self) -> ort.InferenceSession:
+        """
+        Returns the ONNX Runtime session, loading the model on first access.
+        """
+        if self._session is None:
+            self._load()
+        return self._session
+
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Runs the ONNX model on one batch and applies mean pooling and normalization.
+        :param texts: The texts to encode.
+        :return: A float32 matrix with one normalized vector per text.
+        """
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(
+            None, {"input_ids": input_ids, "attention_mask": attention_mask}
+        )[0]
+
+        mask = attention_mask[..., np.newaxis].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        pooled = summed / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+    def embed(self, text: Union[str, list[str]]) -> list[list[float]]:
+        """
+        Converts text into a vector representation.
+        """
+        texts = [text] if isinstance(text, str) else text
+        if not texts:
+            return []
+
+        vectors = np.concatenate(
+            [
+                self._encode(texts[i : i + self.batch_size])
+                for i in range(0, len(texts), self.batch_size)
+            ]
+        )
+        return vectors[0].tolist() if isinstance(text, str) else vectors.tolist()
+
+    def get_embedding_dimension(self) -> int:
+        """
+        Returns the dimension of the embedding vectors.
+        """
+        if self._dimension is None:
+            self._dimension = self._encode(["dimension probe"]).shape[1]
+        return self._dimension
+
+    @property
+    def model_name(self) -> str:
+        """
+        Returns the name of the underlying embedding model, tagged with the backend
+        so cached vectors are not shared with the PyTorch backend.
+        """
+        return self._model_name
@@ -0,0 +1,91 @@
+import time
+import logging
+import argparse
+
+import numpy as np
+
+from app.core.settings import EmbeddingConfig
+from app.embeddings.embedding_base import EmbeddingBase
+from app.embeddings.huggingface_embeddings import HuggingFaceEmbeddings
+from app.embeddings.onnx_embeddings import OnnxEmbeddings
+
+SAMPLE_TEXTS = [
+    "We walked along the river in Porto and had grilled sardines for dinner.",
+    "Rainy day in Kyoto, spent the afternoon in a tiny tea house near Gion.",
+    "Took the night bus from Hanoi to Sapa, the rice terraces were unreal.",
+    "Lisbon",
+    "Hiked to the glacier viewpoint, 14 km round trip, freezing wind at the top.",
+    "Street food market: tacos al pastor, elote and way too much horchata.",
+    "Ferry to the island was cancelled so we stayed another night in Split.",
+    "Museum day. The Rijksmuseum was packed but the Vermeer room was worth it.",
+]
+
+
+def check_parity(
+    reference: EmbeddingBase, candidate: EmbeddingBase, texts: list[str]
+) -> dict:
+    """
+    Compares the vectors of two embedding backends on the same texts.
+    :param reference: The backend treated as ground truth.
+    :param candidate: The backend being validated.
+    :param texts: The texts to embed with both backends.
+    :return: A dictionary with cosine agreement and encoding times.
+    """
+    start = time.perf_counter()
+    reference_vectors = np.asarray(reference.embed(texts), dtype=np.float32)
+    reference_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    candidate_vectors = np.asarray(candidate.embed(texts), dtype=np.float32)
+    candidate_seconds = time.perf_counter() - start
+
+    cosine = np.sum(reference_vectors * candidate_vectors, axis=1) / (
+        np.linalg.norm(reference_vectors, axis=1)
+        * np.linalg.norm(candidate_vectors, axis=1)
+    )
+    return {
+        "texts": len(texts),
+        "mean_cosine": float(cosine.mean()),
+        "min_cosine": float(cosine.min()),
+        "reference_seconds": reference_seconds,
+        "candidate_seconds": candidate_seconds,
+        "speedup": reference_seconds / candidate_seconds if candidate_seconds else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report cosine agreement between the PyTorch and ONNX embedding backends."
+    )
+    parser.add_argument(
+        "--texts-file", help="File with one text per line (defaults to built-in samples)."
+    )
+    parser.add_argument("--repeat", type=int, default=8, help="Times to repeat the texts.")
+    args = parser.parse_args()
+
+    texts = SAMPLE_TEXTS
+    if args.texts_file:
+        with open(args.texts_file, "r") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    texts = texts * args.repeat
+
+    config = EmbeddingConfig()
+    reference = HuggingFaceEmbeddings(config.model_name)
+    candidate = OnnxEmbeddings(
+        model_name=config.model_name,
+        model_dir=config.onnx_model_dir,
+        quantize=config.onnx_quantize,
+        max_seq_length=config.max_seq_length,
+    )
+    # Warm both backends up so the timings measure steady-state encoding.
+    reference.embed(texts[:1])
+    candidate.embed(texts[:1])
+
+    report = check_parity(reference, candidate, texts)
+    for key, value in report.items():
+        print(f"{key}: {value:.4f}" if isinstance(value, float) else f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,252 @@
+import time
+import logging
+import threading
+from collections import deque
+from typing import Optional
+
+from app.core.settings import CircuitBreakerConfig
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Rolling error-rate and latency statistics of one model.
+
+    The circuit opens when too many recent calls failed. While open, calls are
+    rejected without reaching the model; after open_seconds a single probe call is
+    let through, and its outcome closes the circuit or opens it again.
+    """
+
+    def __init__(self, model: str, config: CircuitBreakerConfig):
+        self.model = model
+        self.config = config
+        self._lock = threading.Lock()
+        # (timestamp, succeeded, latency) of the calls within the window.
+        self._calls: deque[tuple[float, bool, float]] = deque()
+        self._consecutive_failures = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self.times_opened = 0
+
+    def _expire(self, now: float) -> None:
+        while self._calls and self._calls[0][0] < now - self.config.window_seconds:
+            self._calls.popleft()
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.config.open_seconds:
+            self._state = HALF_OPEN
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def available(self) -> bool:
+        """
+        Returns whether a call could be made now, without claiming the probe.
+        :return: False while the circuit is open or its probe is running.
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            return state == CLOSED or (state == HALF_OPEN and not self._probing)
+
+    def allow(self) -> bool:
+        """
+        Claims permission for a call. A half-open circuit admits one probe at a time.
+        :return: True if the call may be made.
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """
+        Ends a call whose outcome says nothing about the model's health, such as a
+        rate limit, so that a half-open circuit can send another probe.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record(self, succeeded: bool, latency: float) -> None:
+        """
+        Records the outcome of a call and updates the circuit state.
+        :param succeeded: Whether the call succeeded.
+        :param latency: How long the call took, in seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._calls.append((now, succeeded, latency))
+            self._expire(now)
+            self._probing = False
+            if succeeded:
+                self._consecutive_failures = 0
+                if self._state != CLOSED:
+                    logging.info(f"Circuit for model {self.model} closed.")
+                self._state = CLOSED
+                return
+
+            self._consecutive_failures += 1
+            failures = sum(1 for _, ok, _ in self._calls if not ok)
+            error_rate = failures / len(self._calls)
+            if (
+                self._state == HALF_OPEN
+                or self._consecutive_failures >= self.config.consecutive_failures
+                or (
+                    len(self._calls) >= self.config.min_calls
+                    and error_rate >= self.config.error_rate_threshold
+                )
+            ):
+                if self._state != OPEN:
+                    self.times_opened += 1
+                    logging.warning(
+                        f"Circuit for model {self.model} opened: {failures} of {len(self._calls)} recent calls failed."
+                    )
+                self._state = OPEN
+                self._opened_at = now
+
+    def stats(self) -> dict:
+        """
+        Returns the rolling statistics and the health score of the model.
+        :return: A dictionary of metrics.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            calls = len(self._calls)
+            failures = sum(1 for _, ok, _ in self._calls if not ok)
+            latencies = [latency for _, ok, latency in self._calls if ok]
+            error_rate = failures / calls if calls else 0.0
+            mean_latency = sum(latencies) / len(latencies) if latencies else 0.0
+            latency_factor = (
+                min(1.0, self.config.latency_target_seconds / mean_latency)
+                if mean_latency
+                else 1.0
+            )
+            state = self._current_state(now)
+            return {
+                "state": state,
+                "calls": calls,
+                "error_rate": round(error_rate, 3),
+                "mean_latency_seconds": round(mean_latency, 3),
+                "health_score": (
+                    0.0 if state == OPEN else (1 - error_rate) * latency_factor
+                ),
+                "times_opened": self.times_opened,
+            }
+
+
+class ModelHealthRegistry:
+    """
+    Process-wide circuit breakers, one per model, and the routing built on them.
+    """
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, config: Optional[CircuitBreakerConfig] = None):
+        if not self._initialized:
+            self.config = config or CircuitBreakerConfig()
+            self._breakers: dict[str, CircuitBreaker] = {}
+            self._lock = threading.Lock()
+            self._initialized = True
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+
+    def for_model(self, model: str) -> CircuitBreaker:
+        """
+        Returns the circuit breaker of a model, creating it on first use.
+        :param model: The model name.
+        :return: The model's circuit breaker.
+        """
+        with self._lock:
+            if model not in self._breakers:
+                self._breakers[model] = CircuitBreaker(model, self.config)
+            return self._breakers[model]
+
+    def route(
+        self, models: list[str], prompt_name: Optional[str] = None
+    ) -> list[str]:
+        """
+        Orders the models a call should try. Models the prompt may not use and
+        models with an open circuit are left out. Healthy models keep their
+        configured order, followed by the degraded ones, healthiest first.
+        :param models: The configured models, in order of preference.
+        :param prompt_name: The name of the prompt, used to restrict the models.
+        :return: The models to try, in order.
+        """
+        allowed = self.config.prompt_models.get(prompt_name)
+        candidates = [model for model in models if not allowed or model in allowed]
+        if not self.enabled:
+            return candidates
+
+        scored = []
+        for index, model in enumerate(candidates):
+            if not self.for_model(model).available():
+                logging.info(f"Skipping model {model}: circuit open.")
+                continue
+            score = self.for_model(model).stats()["health_score"]
+            if score >= self.config.healthy_score:
+                scored.append((0, index, model))
+            else:
+                scored.append((1, -score, model))
+        return [model for *_, model in sorted(scored)]
+
+    def allow(self, model: str) -> bool:
+        """
+        Claims permission for a call to a model.
+        :param model: The model name.
+        :return: True if the call may be made.
+        """
+        return not self.enabled or self.for_model(model).allow()
+
+    def record(self, model: str, succeeded: bool, latency: float) -> None:
+        """
+        Records the outcome of a call to a model.
+        :param model: The model name.
+        :param succeeded: Whether the call succeeded.
+        :param latency: How long the call took, in seconds.
+        """
+        if self.enabled:
+            self.for_model(model).record(succeeded, latency)
+
+    def release(self, model: str) -> None:
+        """
+        Ends a call to a model without recording its outcome.
+        :param model: The model name.
+        """
+        if self.enabled:
+            self.for_model(model).release()
+
+    def is_open(self, model: str) -> bool:
+        """
+        Returns whether a model's circuit currently rejects calls.
+        :param model: The model name.
+        :return: True if the circuit is open.
+        """
+        return self.enabled and self.for_model(model).state == OPEN
+
+    def stats(self) -> dict:
+        """
+        Returns the health metrics of every model seen so far.
+        :return: A model -> metrics dictionary.
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {model: breaker.stats() for model, breaker in breakers.items()}
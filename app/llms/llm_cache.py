@@ -0,0 +1,179 @@
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional, Type
+
+from pydantic import BaseModel
+
+from app.core.settings import LLMCacheConfig
+
+
+class LLMResponseCache:
+    """
+    Cache of validated structured LLM responses.
+
+    At temperature 0 the same request gives the same answer, so responses are keyed
+    on a hash of everything sent to the model. The in-process tier is an LRU bounded
+    by the number of entries; the optional SQLite tier survives restarts and is
+    shared by processes on the same pod. Every entry expires after the TTL of the
+    prompt that produced it. Shared by every LLMManager in the process.
+    """
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, config: LLMCacheConfig):
+        if not self._initialized:
+            self.config = config
+            self._memory: OrderedDict[str, tuple[float, BaseModel]] = OrderedDict()
+            self._lock = threading.Lock()
+
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+            self._disk: Optional[sqlite3.Connection] = None
+            if config.disk_path:
+                self._disk = sqlite3.connect(config.disk_path, check_same_thread=False)
+                self._disk.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_responses (key TEXT PRIMARY KEY, expires_at REAL NOT NULL, response TEXT NOT NULL)"
+                )
+                self._disk.commit()
+                logging.info(
+                    f"LLMResponseCache disk tier opened at: {config.disk_path}"
+                )
+            self._initialized = True
+
+    def ttl_for(self, prompt_name: Optional[str]) -> float:
+        """
+        Returns how long responses to a prompt stay cached.
+        :param prompt_name: The name of the prompt, or None if unknown.
+        :return: The TTL in seconds; 0 means responses are not cached.
+        """
+        if not self.config.enabled:
+            return 0.0
+        return self.config.ttl_seconds.get(prompt_name, self.config.default_ttl_seconds)
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: list[dict],
+        response_model: Type[BaseModel],
+        tools: Optional[list[dict]] = None,
+        **params,
+    ) -> str:
+        """
+        Builds the cache key of a request.
+        :param model: The model the request is sent to.
+        :param messages: The chat messages.
+        :param response_model: The Pydantic model the response is validated against.
+        :param tools: The tool definitions offered to the model.
+        :param params: Other generation parameters, e.g. max_tokens and temperature.
+        :return: A hex digest identifying the request.
+        """
+        request = {
+            "model": model,
+            "messages": messages,
+            "response_model": response_model.model_json_schema(),
+            "tools": tools,
+            "params": params,
+        }
+        serialized = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(serialized.encode()).hexdigest()
+
+    def get(self, key: str, response_model: Type[BaseModel]) -> Optional[BaseModel]:
+        """
+        Looks up a response, promoting disk hits into the in-process tier.
+        :param key: The cache key.
+        :param response_model: The Pydantic model used to load disk entries.
+        :return: A copy of the cached response, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return response.model_copy(deep=True)
+                del self._memory[key]
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT expires_at, response FROM llm_responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None and row[0] > now:
+                    response = response_model.model_validate_json(row[1])
+                    self._put_memory(key, row[0], response)
+                    self.disk_hits += 1
+                    return response.model_copy(deep=True)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: BaseModel, ttl_seconds: float) -> None:
+        """
+        Stores a response in all cache tiers.
+        :param key: The cache key.
+        :param response: The validated response.
+        :param ttl_seconds: How long the response stays valid.
+        """
+        if ttl_seconds <= 0:
+            return
+        expires_at = time.time() + ttl_seconds
+        with self._lock:
+            self._put_memory(key, expires_at, response.model_copy(deep=True))
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, expires_at, response) VALUES (?, ?, ?)",
+                    (key, expires_at, response.model_dump_json()),
+                )
+                self._disk.commit()
+
+    def _put_memory(self, key: str, expires_at: float, response: BaseModel) -> None:
+        """
+        Inserts a response into the LRU tier, evicting the least recently used
+        entries beyond max_entries. Must be called with the lock held.
+        """
+        self._memory.pop(key, None)
+        self._memory[key] = (expires_at, response)
+        while len(self._memory) > self.config.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drops every entry from the in-process tier and resets the counters.
+        """
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+        :return: A dictionary with hit/miss counters and the number of entries.
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "entries": len(self._memory),
+                "max_entries": self.config.max_entries,
+            }
@@ -1,14 +1,14 @@
+import json
 import logging
+import threading
 from typing import Any, Type, Optional
-from httpx import TimeoutException
+from httpx import Limits, Response, TimeoutException
 
-import instructor
-from instructor.exceptions import InstructorRetryException
 from pydantic import BaseModel
-from groq import Groq
 
 from app.llms.llm_clients.llm_client_base import BaseLLMClient
 from app.core.settings import GroqConfig
+from app.llms.rate_limiter import RateLimiterRegistry
 from app.core.exceptions.llm_exceptions import (
     LLMTimeoutError,
     LLMRateLimitError,
@@ -27,23 +27,21 @@ class GroqClient(BaseLLMClient):
     def __init__(self):
         # TODO: Make singleton
         self._settings = GroqConfig()
-        self._client = instructor.from_groq(Groq(api_key=self._settings.groq_api_key))
+        self._client: Any = None
+        self._async_client: Any = None
+        self._client_lock = threading.Lock()
 
-    def generate(
+    def _completion_params(
         self,
         response_model: Type[BaseModel],
         messages: list[dict[str, str]],
-        tools: Optional[list[dict]] = None,
+        tools: Optional[list[dict]],
         **kwargs,
-    ) -> Any:
+    ) -> dict:
         """
-        Creates a completion using the LLM client with the provided messages and parameters.
-        :param response_model: The Pydantic model to validate the response.
-        :param messages: A list of messages to send to the LLM.
-        :param kwargs: Additional parameters for the completion request.
-        :return: The response from the LLM.
+        Builds the chat completion request, filling unset parameters from GroqConfig.
         """
-        completion_params = {
+        return {
             "model": kwargs["model"],
             "temperature": kwargs.get("temperature", self._settings.temperature),
             "max_retries": kwargs.get("max_retries", self._settings.max_retries),
@@ -53,14 +51,21 @@ class GroqClient(BaseLLMClient):
             "tools": tools,
             "tool_choice": kwargs.get("tool_choice", "auto"),
         }
-        try:
-            return self.client.chat.completions.create(**completion_params)
-        except TimeoutException as e:
-            logging.error(f"Groq timeout: {e}")
+
+    @staticmethod
+    def _raise_llm_error(error: Exception) -> None:
+        """
+        Translates an error raised by the Groq SDK or instructor into an LLM error.
+        :param error: The error raised by the completion request.
+        """
+        from instructor.exceptions import InstructorRetryException
+
+        if isinstance(error, TimeoutException):
+            logging.error(f"Groq timeout: {error}")
             raise LLMTimeoutError
-        except InstructorRetryException as e:
-            status = e.args[0].response.status_code
-            logging.error(f"Groq HTTP error {status}: {e.args[0].response.text}")
+        if isinstance(error, InstructorRetryException):
+            status = error.args[0].response.status_code
+            logging.error(f"Groq HTTP error {status}: {error.args[0].response.text}")
 
             if status == 429:
                 raise LLMRateLimitError()
@@ -69,20 +74,129 @@ class GroqClient(BaseLLMClient):
             elif status >= 500:
                 raise LLMServiceUnavailableError()
             elif status >= 400:
-                raise LLMGenerationError(f"LLM generation error: {str(e)}")
+                raise LLMGenerationError(f"LLM generation error: {str(error)}")
+            return
+
+        logging.error(f"Unhandled LLM error: {str(error)}")
+        raise LLMUnexpectedError(str(error))
 
+    def generate(
+        self,
+        response_model: Type[BaseModel],
+        messages: list[dict[str, str]],
+        tools: Optional[list[dict]] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Creates a completion using the LLM client with the provided messages and parameters.
+        :param response_model: The Pydantic model to validate the response.
+        :param messages: A list of messages to send to the LLM.
+        :param kwargs: Additional parameters for the completion request.
+        :return: The response from the LLM.
+        """
+        completion_params = self._completion_params(
+            response_model, messages, tools, **kwargs
+        )
+        try:
+            return self.client.chat.completions.create(**completion_params)
         except Exception as e:
-            logging.error(f"Unhandled LLM error: {str(e)}")
-            raise LLMUnexpectedError(str(e))
+            self._raise_llm_error(e)
+
+    async def agenerate(
+        self,
+        response_model: Type[BaseModel],
+        messages: list[dict[str, str]],
+        tools: Optional[list[dict]] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Creates a completion with the async Groq client, so the event loop keeps
+        serving other requests while the LLM responds.
+        :param response_model: The Pydantic model to validate the response.
+        :param messages: A list of messages to send to the LLM.
+        :param kwargs: Additional parameters for the completion request.
+        :return: The response from the LLM.
+        """
+        completion_params = self._completion_params(
+            response_model, messages, tools, **kwargs
+        )
+        try:
+            return await self.async_client.chat.completions.create(**completion_params)
+        except Exception as e:
+            self._raise_llm_error(e)
+
+    @staticmethod
+    def _record_rate_limits(response: Response) -> None:
+        """
+        httpx response hook feeding the rate limit headers of every Groq response,
+        429s included, to the limiter of the model that was called.
+        :param response: The HTTP response.
+        """
+        try:
+            model = json.loads(response.request.content).get("model")
+        except (ValueError, AttributeError):
+            return
+        if model:
+            RateLimiterRegistry().update_from_headers(model, response.headers)
+
+    @staticmethod
+    async def _arecord_rate_limits(response: Response) -> None:
+        """
+        Async variant of _record_rate_limits, as async clients need async hooks.
+        """
+        GroqClient._record_rate_limits(response)
 
     @property
-    def client(self) -> Groq:
+    def client(self) -> Any:
         """
-        Returns the Groq client instance.
+        Returns the instructor-patched Groq client, creating it on first access.
         :return: The Groq client.
         """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    # Imported here: instructor and groq add seconds to process start-up.
+                    import instructor
+                    from groq import Groq, DefaultHttpxClient
+
+                    http_client = DefaultHttpxClient(
+                        event_hooks={"response": [self._record_rate_limits]}
+                    )
+                    self._client = instructor.from_groq(
+                        Groq(
+                            api_key=self._settings.groq_api_key,
+                            http_client=http_client,
+                        )
+                    )
         return self._client
 
+    @property
+    def async_client(self) -> Any:
+        """
+        Returns the instructor-patched AsyncGroq client, creating it on first access.
+        :return: The async Groq client.
+        """
+        if self._async_client is None:
+            with self._client_lock:
+                if self._async_client is None:
+                    import instructor
+                    from groq import AsyncGroq, DefaultAsyncHttpxClient
+
+                    http_client = DefaultAsyncHttpxClient(
+                        limits=Limits(
+                            max_connections=self._settings.max_connections,
+                            max_keepalive_connections=self._settings.max_connections,
+                        ),
+                        event_hooks={"response": [self._arecord_rate_limits]},
+                    )
+                    self._async_client = instructor.from_groq(
+                        AsyncGroq(
+                            api_key=self._settings.groq_api_key,
+                            http_client=http_client,
+                        )
+                    )
+        return self._async_client
+
     @property
     def settings(self) -> GroqConfig:
         """
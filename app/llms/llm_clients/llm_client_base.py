@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Type, Optional
 
@@ -28,6 +29,27 @@ class BaseLLMClient(ABC):
         """
         pass
 
+    async def agenerate(
+        self,
+        response_model: Type[BaseModel],
+        messages: list[dict[str, str]],
+        tools: Optional[list[dict]] = None,
+        **kwargs,
+    ):
+        """
+        Async variant of generate. Clients without an async SDK run the
+        synchronous call in a worker thread.
+
+        :param response_model: The Pydantic model to validate the response.
+        :param messages: A list of messages to send to the LLM.
+        :param tools: Optional tool definitions the LLM may call.
+        :param kwargs: Additional parameters for the LLM call.
+        :return: The response from the LLM.
+        """
+        return await asyncio.to_thread(
+            self.generate, response_model, messages, tools, **kwargs
+        )
+
     @property
     @abstractmethod
     def client(self):
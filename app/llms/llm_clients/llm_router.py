@@ -1,11 +1,11 @@
-from typing import Any
+from typing import Any, Callable
 
 from app.llms.llm_clients.groq_client import GroqClient
 
 
 class LLMRouter:
     _client_registry: dict[str, tuple[Any, Any]] = {}
-    _clients = {"groq": (GroqClient(), GroqClient().settings)}
+    _clients: dict[str, Callable[[], Any]] = {"groq": GroqClient}
 
     @classmethod
     def register_client(cls, provider: str, initializer: tuple[Any, Any]):
@@ -23,9 +23,11 @@ class LLMRouter:
         :return: A tuple containing the client instance and its settings."""
         if client not in cls._client_registry:
             try:
-                cls.register_client(client, cls._clients[client])
+                factory = cls._clients[client]
             except KeyError:
                 raise ValueError(
                     f"Failed to register client {client}. Available clients: {list(cls._clients.keys())}"
                 )
+            instance = factory()
+            cls.register_client(client, (instance, instance.settings))
         return cls._client_registry[client]  # Returns (client, settings)
@@ -1,27 +1,58 @@
 import time
 import random
+import asyncio
 import logging
 
 from typing import Type, Optional
 from pydantic import BaseModel
 
+from app.core.settings import LLMCacheConfig
+from app.llms.llm_cache import LLMResponseCache
+from app.llms.singleflight import SingleFlight
+from app.llms.rate_limiter import RateLimiterRegistry
+from app.llms.circuit_breaker import ModelHealthRegistry
 from app.llms.llm_clients.llm_router import LLMRouter
 from app.core.exceptions.llm_exceptions import (
+    LLMBaseError,
     LLMManagerError,
     LLMRateLimitError,
     LLMTimeoutError,
-    LLMRequestTooLargeError,
     LLMServiceUnavailableError,
-    LLMGenerationError,
     LLMUnexpectedError,
 )
 from app.memory.conversation_history.local_memory import LocalMemory
 
 
 class LLMManager:
+    # Shared by every manager so that identical concurrent requests coming from
+    # different agents and pipelines result in a single upstream call.
+    in_flight = SingleFlight()
+
     def __init__(self):
         self.llm, self.settings = LLMRouter.get_client("groq")
         self.chat_history = LocalMemory()
+        self.response_cache = LLMResponseCache(LLMCacheConfig())
+        self.rate_limits = RateLimiterRegistry()
+        self.model_health = ModelHealthRegistry()
+
+    def _build_messages(
+        self,
+        user_query: str,
+        prompt: str,
+        conversation_id: Optional[str],
+        max_history: int,
+    ) -> list[dict]:
+        """
+        Builds the chat messages: the prompt as system message, followed by the
+        conversation history if there is one, or by the user query.
+        """
+        messages = [{"role": "system", "content": prompt}]
+        if conversation_id:
+            history = self.chat_history.get_history(conversation_id)
+            messages.extend([msg.model_dump() for msg in history[-max_history:]])
+        else:
+            messages.append({"role": "user", "content": user_query})
+        return messages
 
     def generate_response(
         self,
@@ -43,14 +74,9 @@ class LLMManager:
         :param response_model: The Pydantic model to validate the response.
         :return: The response from the LLM.
         """
-
-        messages = [{"role": "system", "content": prompt}]
-        if conversation_id:
-            history = self.chat_history.get_history(conversation_id)
-            messages.extend([msg.model_dump() for msg in history[-max_history:]])
-        else:
-            messages.append({"role": "user", "content": user_query})
-
+        messages = self._build_messages(
+            user_query, prompt, conversation_id, max_history
+        )
         return self.llm.generate(
             response_model=response_model,
             messages=messages,
@@ -59,64 +85,403 @@ class LLMManager:
             model=model,
         )
 
+    async def agenerate_response(
+        self,
+        model: str,
+        user_query: str,
+        prompt: str,
+        response_model: Type[BaseModel],
+        tools: Optional[list[dict]] = None,
+        conversation_id: Optional[str] = None,
+        max_tokens: int = 400,
+        max_history: int = 5,
+    ) -> str:
+        """
+        Async variant of generate_response.
+        :param user_query: The query from the user.
+        :param prompt: The prompt to be used for the LLM.
+        :param max_tokens: The maximum number of tokens to generate in the response.
+        :param response_model: The Pydantic model to validate the response.
+        :return: The response from the LLM.
+        """
+        messages = self._build_messages(
+            user_query, prompt, conversation_id, max_history
+        )
+        return await self.llm.agenerate(
+            response_model=response_model,
+            messages=messages,
+            tools=tools,
+            max_tokens=max_tokens,
+            model=model,
+        )
+
+    def _request_messages(self, request: dict) -> list[dict]:
+        """
+        Builds the messages generate_response sends for a request.
+        :param request: The keyword arguments of generate_response.
+        :return: The chat messages.
+        """
+        return self._build_messages(
+            request.get("user_query"),
+            request["prompt"],
+            request.get("conversation_id"),
+            request.get("max_history", 5),
+        )
+
+    @staticmethod
+    def estimate_tokens(messages: list[dict], max_tokens: int) -> float:
+        """
+        Estimates the tokens a call counts against the tokens-per-minute budget,
+        at roughly four characters per prompt token plus the completion budget.
+        :param messages: The chat messages.
+        :param max_tokens: The maximum number of tokens to generate.
+        :return: The estimated number of tokens.
+        """
+        characters = sum(len(str(message.get("content", ""))) for message in messages)
+        return characters / 4 + max_tokens
+
+    def _request_keys(self, request: dict, messages: list[dict]) -> dict[str, str]:
+        """
+        Hashes a structured request once per fallback model. The keys identify the
+        request both in the response cache and among the in-flight calls.
+        :param request: The keyword arguments of generate_response.
+        :param messages: The chat messages of the request.
+        :return: A model -> key dictionary; empty when there is no response model.
+        """
+        response_model = request.get("response_model")
+        if response_model is None:
+            return {}
+        return {
+            model: LLMResponseCache.make_key(
+                model,
+                messages,
+                response_model,
+                request.get("tools"),
+                max_tokens=request.get("max_tokens", 400),
+                temperature=self.settings.temperature,
+            )
+            for model in self.settings.model
+        }
+
+    def _cache_ttl(self, prompt_name: Optional[str], use_cache: bool) -> float:
+        """
+        Returns how long the response of a call may be cached. Only deterministic
+        (temperature 0) calls are cached.
+        :param prompt_name: The name of the prompt, used to pick the TTL.
+        :param use_cache: False to bypass the cache for this call.
+        :return: The TTL in seconds; 0 when the call is not cached.
+        """
+        if not use_cache or self.settings.temperature != 0:
+            return 0.0
+        return self.response_cache.ttl_for(prompt_name)
+
+    def _cached_response(
+        self, keys: dict[str, str], response_model: Optional[Type[BaseModel]]
+    ) -> Optional[BaseModel]:
+        """
+        Returns a cached response from the first fallback model that has one.
+        """
+        for model, key in keys.items():
+            cached = self.response_cache.get(key, response_model)
+            if cached is not None:
+                logging.info(f"LLM response cache hit for model {model}")
+                return cached
+        return None
+
+    def _cache_response(
+        self, keys: dict[str, str], model: str, result, ttl_seconds: float
+    ) -> None:
+        """
+        Stores a validated response under the key of the model that produced it.
+        """
+        if model in keys and isinstance(result, BaseModel):
+            self.response_cache.put(keys[model], result, ttl_seconds)
+
+    def _record_attempt(
+        self, model: str, latency: float, error: Optional[LLMBaseError] = None
+    ) -> bool:
+        """
+        Feeds the outcome of an attempt to the model's circuit breaker. Timeouts,
+        server errors and unexpected errors count as failures; rate limits and
+        rejected requests say nothing about the model's health.
+        :param model: The model that was called.
+        :param latency: How long the attempt took, in seconds.
+        :param error: The error raised by the attempt, or None if it succeeded.
+        :return: False if the model's circuit is now open.
+        """
+        if error is None:
+            self.model_health.record(model, True, latency)
+        elif isinstance(
+            error, (LLMTimeoutError, LLMServiceUnavailableError, LLMUnexpectedError)
+        ):
+            self.model_health.record(model, False, latency)
+        else:
+            self.model_health.release(model)
+        return not self.model_health.is_open(model)
+
+    def _wait_for_budget(self, model: str, fallbacks: list[str], tokens: float) -> bool:
+        """
+        Blocks until the model's rate limiter admits a call.
+        :param model: The model to call.
+        :param fallbacks: The models that may be tried after this one.
+        :param tokens: The estimated tokens of the call.
+        :return: False to move on to the next model instead.
+        """
+        wait = self.rate_limits.schedule(model, fallbacks, tokens)
+        if wait:
+            with self.rate_limits.for_model(model).queued():
+                while wait:
+                    time.sleep(wait)
+                    wait = self.rate_limits.schedule(model, fallbacks, tokens)
+        return wait is not None
+
+    async def _await_budget(
+        self, model: str, fallbacks: list[str], tokens: float
+    ) -> bool:
+        """
+        Async variant of _wait_for_budget.
+        """
+        wait = self.rate_limits.schedule(model, fallbacks, tokens)
+        if wait:
+            with self.rate_limits.for_model(model).queued():
+                while wait:
+                    await asyncio.sleep(wait)
+                    wait = self.rate_limits.schedule(model, fallbacks, tokens)
+        return wait is not None
+
+    @staticmethod
+    def retry_wait_time(
+        error: LLMBaseError,
+        model: str,
+        attempt: int,
+        retry_backoff_base: int = 2,
+        jitter_factor: float = 0.5,
+    ) -> Optional[float]:
+        """
+        The retry policy shared by the sync and async call paths: rate limits,
+        timeouts and server errors are retried with exponential backoff, any other
+        error moves on to the next model.
+        :param error: The error raised by the LLM call.
+        :param model: The model that was called.
+        :param attempt: The zero-based attempt that failed.
+        :return: Seconds to wait before retrying, or None to give up on the model.
+        """
+        if isinstance(
+            error, (LLMRateLimitError, LLMTimeoutError, LLMServiceUnavailableError)
+        ):
+            wait_time = LLMManager.calculate_backoff_time(
+                retry_backoff_base, attempt, jitter_factor
+            )
+            if isinstance(error, LLMRateLimitError):
+                logging.info(
+                    f"Rate limited. Retrying in {wait_time}s... (attempt {attempt + 1})"
+                )
+            elif isinstance(error, LLMTimeoutError):
+                logging.info(
+                    f"Timeout occurred, retrying after {wait_time}s ... (attempt {attempt + 1})"
+                )
+            else:
+                logging.error(
+                    f"Groq internal error {str(error)}. Retrying in {wait_time}s... (attempt {attempt + 1})"
+                )
+            return wait_time
+        logging.error(f"Unrecoverable LLM error for model {model}: {str(error)}")
+        return None
+
     def call_llm_with_retry(
         self,
         max_retries: int = 5,
         retry_backoff_base: int = 2,
         jitter_factor: float = 0.5,
+        prompt_name: Optional[str] = None,
+        use_cache: bool = True,
         **kwargs,
     ):
         """
-        Calls the LLM with retry logic.
+        Calls the LLM with retry logic. Blocks the calling thread while it waits;
+        async code should use acall_llm_with_retry.
         :param max_retries: The maximum number of retries for the LLM call.
-        :param kwargs: Additional parameters for the LLM call.
+        :param prompt_name: The name of the prompt, used to pick the cache TTL.
+        :param use_cache: False to bypass the response cache for this call.
+        :param kwargs: Additional parameters for the LLM call. Concurrent calls with
+            the same structured request share one upstream call and its outcome.
         :return: The response from the LLM.
         """
+        messages = self._request_messages(kwargs)
+        tokens = self.estimate_tokens(messages, kwargs.get("max_tokens", 400))
+        request_keys = self._request_keys(kwargs, messages)
+        cache_ttl = self._cache_ttl(prompt_name, use_cache)
+        cache_keys = request_keys if cache_ttl > 0 else {}
+        cached = self._cached_response(cache_keys, kwargs.get("response_model"))
+        if cached is not None:
+            return cached
+
+        def call():
+            return self._call_with_fallback(
+                max_retries,
+                retry_backoff_base,
+                jitter_factor,
+                cache_keys,
+                cache_ttl,
+                tokens,
+                prompt_name,
+                kwargs,
+            )
+
+        if not request_keys:
+            return call()
+        return LLMManager.in_flight.do(next(iter(request_keys.values())), call)
 
-        for model in self.settings.model:
+    def _call_with_fallback(
+        self,
+        max_retries: int,
+        retry_backoff_base: int,
+        jitter_factor: float,
+        cache_keys: dict[str, str],
+        cache_ttl: float,
+        tokens: float,
+        prompt_name: Optional[str],
+        kwargs: dict,
+    ):
+        """
+        Tries each fallback model in turn, retrying recoverable errors, and caches
+        the first successful response. Models are tried in the order chosen by
+        the health router, and a model is left as soon as its circuit opens.
+        Every attempt first waits for the model's rate limit budget, or moves on
+        to the next model.
+        """
+        models = self.model_health.route(self.settings.model, prompt_name)
+        for index, model in enumerate(models):
             logging.info(f"Attempting to call model: {model}")
             start_time = time.time()
             for attempt in range(max_retries):
+                if not self._wait_for_budget(model, models[index + 1 :], tokens):
+                    break
+                if not self.model_health.allow(model):
+                    break
+                attempt_start = time.time()
                 try:
                     result = self.generate_response(model, **kwargs)
+                    self._record_attempt(model, time.time() - attempt_start)
                     total_elapsed = time.time() - start_time
                     logging.info(
                         f"Model {model} succeeded in {total_elapsed:.2f}s (attempt {attempt + 1})"
                     )
+                    self._cache_response(cache_keys, model, result, cache_ttl)
                     return result
-                except LLMRateLimitError:
-                    wait_time = LLMManager.calculate_backoff_time(
-                        retry_backoff_base, attempt, jitter_factor
+                except LLMBaseError as e:
+                    healthy = self._record_attempt(
+                        model, time.time() - attempt_start, e
                     )
-                    logging.info(
-                        f"Rate limited. Retrying in {wait_time}s... (attempt {attempt + 1})"
+                    wait_time = LLMManager.retry_wait_time(
+                        e, model, attempt, retry_backoff_base, jitter_factor
                     )
+                    if wait_time is None or not healthy:
+                        break
                     time.sleep(wait_time)
-                except LLMTimeoutError:
-                    wait_time = LLMManager.calculate_backoff_time(
-                        retry_backoff_base, attempt, jitter_factor
-                    )
+                except BaseException:
+                    # Cancelled or failed outside the client: free the probe of
+                    # a half-open circuit so the model can be tried again.
+                    self.model_health.release(model)
+                    raise
+            total_elapsed = time.time() - start_time
+            logging.info(
+                f"Model {model} exhausted retries in {total_elapsed}s. Trying next..."
+            )
+        raise LLMManagerError("All fallback models failed.")
+
+    async def acall_llm_with_retry(
+        self,
+        max_retries: int = 5,
+        retry_backoff_base: int = 2,
+        jitter_factor: float = 0.5,
+        prompt_name: Optional[str] = None,
+        use_cache: bool = True,
+        **kwargs,
+    ):
+        """
+        Calls the LLM with retry logic without blocking the event loop: requests go
+        through the client's async API and backoff waits with asyncio.sleep.
+        :param max_retries: The maximum number of retries for the LLM call.
+        :param prompt_name: The name of the prompt, used to pick the cache TTL.
+        :param use_cache: False to bypass the response cache for this call.
+        :param kwargs: Additional parameters for the LLM call. Concurrent calls with
+            the same structured request share one upstream call and its outcome.
+        :return: The response from the LLM.
+        """
+        messages = self._request_messages(kwargs)
+        tokens = self.estimate_tokens(messages, kwargs.get("max_tokens", 400))
+        request_keys = self._request_keys(kwargs, messages)
+        cache_ttl = self._cache_ttl(prompt_name, use_cache)
+        cache_keys = request_keys if cache_ttl > 0 else {}
+        cached = self._cached_response(cache_keys, kwargs.get("response_model"))
+        if cached is not None:
+            return cached
+
+        def call():
+            return self._acall_with_fallback(
+                max_retries,
+                retry_backoff_base,
+                jitter_factor,
+                cache_keys,
+                cache_ttl,
+                tokens,
+                prompt_name,
+                kwargs,
+            )
+
+        if not request_keys:
+            return await call()
+        return await LLMManager.in_flight.ado(next(iter(request_keys.values())), call)
+
+    async def _acall_with_fallback(
+        self,
+        max_retries: int,
+        retry_backoff_base: int,
+        jitter_factor: float,
+        cache_keys: dict[str, str],
+        cache_ttl: float,
+        tokens: float,
+        prompt_name: Optional[str],
+        kwargs: dict,
+    ):
+        """
+        Async variant of _call_with_fallback.
+        """
+        models = self.model_health.route(self.settings.model, prompt_name)
+        for index, model in enumerate(models):
+            logging.info(f"Attempting to call model: {model}")
+            start_time = time.time()
+            for attempt in range(max_retries):
+                if not await self._await_budget(model, models[index + 1 :], tokens):
+                    break
+                if not self.model_health.allow(model):
+                    break
+                attempt_start = time.time()
+                try:
+                    result = await self.agenerate_response(model, **kwargs)
+                    self._record_attempt(model, time.time() - attempt_start)
+                    total_elapsed = time.time() - start_time
                     logging.info(
-                        f"Timeout occurred, retrying after {wait_time}s ... (attempt {attempt + 1})"
-                    )
-                    time.sleep(wait_time)
-                except LLMServiceUnavailableError as e:
-                    wait_time = LLMManager.calculate_backoff_time(
-                        retry_backoff_base, attempt, jitter_factor
+                        f"Model {model} succeeded in {total_elapsed:.2f}s (attempt {attempt + 1})"
                     )
-                    logging.error(
-                        f"Groq internal error {str(e)}. Retrying in {wait_time}s... (attempt {attempt + 1})"
+                    self._cache_response(cache_keys, model, result, cache_ttl)
+                    return result
+                except LLMBaseError as e:
+                    healthy = self._record_attempt(
+                        model, time.time() - attempt_start, e
                     )
-                    time.sleep(wait_time)
-                except (
-                    LLMRequestTooLargeError,
-                    LLMGenerationError,
-                    LLMUnexpectedError,
-                ) as e:
-                    logging.error(
-                        f"Unrecoverable LLM error for model {model}: {str(e)}"
+                    wait_time = LLMManager.retry_wait_time(
+                        e, model, attempt, retry_backoff_base, jitter_factor
                     )
-                    break
+                    if wait_time is None or not healthy:
+                        break
+                    await asyncio.sleep(wait_time)
+                except BaseException:
+                    # Cancelled or failed outside the client: free the probe of
+                    # a half-open circuit so the model can be tried again.
+                    self.model_health.release(model)
+                    raise
             total_elapsed = time.time() - start_time
             logging.info(
                 f"Model {model} exhausted retries in {total_elapsed}s. Trying next..."
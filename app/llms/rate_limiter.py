@@ -0,0 +1,288 @@
+import re
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Mapping, Optional
+
+from app.core.settings import RateLimitConfig
+
+# Groq reports reset times as Go durations, e.g. "7.66s", "2m59.56s" or "120ms".
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a rate limit reset header.
+    :param value: A Go duration such as "2m59.56s", or plain seconds.
+    :return: The duration in seconds, or None if the value cannot be parsed.
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """
+    A budget that refills continuously up to its capacity.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.available = capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self.available = min(
+            self.capacity, self.available + elapsed * self.refill_per_second
+        )
+        self._updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        Returns how long until `amount` is available.
+        :param amount: The amount to take from the bucket.
+        :param now: The current monotonic time.
+        :return: Seconds to wait; 0 if the amount is available now.
+        """
+        self._refill(now)
+        # A request larger than the whole bucket is let through once it is full.
+        missing = min(amount, self.capacity) - self.available
+        if missing <= 0:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return float("inf")
+        return missing / self.refill_per_second
+
+    def take(self, amount: float) -> None:
+        """
+        Takes an amount from the bucket, which may leave it in debt.
+        :param amount: The amount to take.
+        """
+        self.available -= amount
+
+    def sync(
+        self, remaining: float, reset_seconds: Optional[float], limit: Optional[float]
+    ) -> None:
+        """
+        Aligns the bucket with the budget reported by the provider. The bucket then
+        refills to its capacity by the time the provider resets the budget.
+        :param remaining: The remaining budget.
+        :param reset_seconds: Seconds until the budget is fully restored.
+        :param limit: The size of the budget, if reported.
+        """
+        self._refill(time.monotonic())
+        if limit:
+            self.capacity = limit
+        self.available = min(self.capacity, remaining)
+        if reset_seconds and self.available < self.capacity:
+            self.refill_per_second = (self.capacity - self.available) / reset_seconds
+
+
+class ModelRateLimiter:
+    """
+    Request and token budgets of one model.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self._lock = threading.Lock()
+        self.requests = TokenBucket(requests_per_minute, requests_per_minute / 60)
+        self.tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60)
+        self._paused_until = 0.0
+        self.queue_depth = 0
+        self.throttled = 0
+
+    def wait_time(self, tokens: float) -> float:
+        """
+        Returns how long until a call using `tokens` fits in both budgets.
+        :param tokens: The estimated tokens of the call.
+        :return: Seconds to wait; 0 if the call can be made now.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return max(
+                self._paused_until - now,
+                self.requests.wait_time(1, now),
+                self.tokens.wait_time(tokens, now),
+            )
+
+    def reserve(self, tokens: float) -> float:
+        """
+        Takes one request and `tokens` from the budgets if both allow it.
+        :param tokens: The estimated tokens of the call.
+        :return: 0 if the budget was reserved, otherwise seconds until it will fit.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(
+                self._paused_until - now,
+                self.requests.wait_time(1, now),
+                self.tokens.wait_time(tokens, now),
+            )
+            if wait > 0:
+                self.throttled += 1
+                return wait
+            self.requests.take(1)
+            self.tokens.take(tokens)
+            return 0.0
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Updates the budgets from the x-ratelimit-* and retry-after headers of a
+        response.
+        :param headers: The response headers.
+        """
+        # Groq's request limit is per day, so only the token limit resizes a bucket;
+        # the remaining requests still cap the per-minute request budget.
+        buckets = ((self.requests, "requests", False), (self.tokens, "tokens", True))
+        with self._lock:
+            for bucket, kind, resize in buckets:
+                remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                if remaining is None:
+                    continue
+                limit = headers.get(f"x-ratelimit-limit-{kind}") if resize else None
+                try:
+                    bucket.sync(
+                        float(remaining),
+                        parse_duration(headers.get(f"x-ratelimit-reset-{kind}")),
+                        float(limit) if limit else None,
+                    )
+                except ValueError:
+                    logging.warning(f"Invalid {kind} rate limit headers: {remaining}")
+            retry_after = parse_duration(headers.get("retry-after"))
+            if retry_after:
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + retry_after
+                )
+
+    @contextmanager
+    def queued(self) -> Iterator[None]:
+        """
+        Counts a call in the queue depth while it waits for budget.
+        """
+        with self._lock:
+            self.queue_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.queue_depth -= 1
+
+    def stats(self) -> dict:
+        """
+        Returns the current budgets and queue depth.
+        :return: A dictionary of metrics.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.requests.wait_time(0, now)
+            self.tokens.wait_time(0, now)
+            return {
+                "requests_available": round(self.requests.available, 2),
+                "requests_capacity": self.requests.capacity,
+                "tokens_available": round(self.tokens.available, 2),
+                "tokens_capacity": self.tokens.capacity,
+                "paused_seconds": round(max(0.0, self._paused_until - now), 2),
+                "queue_depth": self.queue_depth,
+                "throttled": self.throttled,
+            }
+
+
+class RateLimiterRegistry:
+    """
+    Process-wide rate limiters, one per model, seeded from RateLimitConfig and
+    kept in line with the limits the provider reports.
+    """
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, config: Optional[RateLimitConfig] = None):
+        if not self._initialized:
+            self.config = config or RateLimitConfig()
+            self._limiters: dict[str, ModelRateLimiter] = {}
+            self._lock = threading.Lock()
+            self._initialized = True
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+
+    def for_model(self, model: str) -> ModelRateLimiter:
+        """
+        Returns the limiter of a model, creating it from the configured budgets.
+        :param model: The model name.
+        :return: The model's rate limiter.
+        """
+        with self._lock:
+            if model not in self._limiters:
+                self._limiters[model] = ModelRateLimiter(
+                    self.config.requests_per_minute.get(
+                        model, self.config.default_requests_per_minute
+                    ),
+                    self.config.tokens_per_minute.get(
+                        model, self.config.default_tokens_per_minute
+                    ),
+                )
+            return self._limiters[model]
+
+    def schedule(
+        self, model: str, fallbacks: list[str], tokens: float
+    ) -> Optional[float]:
+        """
+        Decides when a call to a model may be made. The budget is reserved if the
+        call can be made now. Otherwise the call is routed to a fallback model that
+        has budget, or queued if the wait is short enough.
+        :param model: The model to call.
+        :param fallbacks: The models that may be tried after this one.
+        :param tokens: The estimated tokens of the call.
+        :return: 0 if the call can be made now, seconds to wait before scheduling it
+            again, or None to skip the model.
+        """
+        if not self.enabled:
+            return 0.0
+        wait = self.for_model(model).reserve(tokens)
+        if wait <= 0:
+            return 0.0
+        if any(self.for_model(other).wait_time(tokens) <= 0 for other in fallbacks):
+            logging.info(
+                f"Model {model} out of budget for {wait:.2f}s, routing to a fallback."
+            )
+            return None
+        if wait > self.config.max_queue_seconds:
+            logging.info(f"Model {model} out of budget for {wait:.2f}s, skipping it.")
+            return None
+        return wait
+
+    def update_from_headers(self, model: str, headers: Mapping[str, str]) -> None:
+        """
+        Updates a model's budgets from the headers of a response.
+        :param model: The model the request was sent to.
+        :param headers: The response headers.
+        """
+        if self.enabled:
+            self.for_model(model).update_from_headers(headers)
+
+    def stats(self) -> dict:
+        """
+        Returns the metrics of every model seen so far.
+        :return: A model -> metrics dictionary.
+        """
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {model: limiter.stats() for model, limiter in limiters.items()}
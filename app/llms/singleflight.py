@@ -0,0 +1,106 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """
+    Registry of in-flight calls keyed on a request hash.
+
+    The first caller of a key runs the call; callers arriving with the same key
+    while it runs wait for it and get the same result, or the same error, instead
+    of starting a call of their own. The key is released as soon as the call
+    finishes, so nothing is cached beyond the lifetime of the call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        self._async_calls: dict[str, asyncio.Future] = {}
+
+        self.leaders = 0
+        self.shared = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Runs fn unless a call with the same key is already running in another
+        thread, in which case that call's outcome is returned.
+        :param key: The request hash.
+        :param fn: The call to run.
+        :return: The result of fn.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.leaders += 1
+            else:
+                self.shared += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of do for coroutines running on the same event loop. If the
+        leading caller is cancelled, the waiting callers are not: they retry, and
+        one of them starts the call again.
+        :param key: The request hash.
+        :param fn: A coroutine function running the call.
+        :return: The result of fn.
+        """
+        while (future := self._async_calls.get(key)) is not None:
+            self.shared += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._async_calls[key] = future
+        self.leaders += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Wakes the waiting callers up; the key is dropped below before they
+            # run, so the first of them to retry becomes the new leader.
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the error as retrieved when no other caller was waiting for it.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._async_calls[key]
+
+    def stats(self) -> dict:
+        """
+        Returns how many calls were made and how many were coalesced into them.
+        :return: A dictionary with the leaders, shared and in_flight counters.
+        """
+        with self._lock:
+            return {
+                "leaders": self.leaders,
+                "shared": self.shared,
+                "in_flight": len(self._calls) + len(self._async_calls),
+            }
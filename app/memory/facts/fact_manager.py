@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from app.data.dtos.fact import FactDTO
@@ -6,6 +7,9 @@ from app.llms.llm_manager import LLMManager
 from app.memory.facts.fact_store import FactStore
 from app.rag_engine.retrieval_pipeline import RetrievalPipeline
 
+# Journal entries fetched per round-trip; the LLM still sees `limit` entries at a time.
+FETCH_PAGE_SIZE = 100
+
 
 class FactManager:
     """
@@ -41,48 +45,76 @@ class FactManager:
         :return: A list of dictionaries containing extracted facts and their categories.
         """
         user_trip_id = f"{user_id}_{trip_id}"
-        journal_entries = self.retrieval_pipeline.get_all_journal_entries(user_trip_id)
-        if not journal_entries:
-            logging.info("No journal entries provided for fact extraction.")
-            return []
+        pages = self.retrieval_pipeline.aiter_journal_entries(
+            user_trip_id, page_size=FETCH_PAGE_SIZE, fields=["description"]
+        )
 
+        response = None
         existing_facts = []
         existing_facts_str = ""
-        for i in range(0, len(journal_entries), limit):
-            batch_entries = journal_entries[i : i + limit]
-            logging.info(
-                f"Processing batch {i // limit + 1} with {len(batch_entries)} entries for fact extraction."
-            )
-
-            journal_entries_str = "\n".join(
-                [
-                    entry.get("description") or ""
-                    for entry in batch_entries
-                    if "description" in entry
+        batch_number = 0
+        buffered_entries: list[dict] = []
+        next_page = asyncio.ensure_future(anext(pages, None))
+        try:
+            while True:
+                while len(buffered_entries) < limit and next_page is not None:
+                    page = await next_page
+                    if page is None:
+                        next_page = None
+                        continue
+                    buffered_entries.extend(page)
+                    # Fetch the following page while the LLM works on this one.
+                    next_page = asyncio.ensure_future(anext(pages, None))
+                if not buffered_entries:
+                    break
+                batch_entries = buffered_entries[:limit]
+                buffered_entries = buffered_entries[limit:]
+                batch_number += 1
+                logging.info(
+                    f"Processing batch {batch_number} with {len(batch_entries)} entries for fact extraction."
+                )
+
+                journal_entries_str = "\n".join(
+                    [
+                        entry.get("description") or ""
+                        for entry in batch_entries
+                        if "description" in entry
+                    ]
+                )
+
+                rendered_prompt = FactExtracting.format(
+                    user_id=user_id,
+                    journal_entries=journal_entries_str,
+                    existing_facts=existing_facts_str,
+                )
+                response = await self.llm_manager.acall_llm_with_retry(
+                    user_query=journal_entries_str,
+                    prompt=rendered_prompt,
+                    response_model=FactExtracting.response_model(),
+                    max_tokens=400,
+                    prompt_name=FactExtracting.prompt_name,
+                )
+
+                new_facts = [
+                    {"category": fact.category, "fact_text": fact.fact_text}
+                    for fact in response.extracted_facts
                 ]
-            )
-
-            rendered_prompt = FactExtracting.format(
-                user_id=user_id,
-                journal_entries=journal_entries_str,
-                existing_facts=existing_facts_str,
-            )
-            response = self.llm_manager.call_llm_with_retry(
-                user_query=journal_entries_str,
-                prompt=rendered_prompt,
-                response_model=FactExtracting.response_model(),
-                max_tokens=400,
-            )
-
-            new_facts = [
-                {"category": fact.category, "fact_text": fact.fact_text}
-                for fact in response.extracted_facts
-            ]
-            existing_facts.extend(new_facts)
-
-            existing_facts_str = "\n".join(
-                f"- {fact['category']}: {fact['fact_text']}" for fact in existing_facts
-            )
+                existing_facts.extend(new_facts)
+
+                existing_facts_str = "\n".join(
+                    f"- {fact['category']}: {fact['fact_text']}"
+                    for fact in existing_facts
+                )
+        finally:
+            # The page fetch must finish before the generator can be closed.
+            if next_page is not None:
+                next_page.cancel()
+                await asyncio.gather(next_page, return_exceptions=True)
+            await pages.aclose()
+
+        if response is None:
+            logging.info("No journal entries provided for fact extraction.")
+            return []
 
         await self.fact_store.add_data(response.extracted_facts)
 
@@ -0,0 +1,174 @@
+import re
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from app.core.settings import ChunkingConfig
+from app.data.dtos.trip import TripStepDTO
+
+SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+WORD = re.compile(r"\S+")
+CHUNK_ID_NAMESPACE = uuid.UUID("6f1c35e2-8a4e-4c1b-9a57-2f1f4b8de0a3")
+# Payload fields that only describe a single chunk; they are dropped when
+# chunks are collapsed back into their step.
+CHUNK_FIELDS = ("chunk_index", "chunk_start", "chunk_end")
+# Payload fields needed to put the chunks of a step back together.
+COLLAPSE_FIELDS = ("step_id", "chunk_count") + CHUNK_FIELDS
+GAP_MARKER = " … "
+
+
+def chunk_point_id(step_id: int, chunk_index: int) -> Any:
+    """
+    Returns the id of one chunk of a step. The first chunk keeps the step id, so
+    steps short enough for a single chunk are stored exactly as before chunking.
+    :param step_id: The Polarsteps id of the step.
+    :param chunk_index: Position of the chunk within the step.
+    :return: The step id for the first chunk, a deterministic UUID string otherwise.
+    """
+    if chunk_index == 0:
+        return step_id
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, f"{step_id}:{chunk_index}"))
+
+
+@dataclass
+class StepChunk:
+    step: TripStepDTO
+    text: str
+    index: int
+    count: int
+    start: int
+    end: int
+
+    @property
+    def point_id(self) -> Any:
+        return chunk_point_id(self.step.id, self.index)
+
+
+class StepChunker:
+    """
+    Splits step descriptions into overlapping passages of whole sentences, so that
+    long journal entries are not truncated by the embedding model.
+    """
+
+    def __init__(self, config: ChunkingConfig):
+        if config.chunk_overlap >= config.chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size.")
+        self.enabled = config.enabled
+        self.chunk_size = config.chunk_size
+        self.chunk_overlap = config.chunk_overlap
+        self.search_overfetch = config.search_overfetch if config.enabled else 1
+
+    def split(self, text: str) -> list[tuple[int, int]]:
+        """
+        Splits a text into passages of at most chunk_size words. Passages end on
+        sentence boundaries and repeat up to chunk_overlap words of the previous
+        passage; sentences longer than a passage are split between words.
+        :param text: The text to split.
+        :return: (start, end) character offsets of each passage.
+        """
+        units: list[tuple[int, int, int]] = []
+        for sentence in self._sentence_spans(text):
+            words = [m.span() for m in WORD.finditer(text, *sentence)]
+            for i in range(0, len(words), self.chunk_size):
+                piece = words[i : i + self.chunk_size]
+                units.append((piece[0][0], piece[-1][1], len(piece)))
+
+        chunks = []
+        i = 0
+        while i < len(units):
+            j = i
+            words = 0
+            while j < len(units) and (j == i or words + units[j][2] <= self.chunk_size):
+                words += units[j][2]
+                j += 1
+            chunks.append((units[i][0], units[j - 1][1]))
+            if j == len(units):
+                break
+            # Start the next passage with the trailing sentences that fit in the overlap.
+            k = j
+            overlap = 0
+            while k - 1 > i and overlap + units[k - 1][2] <= self.chunk_overlap:
+                overlap += units[k - 1][2]
+                k -= 1
+            i = k
+        return chunks
+
+    @staticmethod
+    def _sentence_spans(text: str) -> list[tuple[int, int]]:
+        spans = []
+        start = 0
+        for boundary in SENTENCE_END.finditer(text):
+            spans.append((start, boundary.start()))
+            start = boundary.end()
+        if text[start:].strip():
+            spans.append((start, len(text.rstrip())))
+        return [span for span in spans if text[span[0] : span[1]].strip()]
+
+    def chunk_steps(self, steps: list[TripStepDTO]) -> list[StepChunk]:
+        """
+        Splits every step into the passages that are embedded for it.
+        Steps without a description are embedded by display name, as a single chunk.
+        :param steps: The trip steps.
+        :return: The chunks of all steps, grouped by step in step order.
+        """
+        chunks = []
+        for step in steps:
+            text = step.description or step.display_name
+            spans = self.split(text) if self.enabled and step.description else []
+            if len(spans) <= 1:
+                chunks.append(StepChunk(step, text, 0, 1, 0, len(text)))
+                continue
+            chunks.extend(
+                StepChunk(step, text[start:end], index, len(spans), start, end)
+                for index, (start, end) in enumerate(spans)
+            )
+        return chunks
+
+
+def collapse_chunks(documents: list[dict]) -> list[dict]:
+    """
+    Groups chunk documents back into one document per step. Steps keep the rank of
+    their best chunk, and the description is stitched from the step's chunks in
+    text order: overlaps are merged, and gaps between non-adjacent chunks are marked.
+    :param documents: Documents as returned by the vector store, best first.
+    :return: One document per step.
+    """
+    groups: dict[Any, list[dict]] = {}
+    collapsed: list[Any] = []
+    for document in documents:
+        step_id = document.get("step_id")
+        if step_id is None or "chunk_start" not in document:
+            collapsed.append(document)
+            continue
+        if step_id not in groups:
+            groups[step_id] = []
+            collapsed.append(step_id)
+        groups[step_id].append(document)
+
+    results = []
+    for item in collapsed:
+        if isinstance(item, dict):
+            results.append(item)
+            continue
+        chunks = sorted(groups[item], key=lambda chunk: chunk["chunk_start"])
+        description = ""
+        end = None
+        index = None
+        for chunk in chunks:
+            if end is None:
+                description = chunk["description"]
+            elif chunk["chunk_start"] <= end:
+                description += chunk["description"][end - chunk["chunk_start"] :]
+            elif chunk["chunk_index"] == index + 1:
+                # Adjacent chunks are only separated by the whitespace between sentences.
+                description += " " + chunk["description"]
+            else:
+                description += GAP_MARKER + chunk["description"]
+            end = max(end or 0, chunk["chunk_end"])
+            index = chunk["chunk_index"]
+        document = {
+            key: value for key, value in chunks[0].items() if key not in CHUNK_FIELDS
+        }
+        document["description"] = description
+        results.append(document)
+    return results
@@ -0,0 +1,109 @@
+from typing import Optional, Union
+
+from app.core.settings import VectorStoreConfig
+from app.data.dtos.geo import GEO_FIELD
+from app.data.storage.vector_store_base import VectorStoreBase
+from app.core.exceptions.custom_exceptions import VectorStoreError
+
+PER_TRIP_LAYOUT = "per_trip"
+SHARED_LAYOUT = "shared"
+TRIP_COLLECTION_SUFFIX = "_trip_collection"
+
+# Payload fields stored on every step so that a shared collection can be filtered
+# by tenant. user_trip_id matches the "{user_id}_{trip_id}" key used by the services.
+TENANT_FIELDS = ("user_id", "trip_id", "user_trip_id")
+
+
+class CollectionLayout:
+    """
+    Decides where a trip's steps live in the vector store.
+
+    With the per_trip layout every trip gets its own "{user_id}_{trip_id}_trip_collection".
+    With the shared layout all steps live in one collection and reads are narrowed
+    with an indexed payload filter, which also makes cross-trip search possible.
+    """
+
+    def __init__(self, config: VectorStoreConfig):
+        if config.storage_layout not in (PER_TRIP_LAYOUT, SHARED_LAYOUT):
+            raise ValueError(
+                f"Unknown storage layout '{config.storage_layout}'. Available layouts: ['{PER_TRIP_LAYOUT}', '{SHARED_LAYOUT}']"
+            )
+        self.storage_layout = config.storage_layout
+        self.shared_collection_name = config.shared_collection_name
+
+    @property
+    def is_shared(self) -> bool:
+        return self.storage_layout == SHARED_LAYOUT
+
+    @staticmethod
+    def per_trip_collection_name(user_trip_id: str) -> str:
+        """
+        Returns the name of a trip's own collection in the per_trip layout.
+        :param user_trip_id: The "{user_id}_{trip_id}" key of the trip.
+        :return: The collection name.
+        """
+        return f"{user_trip_id}{TRIP_COLLECTION_SUFFIX}"
+
+    @staticmethod
+    def tenant_payload(
+        user_id: Union[str, int], trip_id: Union[str, int]
+    ) -> dict[str, str]:
+        """
+        Returns the tenant fields stored with each step of a trip.
+        Values are strings so that they match the ids received by the API.
+        :param user_id: The ID of the user.
+        :param trip_id: The ID of the trip.
+        :return: A dictionary with the user_id, trip_id and user_trip_id fields.
+        """
+        return {
+            "user_id": str(user_id),
+            "trip_id": str(trip_id),
+            "user_trip_id": f"{user_id}_{trip_id}",
+        }
+
+    def trip_target(self, user_trip_id: str) -> tuple[str, Optional[dict]]:
+        """
+        Returns the collection holding a trip and the filter selecting its steps.
+        :param user_trip_id: The "{user_id}_{trip_id}" key of the trip.
+        :return: A (collection name, filters) tuple; filters is None for per_trip.
+        """
+        if self.is_shared:
+            return self.shared_collection_name, {"user_trip_id": user_trip_id}
+        return self.per_trip_collection_name(user_trip_id), None
+
+    def user_target(self, user_id: str) -> tuple[str, dict]:
+        """
+        Returns the collection and filter selecting every step of a user, across trips.
+        :param user_id: The ID of the user.
+        :return: A (collection name, filters) tuple.
+        """
+        if not self.is_shared:
+            raise VectorStoreError(
+                "Searching across trips requires the shared storage layout."
+            )
+        return self.shared_collection_name, {"user_id": str(user_id)}
+
+    def create_collection(
+        self,
+        client: VectorStoreBase,
+        collection_name: str,
+        embedding_size: int,
+        sparse_vectors: bool = False,
+    ) -> None:
+        """
+        Creates a collection with a geo index on the step locations and, for the
+        shared collection, indexes the tenant fields.
+        :param client: The vector store client.
+        :param collection_name: Name of the collection to create.
+        :param embedding_size: Size of the embedding vectors.
+        :param sparse_vectors: Whether documents also store BM25 sparse vectors.
+        """
+        client.create_collection(
+            collection_name, embedding_size, sparse_vectors=sparse_vectors
+        )
+        client.create_payload_index(collection_name, GEO_FIELD, field_type="geo")
+        if self.is_shared and collection_name == self.shared_collection_name:
+            for field_name in TENANT_FIELDS:
+                client.create_payload_index(
+                    collection_name, field_name, is_tenant=field_name == "user_id"
+                )
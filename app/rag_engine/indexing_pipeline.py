@@ -1,32 +1,238 @@
+import time
 import logging
+from collections import deque
+from typing import Iterable, Iterator, Optional, Union
+
+from pydantic import BaseModel
 
 from app.rag_engine.vector_store import VectorStore
-from app.core.settings import QdrantConfig
-from app.data.storage.qdrant_client import QdrantClientWrapper
-from app.embeddings.huggingface_embeddings import HuggingFaceEmbeddings
+from app.core.settings import EmbeddingConfig, VectorStoreConfig
+from app.data.dtos.trip import TripDTO, TripStepDTO
+from app.data.io.trip_stream import TripStream, iter_trips
+from app.data.storage.vector_store_factory import create_vector_store_client
+from app.embeddings.embedding_factory import create_embeddings
+from app.embeddings.embedding_pool import EmbeddingPool
+
+
+class IndexingReport(BaseModel):
+    trips: int = 0
+    steps: int = 0
+    seconds: float = 0.0
+
+    @property
+    def steps_per_second(self) -> float:
+        return self.steps / self.seconds if self.seconds else 0.0
+
+
+class SyncReport(BaseModel):
+    added: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
 
 
 class IndexingPipeline:
     def __init__(self):
-        self.storage_client = QdrantClientWrapper(QdrantConfig())
-        self.embeddings = HuggingFaceEmbeddings()
+        self.embedding_config = EmbeddingConfig()
+        self.storage_client = create_vector_store_client(VectorStoreConfig())
+        self.embeddings = create_embeddings(self.embedding_config)
         self.vector_store = VectorStore(self.storage_client, self.embeddings)
 
-    def add_trip_to_vector_store(self, data, user_trip_id: str):
+    def add_trip_to_vector_store(
+        self, data, user_trip_id: str, incremental: bool = False
+    ) -> Optional[SyncReport]:
         """
         Reads a trip from Polarsteps, converts it to documents, and adds them to the vector store.
         :param data: The trip data to be indexed.
         :param user_trip_id: Unique identifier for the user's trip collection.
+        :param incremental: Only re-index steps that were added, changed or removed.
+        :return: A SyncReport in incremental mode, None otherwise.
         """
         logging.info(f"Read trip data with {len(data.all_steps)} steps.")
+        if incremental:
+            return self.sync_trip(data, user_trip_id)
 
-        prepared_data = self.vector_store.prepare_data(data.all_steps)
-        collection_name = f"{user_trip_id}_trip_collection"
+        prepared_data = self.vector_store.prepare_data(
+            data.all_steps,
+            payload=self.vector_store.layout.tenant_payload(data.user_id, data.id),
+        )
+        collection_name, filters = self.vector_store.layout.trip_target(user_trip_id)
+        stored = self.vector_store.stored_steps(collection_name, filters)
 
         try:
             self.vector_store.add_documents(
                 collection_name=collection_name, documents=prepared_data
             )
+            stale_ids = self._stale_chunk_ids(prepared_data, stored)
+            if stale_ids:
+                self.vector_store.delete_documents(collection_name, stale_ids)
         except Exception as e:
             logging.error(f"Error adding documents to vector store: {e}")
             raise e
+
+    @staticmethod
+    def _stale_chunk_ids(documents: list, stored: dict[int, tuple]) -> list:
+        """
+        Returns the ids of stored chunks that re-indexed steps no longer have, since a
+        step may now have fewer chunks than the stored version.
+        :param documents: The documents just written.
+        :param stored: The stored steps, as returned by VectorStore.stored_steps.
+        :return: The ids of the chunks to delete.
+        """
+        chunk_counts = {
+            document.payload["step_id"]: document.payload["chunk_count"]
+            for document in documents
+        }
+        stale_ids = []
+        for step_id, chunk_count in chunk_counts.items():
+            if step_id in stored:
+                stale_ids += VectorStore.chunk_ids(
+                    step_id, stored[step_id][1], start=chunk_count
+                )
+        return stale_ids
+
+    def sync_trip(self, data: TripDTO, user_trip_id: str) -> SyncReport:
+        """
+        Brings a trip's stored steps in line with `data`: compares each step's content
+        hash with the stored one, embeds only new and changed steps, and deletes
+        steps that are no longer in the trip.
+        :param data: The current trip data.
+        :param user_trip_id: Unique identifier for the user's trip collection.
+        :return: A SyncReport with the number of added, updated, deleted and unchanged steps.
+        """
+        layout = self.vector_store.layout
+        collection_name, filters = layout.trip_target(user_trip_id)
+        stored = self.vector_store.stored_steps(collection_name, filters)
+        signature = self.vector_store.index_signature
+
+        report = SyncReport()
+        changed_steps = []
+        for step in data.all_steps:
+            stored_hash, _ = stored.get(step.id, (None, 0))
+            if stored_hash == VectorStore.content_hash(step, signature):
+                report.unchanged += 1
+                continue
+            changed_steps.append(step)
+            if step.id in stored:
+                report.updated += 1
+            else:
+                report.added += 1
+
+        stale_ids = []
+        if changed_steps:
+            documents = self.vector_store.prepare_data(
+                changed_steps, payload=layout.tenant_payload(data.user_id, data.id)
+            )
+            self.vector_store.add_documents(collection_name, documents)
+            stale_ids += self._stale_chunk_ids(documents, stored)
+
+        current_ids = {step.id for step in data.all_steps}
+        removed_ids = [step_id for step_id in stored if step_id not in current_ids]
+        for step_id in removed_ids:
+            stale_ids += VectorStore.chunk_ids(step_id, stored[step_id][1])
+        if stale_ids:
+            self.vector_store.delete_documents(collection_name, stale_ids)
+        report.deleted = len(removed_ids)
+
+        logging.info(
+            f"Synced trip '{user_trip_id}': {report.added} added, {report.updated} updated, "
+            f"{report.deleted} deleted, {report.unchanged} unchanged."
+        )
+        return report
+
+    def index_export(
+        self,
+        path: str,
+        num_workers: Optional[int] = None,
+        batch_size: int = 64,
+    ) -> IndexingReport:
+        """
+        Bulk-indexes every trip of a Polarsteps export, streaming steps from disk so that
+        only the batches being embedded are held in memory.
+        :param path: A trip.json file, an export directory or a zip archive.
+        :param num_workers: Number of embedding worker processes (defaults to half the cores).
+        :param batch_size: Number of steps embedded per worker task.
+        :return: An IndexingReport with the number of trips, steps and throughput.
+        """
+        return self.index_trips(iter_trips(path), num_workers, batch_size)
+
+    @staticmethod
+    def _step_batches(
+        trip: Union[TripDTO, TripStream], batch_size: int
+    ) -> Iterator[list[TripStepDTO]]:
+        """
+        Splits a trip's steps into batches, parsing streamed trips lazily.
+        """
+        if isinstance(trip, TripStream):
+            yield from trip.chunks(batch_size)
+            return
+        for i in range(0, len(trip.all_steps), batch_size):
+            yield trip.all_steps[i : i + batch_size]
+
+    def index_trips(
+        self,
+        trips: Iterable[Union[TripDTO, TripStream]],
+        num_workers: Optional[int] = None,
+        batch_size: int = 64,
+    ) -> IndexingReport:
+        """
+        Bulk-indexes many trips, sharding the embedding work across worker processes.
+        Trips are consumed lazily and batches are uploaded as soon as they are embedded.
+        :param trips: The trips to index, either loaded or streamed from an export.
+        :param num_workers: Number of embedding worker processes (defaults to half the cores).
+            0 embeds in this process with the pipeline's own model.
+        :param batch_size: Number of steps embedded per worker task.
+        :return: An IndexingReport with the number of trips, steps and throughput.
+        """
+        report = IndexingReport()
+        start_time = time.perf_counter()
+        created_collections: set[str] = set()
+
+        with self.vector_store.bulk_writes(), EmbeddingPool(
+            self.embedding_config,
+            num_workers=num_workers,
+            embeddings=self.embeddings if num_workers == 0 else None,
+        ) as pool:
+            embedding_size = pool.get_embedding_dimension()
+            batches: deque[tuple[str, dict, list[TripStepDTO], dict]] = deque()
+            layout = self.vector_store.layout
+
+            def text_batches() -> Iterator[list[str]]:
+                for trip in trips:
+                    report.trips += 1
+                    tenant = layout.tenant_payload(trip.user_id, trip.id)
+                    collection_name, filters = layout.trip_target(
+                        tenant["user_trip_id"]
+                    )
+                    # Read before any batch of the trip is written, so that re-indexed
+                    # steps can drop the chunks they no longer have.
+                    stored = self.vector_store.stored_steps(collection_name, filters)
+                    for steps in IndexingPipeline._step_batches(trip, batch_size):
+                        batches.append((collection_name, tenant, steps, stored))
+                        yield self.vector_store.step_texts(steps)
+
+            for embeddings in pool.imap(text_batches()):
+                collection_name, tenant, steps, stored = batches.popleft()
+                if collection_name not in created_collections:
+                    self.vector_store.create_collection(collection_name, embedding_size)
+                    created_collections.add(collection_name)
+
+                documents = self.vector_store.to_documents(steps, embeddings, tenant)
+                self.vector_store.add_documents(collection_name, documents)
+                stale_ids = self._stale_chunk_ids(documents, stored)
+                if stale_ids:
+                    self.vector_store.delete_documents(collection_name, stale_ids)
+                report.steps += len(steps)
+
+                report.seconds = time.perf_counter() - start_time
+                logging.info(
+                    f"Indexed {report.steps} steps from {report.trips} trips "
+                    f"({report.steps_per_second:.1f} steps/s)."
+                )
+
+        report.seconds = time.perf_counter() - start_time
+        logging.info(
+            f"Bulk indexing finished: {report.trips} trips, {report.steps} steps in "
+            f"{report.seconds:.1f}s ({report.steps_per_second:.1f} steps/s)."
+        )
+        return report
@@ -0,0 +1,340 @@
+import os
+import json
+import argparse
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from app.core.settings import EmbeddingConfig, VectorStoreConfig
+from app.data.dtos.trip import TripStepDTO
+from app.data.io.trip_stream import iter_trips
+from app.data.storage.vector_store_factory import create_vector_store_client
+from app.embeddings.embedding_factory import create_embeddings
+from app.embeddings.embedding_pool import EmbeddingPool
+from app.rag_engine.indexing_pipeline import IndexingReport
+from app.rag_engine.vector_store import VectorStore
+
+_STOP = object()
+
+
+@dataclass
+class _StepBatch:
+    collection_name: str
+    tenant: dict
+    steps: list[TripStepDTO]
+    embeddings: Optional[list[list[float]]] = None
+
+
+@dataclass
+class _TripDone:
+    source: str
+    steps: int = 0
+
+
+class IngestReport(IndexingReport):
+    skipped_trips: int = 0
+    parse_seconds: float = 0.0
+    embed_seconds: float = 0.0
+    upload_seconds: float = 0.0
+
+
+class IngestCheckpoint:
+    """
+    Append-only record of the trips that are fully uploaded, so an interrupted
+    ingest can resume where it stopped.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.completed: set[str] = set()
+        if path and os.path.exists(path):
+            with open(path, "r") as f:
+                self.completed = {json.loads(line)["source"] for line in f if line.strip()}
+
+    def is_done(self, source: str) -> bool:
+        return source in self.completed
+
+    def mark_done(self, source: str, steps: int) -> None:
+        """
+        Records a trip as uploaded and flushes the record to disk.
+        :param source: The trip's source path.
+        :param steps: Number of steps uploaded for the trip.
+        """
+        self.completed.add(source)
+        if not self.path:
+            return
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"source": source, "steps": steps}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class IngestPipeline:
+    """
+    Bulk ingest of Polarsteps exports as a three-stage pipeline:
+
+    parse (thread) -> embed (caller thread, optionally fanned out to an
+    EmbeddingPool) -> upload (thread). Stages are connected by bounded queues, so
+    embedding overlaps with parsing and with vector store uploads while memory stays
+    bounded by the queue sizes. A trip is checkpointed once all its steps are uploaded.
+    """
+
+    def __init__(
+        self,
+        vector_store: Optional[VectorStore] = None,
+        embedding_config: Optional[EmbeddingConfig] = None,
+        num_workers: Optional[int] = None,
+        batch_size: int = 64,
+        queue_size: int = 8,
+        checkpoint_path: Optional[str] = None,
+    ):
+        self.embedding_config = embedding_config or EmbeddingConfig()
+        if vector_store is None:
+            vector_store = VectorStore(
+                create_vector_store_client(VectorStoreConfig()),
+                create_embeddings(self.embedding_config),
+            )
+        self.vector_store = vector_store
+        self.num_workers = num_workers
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.checkpoint = IngestCheckpoint(checkpoint_path)
+        self._failed = threading.Event()
+        self._errors: list[BaseException] = []
+
+    def run(self, path: str) -> IngestReport:
+        """
+        Ingests every trip found at `path`, skipping trips already checkpointed.
+        :param path: A trip.json file, an export directory or a zip archive.
+        :return: An IngestReport with counts, throughput and per-stage busy time.
+        """
+        report = IngestReport()
+        self._failed.clear()
+        self._errors = []
+        start_time = time.perf_counter()
+        parsed: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        embedded: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        parser = threading.Thread(
+            target=self._guard, args=(self._parse, path, parsed, report), daemon=True
+        )
+        uploader = threading.Thread(
+            target=self._guard, args=(self._upload, embedded, report), daemon=True
+        )
+        parser.start()
+        uploader.start()
+        try:
+            self._embed(parsed, embedded, report)
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._put(embedded, _STOP, force=True)
+            parser.join()
+            uploader.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+        report.seconds = time.perf_counter() - start_time
+        logging.info(
+            f"Ingest finished: {report.trips} trips ({report.skipped_trips} skipped), "
+            f"{report.steps} steps in {report.seconds:.1f}s "
+            f"({report.steps_per_second:.1f} steps/s)."
+        )
+        return report
+
+    def _parse(self, path: str, parsed: queue.Queue, report: IngestReport) -> None:
+        """
+        Stage 1: streams trips from disk and splits their steps into batches.
+        """
+        try:
+            busy_since = time.perf_counter()
+            for trip in iter_trips(path):
+                if self.checkpoint.is_done(trip.source):
+                    report.skipped_trips += 1
+                    continue
+                layout = self.vector_store.layout
+                tenant = layout.tenant_payload(trip.user_id, trip.id)
+                collection_name, _ = layout.trip_target(tenant["user_trip_id"])
+                steps = 0
+                for chunk in trip.chunks(self.batch_size):
+                    steps += len(chunk)
+                    report.parse_seconds += time.perf_counter() - busy_since
+                    if not self._put(parsed, _StepBatch(collection_name, tenant, chunk)):
+                        return
+                    busy_since = time.perf_counter()
+                report.parse_seconds += time.perf_counter() - busy_since
+                if not self._put(parsed, _TripDone(trip.source, steps)):
+                    return
+                busy_since = time.perf_counter()
+        finally:
+            self._put(parsed, _STOP, force=True)
+
+    def _embed(
+        self, parsed: queue.Queue, embedded: queue.Queue, report: IngestReport
+    ) -> None:
+        """
+        Stage 2: embeds each batch, across worker processes unless num_workers is 0.
+        Trip markers are passed through in order, behind their trip's batches.
+        """
+        pending: deque = deque()
+
+        def text_batches() -> Iterator[list[str]]:
+            while True:
+                item = self._get(parsed)
+                if item is _STOP:
+                    return
+                pending.append(item)
+                if isinstance(item, _StepBatch):
+                    yield self.vector_store.step_texts(item.steps)
+
+        def forward_markers() -> bool:
+            while pending and isinstance(pending[0], _TripDone):
+                if not self._put(embedded, pending.popleft()):
+                    return False
+            return True
+
+        def embed_all(batches: Iterator[list[str]]) -> Iterator[list[list[float]]]:
+            embeddings = self.vector_store.embeddings if self.num_workers == 0 else None
+            with EmbeddingPool(
+                self.embedding_config, self.num_workers, embeddings=embeddings
+            ) as pool:
+                yield from pool.imap(batches)
+
+        busy_since = time.perf_counter()
+        for vectors in embed_all(text_batches()):
+            if not forward_markers():
+                return
+            batch = pending.popleft()
+            batch.embeddings = vectors
+            report.embed_seconds += time.perf_counter() - busy_since
+            if not self._put(embedded, batch):
+                return
+            busy_since = time.perf_counter()
+        forward_markers()
+
+    def _upload(self, embedded: queue.Queue, report: IngestReport) -> None:
+        """
+        Stage 3: writes embedded batches to the vector store and checkpoints
+        each trip once its last batch is written.
+        """
+        created_collections: set[str] = set()
+        while True:
+            item = self._get(embedded)
+            if item is _STOP:
+                return
+            busy_since = time.perf_counter()
+            if isinstance(item, _TripDone):
+                self.checkpoint.mark_done(item.source, item.steps)
+                report.trips += 1
+            else:
+                if item.collection_name not in created_collections:
+                    self.vector_store.create_collection(
+                        item.collection_name, len(item.embeddings[0])
+                    )
+                    created_collections.add(item.collection_name)
+                documents = self.vector_store.to_documents(
+                    item.steps, item.embeddings, item.tenant
+                )
+                self.vector_store.add_documents(item.collection_name, documents)
+                report.steps += len(item.steps)
+            report.upload_seconds += time.perf_counter() - busy_since
+
+    def _guard(self, stage, *args) -> None:
+        """
+        Runs a stage thread, recording its error and stopping the other stages.
+        """
+        try:
+            stage(*args)
+        except BaseException as e:
+            self._fail(e)
+
+    def _fail(self, error: BaseException) -> None:
+        logging.error(f"Ingest stage failed: {error}")
+        self._errors.append(error)
+        self._failed.set()
+
+    def _put(self, target: queue.Queue, item: Any, force: bool = False) -> bool:
+        """
+        Puts an item on a bounded queue, giving up if another stage failed.
+        :param force: Keep trying after a failure (used for the stop marker).
+        :return: True if the item was queued.
+        """
+        while True:
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if self._failed.is_set():
+                    if not force:
+                        return False
+                    # Make room for the stop marker: the consumer is stopping anyway.
+                    try:
+                        target.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def _get(self, source: queue.Queue) -> Any:
+        """
+        Takes an item from a queue, returning the stop marker if another stage failed.
+        """
+        while True:
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                if self._failed.is_set():
+                    return _STOP
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ingest a directory of Polarsteps exports into the vector store."
+    )
+    parser.add_argument("path", help="A trip.json file, an export directory or a zip.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Embedding worker processes (0 embeds in-process; defaults to half the cores).",
+    )
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=8,
+        help="Maximum number of batches waiting between two stages.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=".ingest_checkpoint.jsonl",
+        help="File recording finished trips, so that a rerun resumes where it stopped.",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    pipeline = IngestPipeline(
+        num_workers=args.workers,
+        batch_size=args.batch_size,
+        queue_size=args.queue_size,
+        checkpoint_path=args.checkpoint,
+    )
+    report = pipeline.run(args.path)
+    print(
+        f"Ingested {report.trips} trips ({report.skipped_trips} already done), "
+        f"{report.steps} steps in {report.seconds:.1f}s "
+        f"({report.steps_per_second:.1f} steps/s)."
+    )
+    print(
+        f"Stage busy time: parse {report.parse_seconds:.1f}s, "
+        f"embed {report.embed_seconds:.1f}s, upload {report.upload_seconds:.1f}s."
+    )
+
+
+if __name__ == "__main__":
+    main()
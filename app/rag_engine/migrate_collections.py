@@ -0,0 +1,127 @@
+import argparse
+import logging
+from typing import Optional
+
+from qdrant_client.models import PointStruct
+
+from app.core.settings import QdrantConfig, VectorStoreConfig
+from app.data.storage.qdrant_client import QdrantClientWrapper
+from app.rag_engine.collection_layout import (
+    CollectionLayout,
+    SHARED_LAYOUT,
+    TRIP_COLLECTION_SUFFIX,
+)
+
+
+def parse_trip_collection_name(collection_name: str) -> Optional[tuple[str, str]]:
+    """
+    Extracts the user and trip ids from a per-trip collection name.
+    Trip ids are numeric, so the last underscore separates them from the user id.
+    :param collection_name: A "{user_id}_{trip_id}_trip_collection" name.
+    :return: A (user_id, trip_id) tuple, or None if the name is not a trip collection.
+    """
+    if not collection_name.endswith(TRIP_COLLECTION_SUFFIX):
+        return None
+    user_id, _, trip_id = collection_name[: -len(TRIP_COLLECTION_SUFFIX)].rpartition(
+        "_"
+    )
+    if not user_id or not trip_id:
+        return None
+    return user_id, trip_id
+
+
+def migrate_collections(
+    wrapper: QdrantClientWrapper,
+    layout: CollectionLayout,
+    batch_size: int = 256,
+    delete_source: bool = False,
+) -> dict[str, int]:
+    """
+    Copies every per-trip collection into the shared collection, adding the tenant
+    payload fields to each point. Vectors are copied as stored, so nothing is re-embedded.
+    Step ids are Polarsteps ids, which are unique across trips, so they are kept.
+    The shared collection stores BM25 sparse vectors if any source collection does.
+    :param wrapper: The Qdrant client wrapper.
+    :param layout: A shared storage layout naming the target collection.
+    :param batch_size: Number of points read and written per request.
+    :param delete_source: Whether to delete each source collection once it is copied.
+    :return: The number of points copied per source collection.
+    """
+    target = layout.shared_collection_name
+    sources = {
+        collection.name: ids
+        for collection in wrapper.client.get_collections().collections
+        if (ids := parse_trip_collection_name(collection.name)) is not None
+    }
+    if sources and not wrapper.collection_exists(target):
+        infos = [wrapper.get_collection_info(name) for name in sources]
+        layout.create_collection(
+            wrapper,
+            target,
+            infos[0]["vector_size"],
+            sparse_vectors=any(info.get("sparse_vectors") for info in infos),
+        )
+
+    copied: dict[str, int] = {}
+    for collection_name, ids in sources.items():
+        tenant = layout.tenant_payload(*ids)
+        count = 0
+        next_offset = None
+        while True:
+            points, next_offset = wrapper.client.scroll(
+                collection_name=collection_name,
+                with_payload=True,
+                with_vectors=True,
+                limit=batch_size,
+                offset=next_offset,
+            )
+            if points:
+                wrapper.add_documents(
+                    target,
+                    [
+                        PointStruct(
+                            id=point.id,
+                            vector=point.vector,
+                            payload={**(point.payload or {}), **tenant},
+                        )
+                        for point in points
+                    ],
+                )
+                count += len(points)
+            if not points or not next_offset:
+                break
+
+        copied[collection_name] = count
+        logging.info(f"Copied {count} points from '{collection_name}' to '{target}'.")
+        if delete_source:
+            wrapper.delete_collection(collection_name)
+    return copied
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Copy per-trip Qdrant collections into the shared multi-tenant collection."
+    )
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument(
+        "--delete-source",
+        action="store_true",
+        help="Delete each per-trip collection after it has been copied.",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    layout = CollectionLayout(VectorStoreConfig(storage_layout=SHARED_LAYOUT))
+    wrapper = QdrantClientWrapper(QdrantConfig())
+    copied = migrate_collections(
+        wrapper, layout, batch_size=args.batch_size, delete_source=args.delete_source
+    )
+    print(
+        f"Copied {sum(copied.values())} points from {len(copied)} collections into '{layout.shared_collection_name}'."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import numpy as np
+
+
+def mmr_select(
+    query_embedding: list[float],
+    candidate_embeddings: list[list[float]],
+    k: int,
+    lambda_mult: float = 0.5,
+) -> list[int]:
+    """
+    Picks a relevant but diverse subset of candidates with maximal marginal relevance:
+    each pick maximises lambda * sim(query, c) - (1 - lambda) * max sim(c, picked).
+    All similarities come from one matrix product; each pick then updates the
+    candidates' similarity to the picked set in a single vectorized step.
+    :param query_embedding: Embedding of the query.
+    :param candidate_embeddings: Embeddings of the candidates, best match first.
+    :param k: Number of candidates to pick.
+    :param lambda_mult: Weight of relevance against diversity, between 0 and 1;
+        1 keeps the similarity order.
+    :return: Indices of the picked candidates, in pick order.
+    """
+    if k <= 0 or len(candidate_embeddings) == 0:
+        return []
+    vectors = _normalize(np.asarray(candidate_embeddings, dtype=np.float32))
+    query = _normalize(np.asarray(query_embedding, dtype=np.float32))
+    relevance = vectors @ query
+    similarity = vectors @ vectors.T
+
+    selected: list[int] = []
+    redundancy = np.full(len(vectors), -np.inf, dtype=np.float32)
+    available = np.ones(len(vectors), dtype=bool)
+    for _ in range(min(k, len(vectors))):
+        if selected:
+            scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        else:
+            scores = relevance.copy()
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, similarity[best])
+    return selected
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
@@ -1,6 +1,7 @@
 import logging
-from typing import Any
+from typing import Any, AsyncIterator, Optional
 
+from app.data.dtos.geo import GEO_FIELD, GeoFilter
 from app.rag_engine.vector_store import VectorStore
 from app.llms.llm_manager import LLMManager
 from app.memory.conversation_history.local_memory import LocalMemory
@@ -31,33 +32,195 @@ class RetrievalPipeline:
         :param prompt: The rendered prompt string."""
         logging.info(f"Prompt {prompt_name} token usage: {len(prompt)}")
 
+    @staticmethod
+    def _with_geo_filter(
+        filters: Optional[dict], geo_filter: Optional[GeoFilter]
+    ) -> Optional[dict]:
+        """Adds a geo filter on the step locations to the layout's filters.
+        :param filters: The filters selecting the trip, or None.
+        :param geo_filter: A radius or bounding box the steps must lie in, or None.
+        :return: The combined filters."""
+        if geo_filter is None:
+            return filters
+        return {**(filters or {}), GEO_FIELD: geo_filter}
+
     def search_journal_entries(
-        self, user_query: str, user_trip_id: str, limit: int = 5
+        self,
+        user_query: str,
+        user_trip_id: str,
+        limit: int = 5,
+        geo_filter: Optional[GeoFilter] = None,
+        diversify: Optional[bool] = None,
     ) -> list[dict]:
         """
         Retrieves relevant documents from the vector store based on the user query.
         :param user_query: The query from the user.
         :param metadata: Optional metadata to filter the search.
+        :param geo_filter: Optional radius or bounding box the steps must lie in.
+        :param diversify: Whether to drop near-duplicate steps with maximal marginal
+            relevance; defaults to MMR_ENABLED.
         :return: A list of retrieved documents."""
-        collection_name = f"{user_trip_id}_trip_collection"
+        collection_name, filters = self.vector_store.layout.trip_target(user_trip_id)
+        filters = self._with_geo_filter(filters, geo_filter)
         retrieved_docs = self.vector_store.search(
-            query=user_query, collection_name=collection_name, limit=limit
+            query=user_query,
+            collection_name=collection_name,
+            limit=limit,
+            filters=filters,
+            diversify=diversify,
+        )
+        logging.info(
+            f"Retrieved {len(retrieved_docs)} documents for query: {user_query}"
+        )
+        return retrieved_docs
+
+    async def asearch_journal_entries(
+        self,
+        user_query: str,
+        user_trip_id: str,
+        limit: int = 5,
+        geo_filter: Optional[GeoFilter] = None,
+        diversify: Optional[bool] = None,
+    ) -> list[dict]:
+        """
+        Async variant of search_journal_entries for the API handlers.
+        :param user_query: The query from the user.
+        :param user_trip_id: The ID of the user's trip.
+        :param limit: The maximum number of documents to return.
+        :param geo_filter: Optional radius or bounding box the steps must lie in.
+        :param diversify: Whether to drop near-duplicate steps with maximal marginal
+            relevance; defaults to MMR_ENABLED.
+        :return: A list of retrieved documents."""
+        collection_name, filters = self.vector_store.layout.trip_target(user_trip_id)
+        filters = self._with_geo_filter(filters, geo_filter)
+        retrieved_docs = await self.vector_store.asearch(
+            query=user_query,
+            collection_name=collection_name,
+            limit=limit,
+            filters=filters,
+            diversify=diversify,
         )
         logging.info(
             f"Retrieved {len(retrieved_docs)} documents for query: {user_query}"
         )
         return retrieved_docs
 
+    async def asearch_journal_entries_batch(
+        self,
+        user_queries: list[str],
+        user_trip_id: str,
+        limit: int = 5,
+        geo_filter: Optional[GeoFilter] = None,
+    ) -> list[list[dict]]:
+        """
+        Retrieves documents for several queries against the same trip in one request.
+        :param user_queries: The queries from the user.
+        :param user_trip_id: The ID of the user's trip.
+        :param limit: The maximum number of documents to return per query.
+        :param geo_filter: Optional radius or bounding box the steps must lie in.
+        :return: One list of retrieved documents per query."""
+        collection_name, filters = self.vector_store.layout.trip_target(user_trip_id)
+        filters = self._with_geo_filter(filters, geo_filter)
+        retrieved_docs = await self.vector_store.asearch_many(
+            queries=user_queries,
+            collection_name=collection_name,
+            limit=limit,
+            filters=filters,
+        )
+        logging.info(
+            f"Retrieved documents for {len(user_queries)} queries in trip: {user_trip_id}"
+        )
+        return retrieved_docs
+
+    async def asearch_user_entries(
+        self, user_query: str, user_id: str, limit: int = 5
+    ) -> list[dict]:
+        """
+        Retrieves relevant documents across all of a user's trips.
+        Requires the shared storage layout.
+        :param user_query: The query from the user.
+        :param user_id: The ID of the user.
+        :param limit: The maximum number of documents to return.
+        :return: A list of retrieved documents."""
+        collection_name, filters = self.vector_store.layout.user_target(user_id)
+        retrieved_docs = await self.vector_store.asearch(
+            query=user_query,
+            collection_name=collection_name,
+            limit=limit,
+            filters=filters,
+        )
+        logging.info(
+            f"Retrieved {len(retrieved_docs)} documents across trips of user {user_id} for query: {user_query}"
+        )
+        return retrieved_docs
+
     def get_all_journal_entries(self, user_trip_id: str) -> list[dict]:
         """
         Retrieves all journal entries for a given trip.
         :param user_trip_id: The ID of the user's trip.
         :return: A list of all journal entries."""
-        collection_name = f"{user_trip_id}_trip_collection"
-        all_docs = self.vector_store.get_all_documents(collection_name=collection_name)
+        collection_name, filters = self.vector_store.layout.trip_target(user_trip_id)
+        all_docs = self.vector_store.get_all_documents(
+            collection_name=collection_name, filters=filters
+        )
         logging.info(f"Retrieved {len(all_docs)} documents for trip ID: {user_trip_id}")
         return all_docs
 
+    async def aget_all_journal_entries(self, user_trip_id: str) -> list[dict]:
+        """
+        Async variant of get_all_journal_entries.
+        :param user_trip_id: The ID of the user's trip.
+        :return: A list of all journal entries."""
+        collection_name, filters = self.vector_store.layout.trip_target(user_trip_id)
+        all_docs = await self.vector_store.aget_all_documents(
+            collection_name=collection_name, filters=filters
+        )
+        logging.info(f"Retrieved {len(all_docs)} documents for trip ID: {user_trip_id}")
+        return all_docs
+
+    async def aiter_journal_entries(
+        self,
+        user_trip_id: str,
+        page_size: Optional[int] = None,
+        fields: Optional[list[str]] = None,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Yields the journal entries of a trip page by page, as they are fetched.
+        :param user_trip_id: The ID of the user's trip.
+        :param page_size: The maximum number of entries per page.
+        :param fields: The entry fields to return, or None for all of them.
+        :return: An async iterator over pages of journal entries."""
+        collection_name, filters = self.vector_store.layout.trip_target(user_trip_id)
+        async for page in self.vector_store.aiter_documents(
+            collection_name=collection_name,
+            page_size=page_size,
+            fields=fields,
+            filters=filters,
+        ):
+            yield page
+
+    def _rewrite_prompt(
+        self, user_query: str, conversation_id: str, max_history: int = 5
+    ) -> Optional[str]:
+        """
+        Renders the query rewriting prompt from the conversation history.
+        :param user_query: The original user query.
+        :param conversation_id: The ID of the conversation.
+        :return: The rendered prompt, or None if there is no history to rewrite with.
+        """
+        memory_data = self.memory.get_history(conversation_id)
+        if not memory_data:
+            return None
+        messages = [msg.model_dump() for msg in memory_data[-max_history:]]
+        rendered_prompt = QueryRewriting.format(
+            conversation_history=messages[-max_history:],
+            followup_question=user_query,
+        )
+        RetrievalPipeline._log_token_usage(
+            prompt_name=QueryRewriting.prompt_name, prompt=rendered_prompt
+        )
+        return rendered_prompt
+
     def _rewrite_query(
         self, user_query: str, conversation_id: str, max_history: int = 5
     ) -> str:
@@ -67,47 +230,89 @@ class RetrievalPipeline:
         :param conversation_id: The ID of the conversation.
         :return: The rewritten user query.
         """
-        memory_data = self.memory.get_history(conversation_id)
-        if memory_data:
-            messages = [msg.model_dump() for msg in memory_data[-max_history:]]
-            rendered_prompt = QueryRewriting.format(
-                conversation_history=messages[-max_history:],
-                followup_question=user_query,
-            )
-            RetrievalPipeline._log_token_usage(
-                prompt_name=QueryRewriting.prompt_name, prompt=rendered_prompt
-            )
-
-            rewrite_query_response = self.llm_manager.call_llm_with_retry(
-                user_query=user_query,
-                prompt=rendered_prompt,
-                response_model=QueryRewriting.response_model(),
-            )
-            logging.info(
-                f"Rewritten user query: {rewrite_query_response.rewritten_user_query}"
-            )
-            return rewrite_query_response.rewritten_user_query
-        return user_query
-
-    def _generate_answer(self, user_query: str, context: str) -> Any:
-        """
-        Generates an answer based on the user query and context.
+        rendered_prompt = self._rewrite_prompt(user_query, conversation_id, max_history)
+        if rendered_prompt is None:
+            return user_query
+
+        rewrite_query_response = self.llm_manager.call_llm_with_retry(
+            user_query=user_query,
+            prompt=rendered_prompt,
+            response_model=QueryRewriting.response_model(),
+            prompt_name=QueryRewriting.prompt_name,
+        )
+        logging.info(
+            f"Rewritten user query: {rewrite_query_response.rewritten_user_query}"
+        )
+        return rewrite_query_response.rewritten_user_query
+
+    async def _arewrite_query(
+        self, user_query: str, conversation_id: str, max_history: int = 5
+    ) -> str:
+        """
+        Async variant of _rewrite_query.
         :param user_query: The original user query.
-        :return: The generated answer.
+        :param conversation_id: The ID of the conversation.
+        :return: The rewritten user query.
+        """
+        rendered_prompt = self._rewrite_prompt(user_query, conversation_id, max_history)
+        if rendered_prompt is None:
+            return user_query
+
+        rewrite_query_response = await self.llm_manager.acall_llm_with_retry(
+            user_query=user_query,
+            prompt=rendered_prompt,
+            response_model=QueryRewriting.response_model(),
+            prompt_name=QueryRewriting.prompt_name,
+        )
+        logging.info(
+            f"Rewritten user query: {rewrite_query_response.rewritten_user_query}"
+        )
+        return rewrite_query_response.rewritten_user_query
+
+    @staticmethod
+    def _answer_prompt(docs: list[dict]) -> str:
+        """
+        Renders the question answering prompt with the retrieved documents as context.
+        :param docs: The retrieved documents.
+        :return: The rendered prompt.
         """
+        context = "\n\n".join(doc["description"] for doc in docs) if docs else ""
         rendered_prompt = QuestionAnswering.format(context=context)
 
         RetrievalPipeline._log_token_usage(
             prompt_name=QuestionAnswering.prompt_name, prompt=rendered_prompt
         )
+        return rendered_prompt
 
+    def _generate_answer(self, user_query: str, docs: list[dict]) -> Any:
+        """
+        Generates an answer based on the user query and the retrieved documents.
+        :param user_query: The original user query.
+        :param docs: The retrieved documents.
+        :return: The generated answer.
+        """
         response = self.llm_manager.call_llm_with_retry(
             user_query=user_query,
-            prompt=rendered_prompt,
+            prompt=self._answer_prompt(docs),
             response_model=QuestionAnswering.response_model(),
+            prompt_name=QuestionAnswering.prompt_name,
         )
         return response
 
+    async def _agenerate_answer(self, user_query: str, docs: list[dict]) -> Any:
+        """
+        Async variant of _generate_answer.
+        :param user_query: The original user query.
+        :param docs: The retrieved documents.
+        :return: The generated answer.
+        """
+        return await self.llm_manager.acall_llm_with_retry(
+            user_query=user_query,
+            prompt=self._answer_prompt(docs),
+            response_model=QuestionAnswering.response_model(),
+            prompt_name=QuestionAnswering.prompt_name,
+        )
+
     def search_with_generation(
         self, user_query: str, user_trip_id: str, limit: int = 5
     ) -> tuple[list[dict], Any]:
@@ -121,7 +326,25 @@ class RetrievalPipeline:
         user_query = self._rewrite_query(user_query, user_trip_id)
 
         docs = self.search_journal_entries(user_query, user_trip_id, limit)
-        context = "\n\n".join(doc["description"] for doc in docs) if docs else ""
 
-        response = self._generate_answer(user_query=user_query, context=context)
+        response = self._generate_answer(user_query=user_query, docs=docs)
+        return response.answer, docs
+
+    async def asearch_with_generation(
+        self, user_query: str, user_trip_id: str, limit: int = 5
+    ) -> tuple[list[dict], Any]:
+        """
+        Async variant of search_with_generation: the LLM calls and the search await
+        their network calls instead of blocking the event loop.
+
+        :param user_query: The query from the user.
+        :param user_trip_id: The ID of the user's trip.
+        :param limit: The maximum number of documents to use as context.
+        :return: The generated answer and the documents it is based on.
+        """
+        user_query = await self._arewrite_query(user_query, user_trip_id)
+
+        docs = await self.asearch_journal_entries(user_query, user_trip_id, limit)
+
+        response = await self._agenerate_answer(user_query=user_query, docs=docs)
         return response.answer, docs
@@ -1,15 +1,41 @@
+import hashlib
 import logging
-
-from qdrant_client.models import PointStruct
+from typing import TYPE_CHECKING, Any, AsyncIterator, ContextManager, Optional
 
 from app.data.dtos.trip import TripStepDTO
+from app.core.settings import ChunkingConfig, VectorStoreConfig
 from app.data.storage.vector_store_base import VectorStoreBase
+from app.rag_engine.chunking import (
+    COLLAPSE_FIELDS,
+    StepChunk,
+    StepChunker,
+    chunk_point_id,
+    collapse_chunks,
+)
+from app.rag_engine.collection_layout import CollectionLayout
+from app.rag_engine.mmr import mmr_select
 from app.embeddings.embedding_base import EmbeddingBase
+from app.embeddings.bm25_encoder import BM25Encoder
+from app.embeddings.embedding_factory import create_sparse_encoder
 from app.core.exceptions.custom_exceptions import VectorStoreError
 
+if TYPE_CHECKING:
+    from qdrant_client.models import PointStruct
+
+# Version of the stored payload layout, part of every content hash. Bump it when
+# the payload changes so that incremental syncs rewrite every step.
+PAYLOAD_VERSION = 2
+
 
 class VectorStore:
-    """Class to manage the vector store."""
+    """
+    Class to manage the vector store.
+
+    With a sparse encoder (HYBRID_SEARCH), every chunk also stores a BM25 vector of
+    its text and the step's place names, and searches fuse the dense and the
+    lexical rankings, so exact names and codes rank well even when the dense
+    embedding misses them.
+    """
 
     _instance = None
     _initialized = False
@@ -19,32 +45,194 @@ class VectorStore:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self, client: VectorStoreBase, embeddings: EmbeddingBase):
+    def __init__(
+        self,
+        client: VectorStoreBase,
+        embeddings: EmbeddingBase,
+        layout: Optional[CollectionLayout] = None,
+        chunker: Optional[StepChunker] = None,
+        sparse_encoder: Optional[BM25Encoder] = None,
+    ):
         if not self._initialized:
+            config = VectorStoreConfig()
             self.client = client
             self.embeddings = embeddings
+            self.layout = layout or CollectionLayout(config)
+            self.chunker = chunker or StepChunker(ChunkingConfig())
+            self.sparse_encoder = sparse_encoder or create_sparse_encoder(config)
+            self.mmr_enabled = config.mmr_enabled
+            self.mmr_lambda = config.mmr_lambda
+            self.mmr_candidates = config.mmr_candidates
             self._initialized = True
 
-    def prepare_data(self, documents: list[TripStepDTO]) -> list[PointStruct]:
+    @property
+    def index_signature(self) -> str:
+        """
+        Names the encoders a stored step was indexed with; part of its content hash.
+        """
+        model_name = self.embeddings.model_name
+        if self.sparse_encoder is None:
+            return model_name
+        return f"{model_name}+{self.sparse_encoder.name}"
+
+    def prepare_data(
+        self, documents: list[TripStepDTO], payload: Optional[dict] = None
+    ) -> list["PointStruct"]:
         """
         Prepares data for vectorization.
         :param documents: List of documents to prepare.
+        :param payload: Extra payload fields stored with every document, e.g. tenant ids.
         :return: List of prepared documents with embeddings.
         """
-        texts = [
-            doc.description if doc.description else doc.display_name
-            for doc in documents
-        ]
+        embeddings = self.embeddings.embed(self.step_texts(documents))
 
-        embeddings = self.embeddings.embed(texts)
-
-        prepared_documents = [
-            VectorStoreBase.trip_step_to_document(dto=doc, embedding=embedding)
-            for doc, embedding in zip(documents, embeddings)
-        ]
+        prepared_documents = self.to_documents(documents, embeddings, payload)
         logging.info(f"Prepared {len(prepared_documents)} documents with embeddings.")
         return prepared_documents
 
+    def step_texts(self, documents: list[TripStepDTO]) -> list[str]:
+        """
+        Returns the texts embedded for the trip steps: one per chunk of each step's
+        description, or the display name for steps without one.
+        :param documents: List of trip steps.
+        :return: The chunk texts, grouped by step in step order.
+        """
+        return [chunk.text for chunk in self.chunker.chunk_steps(documents)]
+
+    def to_documents(
+        self,
+        documents: list[TripStepDTO],
+        embeddings: list[list[float]],
+        payload: Optional[dict] = None,
+    ) -> list["PointStruct"]:
+        """
+        Converts trip steps and their precomputed embeddings into storage documents,
+        one per chunk. Chunks of a multi-chunk step store their own text as description,
+        along with its position in the step's description.
+        :param documents: List of trip steps.
+        :param embeddings: One embedding per text returned by step_texts.
+        :param payload: Extra payload fields stored with every document, e.g. tenant ids.
+        :return: List of documents ready to be stored.
+        """
+        signature = self.index_signature
+        chunks = self.chunker.chunk_steps(documents)
+        if len(chunks) != len(embeddings):
+            raise VectorStoreError(
+                f"Expected {len(chunks)} embeddings for {len(documents)} steps, got {len(embeddings)}."
+            )
+        prepared_documents = []
+        for chunk, embedding in zip(chunks, embeddings):
+            doc = chunk.step
+            sparse = None
+            if self.sparse_encoder is not None:
+                sparse = self.sparse_encoder.encode_document(self.lexical_text(chunk))
+            document = self.client.trip_step_to_document(
+                dto=doc, embedding=embedding, sparse=sparse
+            )
+            document.payload["content_hash"] = VectorStore.content_hash(doc, signature)
+            document.payload["chunk_count"] = chunk.count
+            if chunk.count > 1:
+                document.id = chunk.point_id
+                document.payload.update(
+                    description=chunk.text,
+                    chunk_index=chunk.index,
+                    chunk_start=chunk.start,
+                    chunk_end=chunk.end,
+                )
+            if payload:
+                document.payload.update(payload)
+            prepared_documents.append(document)
+        return prepared_documents
+
+    @staticmethod
+    def lexical_text(chunk: StepChunk) -> str:
+        """
+        Returns the text indexed for lexical search: the chunk's text preceded by
+        the step's names and country code, which the text itself often omits.
+        :param chunk: A chunk of a trip step.
+        :return: The text to encode as a BM25 vector.
+        """
+        step = chunk.step
+        fields = (step.display_name, step.location_name, step.country_code, chunk.text)
+        return " ".join(field for field in fields if field)
+
+    @staticmethod
+    def content_hash(document: TripStepDTO, index_signature: str) -> str:
+        """
+        Hashes everything a stored step is derived from: the step's fields, the
+        encoders and the payload layout. A step whose hash is unchanged does
+        not need re-indexing.
+        :param document: The trip step.
+        :param index_signature: The vector store's index_signature.
+        :return: Hex digest of the step's content.
+        """
+        content = f"{index_signature}\n{PAYLOAD_VERSION}\n{document.model_dump_json()}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def stored_steps(
+        self, collection_name: str, filters: Optional[dict] = None
+    ) -> dict[int, tuple[Optional[str], int]]:
+        """
+        Reads the content hash and chunk count of every stored step, without
+        fetching full payloads.
+        :param collection_name: Name of the collection.
+        :param filters: Optional payload values selecting the steps, e.g. one trip.
+        :return: A dictionary of step id -> (content hash, number of chunks). The hash
+            is None for steps indexed before hashes were stored. Empty if the
+            collection does not exist.
+        """
+        if not self.client.collection_exists(collection_name):
+            return {}
+        return {
+            document["step_id"]: (
+                document.get("content_hash"),
+                document.get("chunk_count", 1),
+            )
+            for page in self.client.iter_documents(
+                collection_name,
+                fields=["step_id", "content_hash", "chunk_count"],
+                filters=filters,
+            )
+            for document in page
+            if "step_id" in document
+        }
+
+    @staticmethod
+    def chunk_ids(step_id: int, chunk_count: int, start: int = 0) -> list:
+        """
+        Returns the ids of a step's stored chunks.
+        :param step_id: The Polarsteps id of the step.
+        :param chunk_count: Number of chunks stored for the step.
+        :param start: Index of the first chunk to return.
+        :return: The chunk ids, in chunk order.
+        """
+        return [chunk_point_id(step_id, index) for index in range(start, chunk_count)]
+
+    def delete_documents(self, collection_name: str, ids: list):
+        """
+        Deletes documents from the vector store by id.
+        :param collection_name: Name of the collection to delete documents from.
+        :param ids: IDs of the documents to delete.
+        """
+        self.client.delete_documents(collection_name, ids)
+
+    def create_collection(
+        self, collection_name: str, embedding_size: Optional[int] = None
+    ):
+        """
+        Creates a collection laid out for the configured storage layout.
+        :param collection_name: Name of the collection to create.
+        :param embedding_size: Size of the embedding vectors (defaults to the model's).
+        """
+        if embedding_size is None:
+            embedding_size = self.embeddings.get_embedding_dimension()
+        self.layout.create_collection(
+            self.client,
+            collection_name,
+            embedding_size,
+            sparse_vectors=self.sparse_encoder is not None,
+        )
+
     def add_documents(self, collection_name: str, documents: list[str]):
         """
         Adds documents to the vector store.
@@ -52,17 +240,64 @@ class VectorStore:
         :param documents: List of documents to add.
         """
         if not self.client.collection_exists(collection_name):
-            embedding_size = self.embeddings.get_embedding_dimension()
-            self.client.create_collection(collection_name, embedding_size)
+            self.create_collection(collection_name)
 
         self.client.add_documents(collection_name, documents)
 
-    def search(self, collection_name: str, query: str, limit: int = 5):
+    def bulk_writes(self) -> ContextManager[None]:
         """
-        Searches for documents in the vector store.
+        Groups the writes of a bulk ingest, letting the storage client persist once
+        at the end instead of after every batch.
+        :return: A context manager wrapping the writes.
+        """
+        return self.client.bulk_writes()
+
+    def _fetch_size(self, limit: int) -> int:
+        """
+        Returns how many chunks to fetch for `limit` steps, since several chunks
+        of one step may rank among the best results.
+        """
+        return limit * self.chunker.search_overfetch
+
+    def _diversify(
+        self,
+        query_embedding: list[float],
+        candidates: list[tuple[dict, list[float]]],
+        limit: int,
+    ) -> list[dict]:
+        """
+        Re-ranks search candidates with maximal marginal relevance and collapses
+        the chunks of each step.
+        :param query_embedding: Embedding of the query.
+        :param candidates: (document, vector) pairs returned by the search.
+        :param limit: Maximum number of results to return.
+        :return: The diverse results, best first.
+        """
+        picked = mmr_select(
+            query_embedding,
+            [vector for _, vector in candidates],
+            self._fetch_size(limit),
+            self.mmr_lambda,
+        )
+        return collapse_chunks([candidates[i][0] for i in picked])[:limit]
+
+    def search(
+        self,
+        collection_name: str,
+        query: str,
+        limit: int = 5,
+        filters: Optional[dict] = None,
+        diversify: Optional[bool] = None,
+    ):
+        """
+        Searches for documents in the vector store. Chunks of the same step are
+        collapsed into a single result.
         :param collection_name: Name of the collection to search in.
         :param query: Query string to search for.
         :param limit: Maximum number of results to return.
+        :param filters: Optional payload values the results must match.
+        :param diversify: Whether to re-rank the results with maximal marginal
+            relevance; defaults to MMR_ENABLED.
         :return: List of search results.
         """
         try:
@@ -70,18 +305,242 @@ class VectorStore:
         except Exception as e:
             logging.error(f"Error embedding query: {str(e)}")
             raise VectorStoreError(f"{str(e)}")
-        return self.client.search(collection_name, embedding, limit)
+        sparse_query = None
+        if self.sparse_encoder is not None:
+            sparse_query = self.sparse_encoder.encode_query(query)
+        if self.mmr_enabled if diversify is None else diversify:
+            candidates = self.client.search_with_vectors(
+                collection_name,
+                embedding,
+                self._fetch_size(limit) * self.mmr_candidates,
+                filters,
+                sparse_query,
+            )
+            return self._diversify(embedding, candidates, limit)
+        if sparse_query is not None:
+            results = self.client.hybrid_search(
+                collection_name,
+                embedding,
+                sparse_query,
+                self._fetch_size(limit),
+                filters,
+            )
+        else:
+            results = self.client.search(
+                collection_name, embedding, self._fetch_size(limit), filters
+            )
+        return collapse_chunks(results)[:limit]
 
-    def get_all_documents(self, collection_name: str):
+    async def asearch(
+        self,
+        collection_name: str,
+        query: str,
+        limit: int = 5,
+        filters: Optional[dict] = None,
+        diversify: Optional[bool] = None,
+    ):
         """
-        Retrieves all documents from a specified collection in the vector store.
+        Searches for documents in the vector store without blocking the event loop.
+        :param collection_name: Name of the collection to search in.
+        :param query: Query string to search for.
+        :param limit: Maximum number of results to return.
+        :param filters: Optional payload values the results must match.
+        :param diversify: Whether to re-rank the results with maximal marginal
+            relevance; defaults to MMR_ENABLED.
+        :return: List of search results.
+        """
+        try:
+            embedding = await self.embeddings.aembed(query)
+        except Exception as e:
+            logging.error(f"Error embedding query: {str(e)}")
+            raise VectorStoreError(f"{str(e)}")
+        sparse_query = None
+        if self.sparse_encoder is not None:
+            sparse_query = self.sparse_encoder.encode_query(query)
+        if self.mmr_enabled if diversify is None else diversify:
+            candidates = await self.client.asearch_with_vectors(
+                collection_name,
+                embedding,
+                self._fetch_size(limit) * self.mmr_candidates,
+                filters,
+                sparse_query,
+            )
+            return self._diversify(embedding, candidates, limit)
+        if sparse_query is not None:
+            results = await self.client.ahybrid_search(
+                collection_name,
+                embedding,
+                sparse_query,
+                self._fetch_size(limit),
+                filters,
+            )
+        else:
+            results = await self.client.asearch(
+                collection_name, embedding, self._fetch_size(limit), filters
+            )
+        return collapse_chunks(results)[:limit]
+
+    def search_many(
+        self,
+        collection_name: str,
+        queries: list[str],
+        limit: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[list]:
+        """
+        Searches for several queries at once: the queries are embedded in one batch
+        and sent to the vector store in a single request.
+        :param collection_name: Name of the collection to search in.
+        :param queries: Query strings to search for.
+        :param limit: Maximum number of results to return per query.
+        :param filters: Optional payload values the results must match.
+        :return: One list of search results per query, in query order.
+        """
+        if not queries:
+            return []
+        try:
+            embeddings = self.embeddings.embed(queries)
+        except Exception as e:
+            logging.error(f"Error embedding queries: {str(e)}")
+            raise VectorStoreError(f"{str(e)}")
+        if self.sparse_encoder is not None:
+            results = self.client.hybrid_search_batch(
+                collection_name,
+                embeddings,
+                [self.sparse_encoder.encode_query(query) for query in queries],
+                self._fetch_size(limit),
+                filters,
+            )
+        else:
+            results = self.client.search_batch(
+                collection_name, embeddings, self._fetch_size(limit), filters
+            )
+        return [collapse_chunks(result)[:limit] for result in results]
+
+    async def asearch_many(
+        self,
+        collection_name: str,
+        queries: list[str],
+        limit: int = 5,
+        filters: Optional[dict] = None,
+    ) -> list[list]:
+        """
+        Async variant of search_many.
+        :param collection_name: Name of the collection to search in.
+        :param queries: Query strings to search for.
+        :param limit: Maximum number of results to return per query.
+        :param filters: Optional payload values the results must match.
+        :return: One list of search results per query, in query order.
+        """
+        if not queries:
+            return []
+        try:
+            embeddings = await self.embeddings.aembed(queries)
+        except Exception as e:
+            logging.error(f"Error embedding queries: {str(e)}")
+            raise VectorStoreError(f"{str(e)}")
+        if self.sparse_encoder is not None:
+            results = await self.client.ahybrid_search_batch(
+                collection_name,
+                embeddings,
+                [self.sparse_encoder.encode_query(query) for query in queries],
+                self._fetch_size(limit),
+                filters,
+            )
+        else:
+            results = await self.client.asearch_batch(
+                collection_name, embeddings, self._fetch_size(limit), filters
+            )
+        return [collapse_chunks(result)[:limit] for result in results]
+
+    def get_all_documents(self, collection_name: str, filters: Optional[dict] = None):
+        """
+        Retrieves all documents from a specified collection in the vector store,
+        one per step.
+        :param collection_name: Name of the collection to retrieve documents from.
+        :param filters: Optional payload values the documents must match.
+        :return: List of all documents in the collection.
+        """
+        try:
+            return collapse_chunks(
+                self.client.get_all_documents(collection_name, filters=filters)
+            )
+        except Exception as e:
+            logging.error(
+                f"Error retrieving documents from collection '{collection_name}': {str(e)}"
+            )
+            raise e
+
+    async def aget_all_documents(
+        self, collection_name: str, filters: Optional[dict] = None
+    ):
+        """
+        Retrieves all documents from a collection without blocking the event loop.
         :param collection_name: Name of the collection to retrieve documents from.
+        :param filters: Optional payload values the documents must match.
         :return: List of all documents in the collection.
         """
         try:
-            return self.client.get_all_documents(collection_name)
+            documents = await self.client.aget_all_documents(
+                collection_name, filters=filters
+            )
+            return collapse_chunks(documents)
         except Exception as e:
             logging.error(
                 f"Error retrieving documents from collection '{collection_name}': {str(e)}"
             )
             raise e
+
+    async def aiter_documents(
+        self,
+        collection_name: str,
+        page_size: Optional[int] = None,
+        fields: Optional[list[str]] = None,
+        filters: Optional[dict] = None,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Yields the documents of a collection page by page, one per step, as they are
+        fetched. The chunks of a step are not necessarily stored next to each other,
+        so a chunked step is held back and yielded with the page its last chunk
+        arrives in; pages can therefore hold more or fewer steps than page_size.
+        :param collection_name: Name of the collection to retrieve documents from.
+        :param page_size: Maximum number of documents fetched per page.
+        :param fields: Payload fields to return, or None for the whole document.
+        :param filters: Optional payload values the documents must match.
+        :return: Async iterator over pages of documents.
+        """
+        extra_fields = (
+            [field for field in COLLAPSE_FIELDS if field not in fields]
+            if fields
+            else []
+        )
+        pending: dict[Any, list[dict]] = {}
+
+        def collapse(documents: list[dict]) -> list[dict]:
+            documents = collapse_chunks(documents)
+            for document in documents:
+                for field in extra_fields:
+                    document.pop(field, None)
+            return documents
+
+        async for page in self.client.aiter_documents(
+            collection_name,
+            page_size,
+            fields + extra_fields if fields else fields,
+            filters,
+        ):
+            ready = []
+            for document in page:
+                if "chunk_start" not in document or document["chunk_count"] <= 1:
+                    ready.append(document)
+                    continue
+                chunks = pending.setdefault(document["step_id"], [])
+                chunks.append(document)
+                if len(chunks) == document["chunk_count"]:
+                    ready.extend(pending.pop(document["step_id"]))
+            if ready:
+                yield collapse(ready)
+
+        if pending:
+            # Steps with missing chunks, e.g. filtered out or deleted mid-scroll.
+            yield collapse([chunk for chunks in pending.values() for chunk in chunks])
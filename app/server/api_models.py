@@ -1,6 +1,9 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 from app.data.dtos.fact import FactDTO
+from app.data.dtos.geo import GeoFilter
 
 
 class BaseUserRequest(BaseModel):
@@ -11,12 +14,23 @@ class BaseUserRequest(BaseModel):
 class SearchJournalRequest(BaseUserRequest):
     user_query: str
     limit: int = 5
+    geo_filter: Optional[GeoFilter] = None
 
 
 class SearchJournalResponse(BaseModel):
     documents: list[dict]
 
 
+class SearchJournalBatchRequest(BaseUserRequest):
+    user_queries: list[str]
+    limit: int = 5
+    geo_filter: Optional[GeoFilter] = None
+
+
+class SearchJournalBatchResponse(BaseModel):
+    results: list[list[dict]]
+
+
 class SearchJournalWithGenerationRequest(BaseUserRequest):
     user_query: str
     limit: int = 5
@@ -5,23 +5,23 @@ from app.memory.facts.fact_store import FactStore
 from app.services.facts_service import FactService
 from app.services.journal_service import JournalService
 from app.data.storage.relational_store_base import RelationalStoreBase
-from app.data.storage.postgres_client import PostgresClientWrapper
-from app.data.storage.qdrant_client import QdrantClientWrapper
 from app.data.storage.vector_store_base import VectorStoreBase
-from app.core.settings import QdrantConfig
+from app.data.storage.vector_store_factory import create_vector_store_client
+from app.core.settings import VectorStoreConfig
 from app.core.settings import PostgresConfig
+from app.core.settings import EmbeddingConfig
 from app.embeddings.embedding_base import EmbeddingBase
-from app.embeddings.huggingface_embeddings import HuggingFaceEmbeddings
+from app.embeddings.embedding_factory import create_embeddings
 from app.rag_engine.vector_store import VectorStore
 from app.rag_engine.retrieval_pipeline import RetrievalPipeline
 
 
 def get_embeddings() -> EmbeddingBase:
-    return HuggingFaceEmbeddings()
+    return create_embeddings(EmbeddingConfig())
 
 
 def get_vector_store_client() -> VectorStoreBase:
-    return QdrantClientWrapper(QdrantConfig())
+    return create_vector_store_client(VectorStoreConfig())
 
 
 def get_vector_store(
@@ -38,6 +38,9 @@ def get_retrieval_pipeline(
 
 
 def get_storage_client() -> RelationalStoreBase:
+    # Imported here: sqlalchemy is slow to import and is loaded by the readiness warm-up.
+    from app.data.storage.postgres_client import PostgresClientWrapper
+
     return PostgresClientWrapper(PostgresConfig())
 
 
@@ -0,0 +1,65 @@
+import time
+import asyncio
+import logging
+from typing import Optional
+
+from app.server.dependencies import (
+    get_embeddings,
+    get_vector_store_client,
+    get_storage_client,
+)
+from app.llms.llm_clients.llm_router import LLMRouter
+
+
+class Readiness:
+    """
+    Tracks whether the heavy application components have been warmed up.
+    """
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.ready = False
+            self.error: Optional[str] = None
+            self.timings: dict[str, float] = {}
+            self._initialized = True
+
+    def _timed(self, component: str, func) -> None:
+        """
+        Runs a warm-up step and records how long it took.
+        :param component: The name of the component being warmed up.
+        :param func: The callable that warms the component up.
+        """
+        start_time = time.perf_counter()
+        func()
+        self.timings[component] = time.perf_counter() - start_time
+        logging.info(f"Warmed up {component} in {self.timings[component]:.2f}s")
+
+    def _warm_up_components(self) -> None:
+        """
+        Creates the heavy components and runs one dummy encode.
+        """
+        self._timed("embeddings", lambda: get_embeddings().embed("warm up"))
+        self._timed("vector_store_client", get_vector_store_client)
+        self._timed("relational_store_client", get_storage_client)
+        self._timed("llm_client", lambda: LLMRouter.get_client("groq")[0].client)
+
+    async def warm_up(self) -> None:
+        """
+        Warms the application up in a worker thread and flips the ready flag when done.
+        """
+        try:
+            await asyncio.to_thread(self._warm_up_components)
+        except Exception as e:
+            self.error = str(e)
+            logging.error(f"Warm-up failed: {self.error}")
+            return
+        self.ready = True
+        logging.info("Application warm-up complete, ready to serve requests.")
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, status, HTTPException
+from functools import lru_cache
+
+from fastapi import APIRouter, status, HTTPException, Depends
 
 from app.services.chat_service import ChatService
 from app.server.api_models import ReplyReponse, ReplyRequest
 
 router = APIRouter()
-chat_service = ChatService()
+
+
+@lru_cache(maxsize=None)
+def get_chat_service() -> ChatService:
+    return ChatService()
+
 
 @router.post(
     "/reply",
     response_model=ReplyReponse,
     status_code=status.HTTP_200_OK,
 )
-async def reply(request: ReplyRequest) -> ReplyReponse:
+async def reply(
+    request: ReplyRequest, chat_service: ChatService = Depends(get_chat_service)
+) -> ReplyReponse:
 
     try:
         response = await chat_service.reply(
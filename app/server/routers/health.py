@@ -0,0 +1,51 @@
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse
+
+from app.core.settings import LLMCacheConfig
+from app.server.readiness import Readiness
+from app.llms.llm_cache import LLMResponseCache
+from app.llms.llm_manager import LLMManager
+from app.llms.rate_limiter import RateLimiterRegistry
+from app.llms.circuit_breaker import ModelHealthRegistry
+
+router = APIRouter()
+
+
+@router.get("/health", status_code=status.HTTP_200_OK)
+async def health() -> dict:
+    """
+    Liveness endpoint: the process is up and serving HTTP.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/ready", status_code=status.HTTP_200_OK)
+async def ready() -> JSONResponse:
+    """
+    Readiness endpoint: returns 200 once warm-up has completed and 503 before that.
+    """
+    readiness = Readiness()
+    if not readiness.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "starting", "error": readiness.error},
+        )
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={"status": "ready", "timings": readiness.timings},
+    )
+
+
+@router.get("/metrics", status_code=status.HTTP_200_OK)
+async def metrics() -> dict:
+    """
+    LLM traffic metrics: the remaining request and token budget, queue depth and
+    circuit state of every model, how many calls were coalesced and the response
+    cache counters.
+    """
+    return {
+        "llm_rate_limits": RateLimiterRegistry().stats(),
+        "llm_model_health": ModelHealthRegistry().stats(),
+        "llm_in_flight": LLMManager.in_flight.stats(),
+        "llm_response_cache": LLMResponseCache(LLMCacheConfig()).stats(),
+    }
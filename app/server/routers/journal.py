@@ -3,6 +3,8 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from app.server.api_models import (
     SearchJournalRequest,
     SearchJournalResponse,
+    SearchJournalBatchRequest,
+    SearchJournalBatchResponse,
     SearchJournalWithGenerationRequest,
     SearchJournalWithGenerationResponse,
 )
@@ -34,6 +36,7 @@ async def search_journal(
             user_id=request.user_id,
             trip_id=request.trip_id,
             limit=request.limit,
+            geo_filter=request.geo_filter,
         )
     except CollectionNotFoundError as e:
         raise HTTPException(
@@ -48,6 +51,42 @@ async def search_journal(
     return SearchJournalResponse(documents=documents)
 
 
+@router.post(
+    "/search_batch",
+    response_model=SearchJournalBatchResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def search_journal_batch(
+    request: SearchJournalBatchRequest,
+    journal_service: JournalService = Depends(get_journal_service),
+) -> SearchJournalBatchResponse:
+    """
+    Endpoint to run several searches against the same trip journal in one request.
+    :param request: SearchJournalBatchRequest containing user queries, user ID, trip ID, and limit.
+    :return: SearchJournalBatchResponse containing one list of documents per query.
+    """
+
+    try:
+        results = await journal_service.search_journal_batch(
+            user_queries=request.user_queries,
+            user_id=request.user_id,
+            trip_id=request.trip_id,
+            limit=request.limit,
+            geo_filter=request.geo_filter,
+        )
+    except CollectionNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{str(e)}",
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An unexpected error occurred: {str(e)}",
+        )
+    return SearchJournalBatchResponse(results=results)
+
+
 @router.post(
     "/search_with_generation",
     response_model=SearchJournalWithGenerationResponse,
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, status, HTTPException
+from functools import lru_cache
+
+from fastapi import APIRouter, status, HTTPException, Depends
 
 from app.server.api_models import PlanTripRequest, PlanTripResponse
 from app.services.planner_service import PlannerService
 
 router = APIRouter()
-planner_service = PlannerService()
+
+
+@lru_cache(maxsize=None)
+def get_planner_service() -> PlannerService:
+    return PlannerService()
 
 
 @router.post(
@@ -12,7 +18,10 @@ planner_service = PlannerService()
     response_model=PlanTripResponse,
     status_code=status.HTTP_200_OK,
 )
-async def plan_trip(request: PlanTripRequest) -> PlanTripResponse:
+async def plan_trip(
+    request: PlanTripRequest,
+    planner_service: PlannerService = Depends(get_planner_service),
+) -> PlanTripResponse:
     """
     Endpoint to plan a trip based on the user's query and trip ID.
     :param request: PlanTripRequest containing user query, user trip ID, and max steps.
@@ -29,7 +29,7 @@ class ChatService:
         updates = {"user_query": user_query}
         self.conversation_history.update_session_state(conversation_id, updates)
 
-        response = self.chat_agent.run(user_query, conversation_id)
+        response = await self.chat_agent.run(user_query, conversation_id)
 
         collected_facts = self.conversation_history.get_session_state(
             conversation_id
@@ -1,4 +1,7 @@
 import logging
+from typing import Optional
+
+from app.data.dtos.geo import GeoFilter
 
 from app.rag_engine.retrieval_pipeline import RetrievalPipeline
 
@@ -8,7 +11,12 @@ class JournalService:
         self.retrieval_pipeline = retrieval_pipeline
 
     async def search_journal(
-        self, user_query: str, user_id: str, trip_id: str, limit: int = 5
+        self,
+        user_query: str,
+        user_id: str,
+        trip_id: str,
+        limit: int = 5,
+        geo_filter: Optional[GeoFilter] = None,
     ):
         """
         Search the travel journal based on user query, user ID, and trip ID.
@@ -16,11 +24,15 @@ class JournalService:
         :param user_query: The query string to search in the journal.
         :param user_trip_id: The unique identifier for the user's trip.
         :param limit: The maximum number of results to return.
+        :param geo_filter: Optional radius or bounding box the steps must lie in.
         :return: A list of documents matching the query.
         """
         user_trip_id = f"{user_id}_{trip_id}"
-        documents = self.retrieval_pipeline.search_journal_entries(
-            user_query=user_query, user_trip_id=user_trip_id, limit=limit
+        documents = await self.retrieval_pipeline.asearch_journal_entries(
+            user_query=user_query,
+            user_trip_id=user_trip_id,
+            limit=limit,
+            geo_filter=geo_filter,
         )
         if not documents:
             logging.info(
@@ -28,6 +40,32 @@ class JournalService:
             )
         return documents
 
+    async def search_journal_batch(
+        self,
+        user_queries: list[str],
+        user_id: str,
+        trip_id: str,
+        limit: int = 5,
+        geo_filter: Optional[GeoFilter] = None,
+    ) -> list[list[dict]]:
+        """
+        Search the travel journal for several queries in one batch.
+
+        :param user_queries: The query strings to search in the journal.
+        :param user_id: The unique identifier for the user.
+        :param trip_id: The unique identifier for the user's trip.
+        :param limit: The maximum number of results to return per query.
+        :param geo_filter: Optional radius or bounding box the steps must lie in.
+        :return: One list of matching documents per query, in query order.
+        """
+        user_trip_id = f"{user_id}_{trip_id}"
+        return await self.retrieval_pipeline.asearch_journal_entries_batch(
+            user_queries=user_queries,
+            user_trip_id=user_trip_id,
+            limit=limit,
+            geo_filter=geo_filter,
+        )
+
     async def search_journal_with_generation(
         self, user_query: str, user_id: str, trip_id: str, limit: int = 5
     ) -> tuple[list[dict], str]:
@@ -41,7 +79,7 @@ class JournalService:
         :return: A list of documents matching the query.
         """
         user_trip_id = f"{user_id}_{trip_id}"
-        answer, documents = self.retrieval_pipeline.search_with_generation(
+        answer, documents = await self.retrieval_pipeline.asearch_with_generation(
             user_query=user_query, user_trip_id=user_trip_id, limit=limit
         )
         if not documents:
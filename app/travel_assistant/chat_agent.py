@@ -6,7 +6,7 @@ class ChatAgent:
     def __init__(self):
         self.llm_manager = LLMManager()
 
-    def run(
+    async def run(
         self,
         user_query: str,
         conversation_id: str,
@@ -23,11 +23,12 @@ class ChatAgent:
         """
         rendered_prompt = ChatAgentPrompt.format()
 
-        response = self.llm_manager.call_llm_with_retry(
+        response = await self.llm_manager.acall_llm_with_retry(
             user_query=user_query,
             prompt=rendered_prompt,
             response_model=ChatAgentPrompt.response_model(),
             conversation_id=conversation_id,
             max_tokens=max_tokens,
+            prompt_name=ChatAgentPrompt.prompt_name,
         )
         return response
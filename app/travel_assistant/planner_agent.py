@@ -42,12 +42,13 @@ class PlannerAgent:
                 max_steps=max_steps,
             )
 
-            response = self.llm_manager.call_llm_with_retry(
+            response = await self.llm_manager.acall_llm_with_retry(
                 user_query=user_query,
                 prompt=rendered_prompt,
                 response_model=TravelAgentPrompt.response_model(),
                 tools=self.tools_manager.tool_descriptions,
                 max_tokens=1000,
+                prompt_name=TravelAgentPrompt.prompt_name,
             )
 
             if response.final:
@@ -26,7 +26,9 @@ def index_data():
 
     indexing_pipeline = IndexingPipeline()
     try:
-        indexing_pipeline.add_trip_to_vector_store(trip_data, user_trip_id)
+        indexing_pipeline.add_trip_to_vector_store(
+            trip_data, user_trip_id, incremental=True
+        )
         logging.info("Trip data indexed successfully.")
         print("🗂️ Trip data indexed successfully.")
     except Exception as e:
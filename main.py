@@ -1,9 +1,12 @@
+import asyncio
 import logging
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from app.core.settings import APISettings
-from app.server.routers import journal, planner, user_facts, chat
+from app.server.readiness import Readiness
+from app.server.routers import journal, planner, user_facts, chat, health
 
 
 def setup_logging():
@@ -20,14 +23,25 @@ def setup_logging():
     logging.getLogger().setLevel(logging.INFO)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the heavy components up in the background so the server binds immediately."""
+    warm_up_task = asyncio.create_task(Readiness().warm_up())
+    yield
+    warm_up_task.cancel()
+
+
 def create_app() -> FastAPI:
     app_settings = APISettings()
     app = FastAPI(
         title=app_settings.project_name,
         description=app_settings.project_description,
         version=app_settings.project_version,
+        lifespan=lifespan,
     )
 
+    app.include_router(health.router, tags=["Health"])
+
     app.include_router(
         chat.router,
         prefix="/chat",
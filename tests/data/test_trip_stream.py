@@ -0,0 +1,84 @@
+import json
+import zipfile
+
+import pytest
+
+from app.data.io.trip_stream import iter_trips
+from app.data.io.data_loader import read_trip_from_polarsteps
+
+
+def make_step(step_id: int) -> dict:
+    return {
+        "id": step_id,
+        "display_name": f"Step {step_id}",
+        "description": "beautiful",
+        "location": {
+            "name": "Osaka",
+            "lat": 34.7,
+            "lon": 135.5,
+            "detail": "Japan",
+            "country_code": "JP",
+        },
+        "weather_temperature": 16.5,
+    }
+
+
+def write_trip(path, trip_id: int, num_steps: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Steps come first, as they can in real exports: the header is read without them.
+    data = {
+        "all_steps": [make_step(trip_id * 100 + i) for i in range(num_steps)],
+        "id": trip_id,
+        "user_id": 42,
+        "name": f"Trip {trip_id}",
+        "summary": None,
+    }
+    path.write_text(json.dumps(data))
+
+
+class TestTripStream:
+    def test_single_file(self, tmp_path):
+        write_trip(tmp_path / "trip.json", trip_id=1, num_steps=3)
+
+        [trip] = list(iter_trips(str(tmp_path / "trip.json")))
+
+        assert (trip.id, trip.user_id, trip.name, trip.summary) == (1, 42, "Trip 1", None)
+        steps = list(trip.steps())
+        assert [step.id for step in steps] == [100, 101, 102]
+        assert steps[0].lat == pytest.approx(34.7)
+        assert isinstance(steps[0].weather_temperature, float)
+
+    def test_chunks_are_bounded(self, tmp_path):
+        write_trip(tmp_path / "trip.json", trip_id=1, num_steps=5)
+
+        [trip] = list(iter_trips(str(tmp_path / "trip.json")))
+
+        assert [len(chunk) for chunk in trip.chunks(2)] == [2, 2, 1]
+
+    def test_directory_export(self, tmp_path):
+        write_trip(tmp_path / "trip" / "japan_1" / "trip.json", trip_id=1, num_steps=1)
+        write_trip(tmp_path / "trip" / "peru_2" / "trip.json", trip_id=2, num_steps=2)
+
+        trips = list(iter_trips(str(tmp_path)))
+
+        assert [trip.id for trip in trips] == [1, 2]
+        assert [len(list(trip.steps())) for trip in trips] == [1, 2]
+
+    def test_zip_export(self, tmp_path):
+        write_trip(tmp_path / "japan_1" / "trip.json", trip_id=1, num_steps=2)
+        archive_path = tmp_path / "export.zip"
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.write(tmp_path / "japan_1" / "trip.json", "trip/japan_1/trip.json")
+
+        [trip] = list(iter_trips(str(archive_path)))
+
+        assert trip.id == 1
+        assert [step.id for step in trip.steps()] == [100, 101]
+
+    def test_read_trip_from_polarsteps_loads_whole_trip(self, tmp_path):
+        write_trip(tmp_path / "trip.json", trip_id=1, num_steps=2)
+
+        trip = read_trip_from_polarsteps(str(tmp_path))
+
+        assert trip.id == 1
+        assert len(trip.all_steps) == 2
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+
+from app.core.settings import EmbeddingConfig
+from app.embeddings import embedding_factory
+from app.embeddings.batching_embeddings import BatchingEmbeddings
+from app.embeddings.embedding_base import EmbeddingBase
+
+
+class TestBatchingEmbeddings:
+    @pytest.fixture(autouse=True)
+    def setup_batching_embeddings(self):
+        self.inner = MagicMock(spec=EmbeddingBase)
+        self.inner.embed.side_effect = lambda texts: [[float(len(t))] for t in texts]
+        config = EmbeddingConfig(batch_max_size=8, batch_max_wait_ms=50)
+        self.embeddings = BatchingEmbeddings(self.inner, config)
+
+    def test_concurrent_single_texts_share_one_batch(self):
+        texts = ["a", "bb", "ccc", "dddd"]
+        results: dict[str, list[float]] = {}
+        barrier = threading.Barrier(len(texts))
+
+        def worker(text):
+            barrier.wait()
+            results[text] = self.embeddings.embed(text)
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == {t: [float(len(t))] for t in texts}
+        assert self.inner.embed.call_count == 1
+        assert sorted(self.inner.embed.call_args.args[0]) == sorted(texts)
+
+    def test_async_callers_share_one_batch(self):
+        async def run():
+            return await asyncio.gather(
+                *(self.embeddings.aembed(t) for t in ["x", "yy", "zzz"])
+            )
+
+        results = asyncio.run(run())
+
+        assert results == [[1.0], [2.0], [3.0]]
+        assert self.inner.embed.call_count == 1
+
+    def test_batch_respects_max_size(self):
+        futures = [self.embeddings.submit(str(i)) for i in range(10)]
+        for future in futures:
+            future.result()
+
+        assert self.inner.embed.call_count == 2
+        assert self.embeddings.stats()["batched_texts"] == 10
+
+    def test_list_input_is_passed_through(self):
+        result = self.embeddings.embed(["a", "bb"])
+
+        assert result == [[1.0], [2.0]]
+        self.inner.embed.assert_called_once_with(["a", "bb"])
+
+    def test_error_propagates_to_every_caller(self):
+        self.inner.embed.side_effect = RuntimeError("model failure")
+        futures = [self.embeddings.submit(t) for t in ["a", "b"]]
+
+        for future in futures:
+            with pytest.raises(RuntimeError, match="model failure"):
+                future.result()
+
+    def test_cancelled_aembed_does_not_stop_the_worker(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_embed(texts):
+            started.set()
+            release.wait(timeout=5)
+            return [[float(len(t))] for t in texts]
+
+        self.inner.embed.side_effect = slow_embed
+
+        async def run():
+            blocker = asyncio.create_task(self.embeddings.aembed("a"))
+            await asyncio.to_thread(started.wait, 5)
+            cancelled = asyncio.create_task(self.embeddings.aembed("bb"))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            release.set()
+            with pytest.raises(asyncio.CancelledError):
+                await cancelled
+            after = await asyncio.wait_for(self.embeddings.aembed("ccc"), timeout=5)
+            return await blocker, after
+
+        assert asyncio.run(run()) == ([1.0], [3.0])
+        assert self.embeddings._worker.is_alive()
+
+
+class TestCreateEmbeddingsBatching:
+    @pytest.fixture(autouse=True)
+    def setup_embeddings(self, monkeypatch):
+        monkeypatch.setattr(embedding_factory, "_embeddings", {})
+        self.inner = MagicMock(spec=EmbeddingBase)
+        self.inner.model_name = "test-model"
+        self.inner.embed.side_effect = lambda texts: [[float(len(t))] for t in texts]
+        model = MagicMock(return_value=self.inner)
+        monkeypatch.setattr(embedding_factory, "HuggingFaceEmbeddings", model)
+        self.embeddings = embedding_factory.create_embeddings(
+            EmbeddingConfig(cache_disk_path=None, batch_max_wait_ms=50)
+        )
+
+    def test_cache_misses_of_concurrent_callers_share_one_batch(self):
+        texts = ["a", "bb", "ccc"]
+        barrier = threading.Barrier(len(texts))
+        results = {}
+
+        def worker(text):
+            barrier.wait()
+            results[text] = self.embeddings.embed(text)
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == {t: [float(len(t))] for t in texts}
+        self.inner.embed.assert_called_once()
+        assert sorted(self.inner.embed.call_args.args[0]) == sorted(texts)
+        assert self.embeddings.embeddings.stats()["batches"] == 1
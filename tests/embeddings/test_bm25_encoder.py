@@ -0,0 +1,60 @@
+from app.data.storage.rank_fusion import reciprocal_rank_fusion
+from app.embeddings.bm25_encoder import BM25Encoder
+
+
+class TestBM25Encoder:
+    def test_tokenize_folds_case_and_accents(self):
+        assert BM25Encoder.tokenize("São Paulo, PASTÉIS de nata!") == [
+            "sao",
+            "paulo",
+            "pasteis",
+            "de",
+            "nata",
+        ]
+
+    def test_query_matches_accented_document_terms(self):
+        encoder = BM25Encoder()
+
+        document = encoder.encode_document("Pastéis de nata in Belém")
+        query = encoder.encode_query("pasteis belem")
+
+        assert set(query.indices) <= set(document.indices)
+        assert query.values == [1.0, 1.0]
+
+    def test_document_term_frequency_saturates(self):
+        encoder = BM25Encoder(k1=1.2, b=0.0)
+
+        once = encoder.encode_document("ramen")
+        many = encoder.encode_document("ramen " * 20)
+
+        assert once.values[0] < many.values[0] < encoder.k1 + 1
+
+    def test_longer_documents_weigh_terms_less(self):
+        encoder = BM25Encoder(avg_doc_length=4)
+
+        short = encoder.encode_document("kyoto temples")
+        long = encoder.encode_document("kyoto " + "word " * 20)
+
+        kyoto = BM25Encoder.token_id("kyoto")
+        assert (
+            short.values[short.indices.index(kyoto)]
+            > long.values[long.indices.index(kyoto)]
+        )
+
+
+class TestReciprocalRankFusion:
+    def test_documents_ranked_by_both_lists_win(self):
+        dense = [{"step_id": 1}, {"step_id": 2}, {"step_id": 3}]
+        sparse = [{"step_id": 3}, {"step_id": 4}, {"step_id": 2}]
+
+        fused = reciprocal_rank_fusion([dense, sparse], k=3)
+
+        assert [doc["step_id"] for doc in fused] == [3, 2, 1]
+
+    def test_chunks_of_a_step_are_kept_apart(self):
+        first = {"step_id": 1, "chunk_index": 0}
+        second = {"step_id": 1, "chunk_index": 1}
+
+        fused = reciprocal_rank_fusion([[first], [second]], k=5)
+
+        assert fused == [first, second]
@@ -0,0 +1,78 @@
+import pytest
+from unittest.mock import MagicMock
+
+from app.core.settings import EmbeddingConfig
+from app.embeddings.cached_embeddings import CachedEmbeddings
+from app.embeddings.embedding_base import EmbeddingBase
+from app.embeddings.embedding_cache import EmbeddingCache
+
+
+class TestCachedEmbeddings:
+    @pytest.fixture(autouse=True)
+    def setup_cached_embeddings(self):
+        self.inner = MagicMock(spec=EmbeddingBase)
+        self.inner.model_name = "test-model"
+        self.inner.embed.side_effect = lambda text: (
+            [float(len(text)), 1.0]
+            if isinstance(text, str)
+            else [[float(len(t)), 1.0] for t in text]
+        )
+        config = EmbeddingConfig(cache_max_bytes=1024, cache_disk_path=None)
+        self.embeddings = CachedEmbeddings(self.inner, config)
+
+    def test_single_text_returns_single_vector(self):
+        result = self.embeddings.embed("hello")
+
+        assert result == [5.0, 1.0]
+        self.inner.embed.assert_called_once_with("hello")
+
+    def test_repeated_text_skips_model(self):
+        self.embeddings.embed("hello")
+        result = self.embeddings.embed("hello")
+
+        assert result == [5.0, 1.0]
+        assert self.inner.embed.call_count == 1
+        assert self.embeddings.cache.stats()["hits"] == 1
+
+    def test_batch_only_embeds_missing_and_deduplicates(self):
+        self.embeddings.embed("cached")
+
+        result = self.embeddings.embed(["cached", "new", "new", "other"])
+
+        assert result == [[6.0, 1.0], [3.0, 1.0], [3.0, 1.0], [5.0, 1.0]]
+        self.inner.embed.assert_called_with(["new", "other"])
+
+    def test_normalized_text_shares_entry(self):
+        self.embeddings.embed("hello  world")
+        self.embeddings.embed(" hello world\n")
+
+        assert self.inner.embed.call_count == 1
+
+    def test_key_depends_on_model(self):
+        assert EmbeddingCache.make_key("model-a", "text") != EmbeddingCache.make_key(
+            "model-b", "text"
+        )
+
+
+class TestEmbeddingCache:
+    def test_evicts_least_recently_used_over_max_bytes(self):
+        # Each 4-dim float32 vector is 16 bytes, so two fit.
+        cache = EmbeddingCache(max_bytes=32)
+        cache.put("a", [0.0] * 4)
+        cache.put("b", [1.0] * 4)
+        cache.get("a")
+        cache.put("c", [2.0] * 4)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == [0.0] * 4
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] == 32
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        path = str(tmp_path / "embeddings.sqlite")
+        EmbeddingCache(max_bytes=1024, disk_path=path).put("key", [0.5, 0.25])
+
+        cache = EmbeddingCache(max_bytes=1024, disk_path=path)
+
+        assert cache.get("key") == [0.5, 0.25]
+        assert cache.stats()["disk_hits"] == 1
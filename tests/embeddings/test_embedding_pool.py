@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from app.core.settings import EmbeddingConfig
+from app.embeddings.embedding_base import EmbeddingBase
+from app.embeddings.embedding_pool import EmbeddingPool
+
+
+class StubEmbeddings(EmbeddingBase):
+    """Picklable model for the worker processes; longer texts take longer."""
+
+    def embed(self, texts):
+        if "boom" in texts:
+            raise ValueError("boom")
+        time.sleep(0.02 * max(len(text) for text in texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def get_embedding_dimension(self) -> int:
+        return 2
+
+    @property
+    def model_name(self) -> str:
+        return "stub"
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with EmbeddingPool(
+        EmbeddingConfig(), num_workers=2, max_in_flight=2, embeddings=StubEmbeddings()
+    ) as pool:
+        yield pool
+
+
+class TestEmbeddingPool:
+    def test_results_keep_the_input_order(self, pool):
+        # The first batch is the slowest, so later batches finish before it.
+        batches = [["aaaaa"], ["b"], ["cc"], ["d", "eee"]]
+
+        results = list(pool.imap(batches))
+
+        assert results == [
+            [[5.0, 1.0]],
+            [[1.0, 1.0]],
+            [[2.0, 1.0]],
+            [[1.0, 1.0], [3.0, 1.0]],
+        ]
+        assert pool.get_embedding_dimension() == 2
+
+    def test_input_is_consumed_up_to_max_in_flight(self, pool):
+        pulled = []
+
+        def batches():
+            for i in range(5):
+                pulled.append(i)
+                yield ["x"]
+
+        results = pool.imap(batches())
+        next(results)
+
+        assert len(pulled) == pool.max_in_flight
+        assert len(list(results)) == 4
+
+    def test_worker_error_reaches_the_caller(self, pool):
+        with pytest.raises(ValueError, match="boom"):
+            list(pool.imap([["ok"], ["boom"], ["ok"]]))
+
+    def test_no_workers_embeds_in_process(self):
+        with EmbeddingPool(
+            EmbeddingConfig(), num_workers=0, embeddings=StubEmbeddings()
+        ) as pool:
+            assert list(pool.imap([["ab"], ["c"]])) == [[[2.0, 1.0]], [[1.0, 1.0]]]
+            assert pool.get_embedding_dimension() == 2
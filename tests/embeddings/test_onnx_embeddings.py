@@ -0,0 +1,172 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from app.core.settings import EmbeddingConfig
+from app.embeddings import embedding_factory, onnx_embeddings
+from app.embeddings.batching_embeddings import BatchingEmbeddings
+from app.embeddings.cached_embeddings import CachedEmbeddings
+from app.embeddings.embedding_base import EmbeddingBase
+from app.embeddings.onnx_embeddings import OnnxEmbeddings
+from app.embeddings.parity_check import check_parity
+
+
+class StubTokenizer:
+    """Tokenizes on whitespace and pads to the longest text, like enable_padding."""
+
+    def enable_truncation(self, max_length):
+        pass
+
+    def enable_padding(self):
+        pass
+
+    def encode_batch(self, texts):
+        lengths = [len(text.split()) or 1 for text in texts]
+        width = max(lengths)
+        return [
+            SimpleNamespace(
+                ids=list(range(1, length + 1)) + [0] * (width - length),
+                attention_mask=[1] * length + [0] * (width - length),
+            )
+            for length in lengths
+        ]
+
+
+def stub_run(_, inputs):
+    # Token i embeds as [i, 1]; padding tokens embed far away to expose masking bugs.
+    ids = inputs["input_ids"].astype(np.float32)
+    tokens = np.stack([ids, np.ones_like(ids)], axis=-1)
+    tokens[inputs["attention_mask"] == 0] = 100.0
+    return [tokens]
+
+
+class TestOnnxEmbeddings:
+    @pytest.fixture(autouse=True)
+    def setup_onnx_embeddings(self):
+        self.embeddings = OnnxEmbeddings.__new__(OnnxEmbeddings)
+        self.embeddings._tokenizer = StubTokenizer()
+        self.embeddings._session = MagicMock()
+        self.embeddings._session.run.side_effect = stub_run
+        self.embeddings.batch_size = 2
+
+    def test_mean_pools_over_the_attention_mask_and_normalizes(self):
+        vectors = self.embeddings.embed(["one", "one two three"])
+
+        # Mean of [1, 1] is [1, 1]; mean of [1..3, 1] is [2, 1]. Padding is ignored.
+        expected = [[1.0, 1.0], [2.0, 1.0]]
+        expected = [np.array(v) / np.linalg.norm(v) for v in expected]
+        assert np.allclose(vectors, expected)
+        assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+
+    def test_string_returns_one_vector_and_list_returns_a_matrix(self):
+        single = self.embeddings.embed("one two")
+        batch = self.embeddings.embed(["one two", "one", "one two three"])
+
+        assert np.allclose(single, batch[0])
+        assert len(batch) == 3
+        assert self.embeddings.session.run.call_count == 3
+
+    def test_empty_input_skips_the_model(self):
+        assert self.embeddings.embed([]) == []
+        self.embeddings.session.run.assert_not_called()
+
+    def test_model_is_exported_and_loaded_on_first_use(self, tmp_path, monkeypatch):
+        export = MagicMock()
+        from_file = MagicMock(return_value=StubTokenizer())
+        session = MagicMock()
+        session.return_value.run.side_effect = stub_run
+        monkeypatch.setattr(onnx_embeddings, "export_onnx_model", export)
+        monkeypatch.setattr(onnx_embeddings.Tokenizer, "from_file", from_file)
+        monkeypatch.setattr(onnx_embeddings.ort, "InferenceSession", session)
+
+        embeddings = OnnxEmbeddings(model_name="org/model", model_dir=str(tmp_path))
+
+        export.assert_not_called()
+        session.assert_not_called()
+        assert embeddings.model_name == "org/model:onnx-int8"
+        assert embeddings.get_embedding_dimension() == 2
+
+        model_dir = os.path.join(str(tmp_path), "org--model")
+        export.assert_called_once_with("org/model", model_dir, quantize=True)
+        from_file.assert_called_once_with(os.path.join(model_dir, "tokenizer.json"))
+        model_path = session.call_args.args[0]
+        assert model_path == os.path.join(model_dir, "model_quantized.onnx")
+
+
+class TestCheckParity:
+    def test_reports_cosine_agreement_and_timings(self):
+        reference = MagicMock(spec=EmbeddingBase)
+        reference.embed.return_value = [[1.0, 0.0], [0.0, 1.0]]
+        candidate = MagicMock(spec=EmbeddingBase)
+        candidate.embed.return_value = [[2.0, 0.0], [1.0, 1.0]]
+
+        report = check_parity(reference, candidate, ["a", "b"])
+
+        assert report["texts"] == 2
+        assert report["min_cosine"] == pytest.approx(np.sqrt(0.5))
+        assert report["mean_cosine"] == pytest.approx((1 + np.sqrt(0.5)) / 2)
+        assert report["reference_seconds"] >= 0
+        assert report["candidate_seconds"] >= 0
+        assert "speedup" in report
+
+
+class TestEmbeddingFactory:
+    @pytest.fixture(autouse=True)
+    def reset_embeddings(self, monkeypatch):
+        monkeypatch.setattr(embedding_factory, "_embeddings", {})
+
+    def test_selects_the_configured_backend(self, monkeypatch):
+        huggingface = MagicMock()
+        onnx = MagicMock()
+        monkeypatch.setattr(embedding_factory, "HuggingFaceEmbeddings", huggingface)
+        monkeypatch.setattr(onnx_embeddings, "OnnxEmbeddings", onnx)
+
+        embedding_factory.create_base_embeddings(EmbeddingConfig(backend="huggingface"))
+        huggingface.assert_called_once_with(EmbeddingConfig().model_name)
+        onnx.assert_not_called()
+
+        config = EmbeddingConfig(backend="onnx", onnx_model_dir="/models")
+        embedding_factory.create_base_embeddings(config)
+        onnx.assert_called_once_with(
+            model_name=config.model_name,
+            model_dir="/models",
+            quantize=True,
+            max_seq_length=384,
+        )
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            embedding_factory.create_base_embeddings(EmbeddingConfig(backend="tf"))
+
+    def test_wraps_the_model_in_a_batcher_and_a_cache(self, monkeypatch):
+        model = MagicMock(spec=EmbeddingBase)
+        monkeypatch.setattr(
+            embedding_factory, "HuggingFaceEmbeddings", MagicMock(return_value=model)
+        )
+
+        embeddings = embedding_factory.create_embeddings(
+            EmbeddingConfig(backend="huggingface", cache_disk_path=None)
+        )
+
+        assert isinstance(embeddings, CachedEmbeddings)
+        assert isinstance(embeddings.embeddings, BatchingEmbeddings)
+        assert embeddings.embeddings.embeddings is model
+
+    def test_equal_configs_share_one_instance(self, monkeypatch):
+        monkeypatch.setattr(
+            embedding_factory, "HuggingFaceEmbeddings", MagicMock(spec=EmbeddingBase)
+        )
+        config = EmbeddingConfig(backend="huggingface", cache_disk_path=None)
+
+        first = embedding_factory.create_embeddings(config)
+        second = embedding_factory.create_embeddings(config.model_copy())
+        other = embedding_factory.create_embeddings(
+            config.model_copy(update={"batch_max_size": 4})
+        )
+
+        assert second is first
+        assert other is not first
+        assert other.embeddings.max_batch_size == 4
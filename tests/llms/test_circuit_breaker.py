@@ -0,0 +1,171 @@
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.core.settings import CircuitBreakerConfig, RateLimitConfig
+from app.core.exceptions.llm_exceptions import LLMRateLimitError, LLMTimeoutError
+from app.llms.llm_cache import LLMResponseCache
+from app.llms.llm_manager import LLMManager
+from app.llms.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    ModelHealthRegistry,
+)
+from app.llms.rate_limiter import RateLimiterRegistry
+
+
+class TestCircuitBreaker:
+    @pytest.fixture(autouse=True)
+    def setup_breaker(self):
+        self.config = CircuitBreakerConfig(consecutive_failures=3, open_seconds=30)
+        self.breaker = CircuitBreaker("model-a", self.config)
+
+    def test_opens_after_consecutive_failures(self):
+        for _ in range(3):
+            self.breaker.record(False, 1.0)
+
+        assert self.breaker.state == OPEN
+        assert not self.breaker.allow()
+        assert self.breaker.stats()["health_score"] == 0.0
+
+    def test_opens_on_rolling_error_rate(self):
+        for succeeded in (True, False, True, False, False):
+            self.breaker.record(succeeded, 1.0)
+
+        assert self.breaker.state == OPEN
+
+    def test_half_open_admits_one_probe(self):
+        for _ in range(3):
+            self.breaker.record(False, 1.0)
+        self.breaker._opened_at -= self.config.open_seconds
+
+        assert self.breaker.state == HALF_OPEN
+        assert self.breaker.allow()
+        assert not self.breaker.allow()
+
+        self.breaker.record(True, 1.0)
+
+        assert self.breaker.state == CLOSED
+
+    def test_failed_probe_reopens(self):
+        for _ in range(3):
+            self.breaker.record(False, 1.0)
+        self.breaker._opened_at -= self.config.open_seconds
+        self.breaker.allow()
+
+        self.breaker.record(False, 1.0)
+
+        assert self.breaker.state == OPEN
+
+    def test_slow_model_scores_lower(self):
+        self.breaker.record(True, 2 * self.config.latency_target_seconds)
+
+        assert self.breaker.stats()["health_score"] == pytest.approx(0.5)
+
+
+class TestModelHealthRegistry:
+    @pytest.fixture(autouse=True)
+    def setup_registry(self):
+        ModelHealthRegistry._instance = None
+        self.registry = ModelHealthRegistry(
+            CircuitBreakerConfig(
+                prompt_models={"planner_agent": ["model-a"]},
+            )
+        )
+        yield
+        ModelHealthRegistry._instance = None
+
+    def test_healthy_models_keep_configured_order(self):
+        self.registry.record("model-b", True, 0.1)
+
+        assert self.registry.route(["model-a", "model-b"]) == ["model-a", "model-b"]
+
+    def test_open_circuits_are_skipped(self):
+        for _ in range(3):
+            self.registry.record("model-a", False, 1.0)
+
+        assert self.registry.route(["model-a", "model-b"]) == ["model-b"]
+
+    def test_degraded_model_moves_behind_healthy_ones(self):
+        self.registry.record("model-a", True, 1.0)
+        self.registry.record("model-a", False, 1.0)
+
+        assert self.registry.route(["model-a", "model-b"]) == ["model-b", "model-a"]
+
+    def test_prompt_restricts_models(self):
+        models = ["model-a", "model-b"]
+
+        assert self.registry.route(models, "planner_agent") == ["model-a"]
+        assert self.registry.route(models, "chat_agent") == models
+
+
+class TestLLMManagerCircuitBreaker:
+    @pytest.fixture(autouse=True)
+    def setup_llm_manager(self):
+        LLMResponseCache._instance = None
+        RateLimiterRegistry._instance = None
+        RateLimiterRegistry(RateLimitConfig(enabled=False))
+        ModelHealthRegistry._instance = None
+        self.llm_manager = LLMManager()
+        self.llm_manager.settings = MagicMock()
+        self.llm_manager.settings.model = ["groq-model-1", "groq-model-2"]
+        yield
+        ModelHealthRegistry._instance = None
+
+    @patch("time.sleep", return_value=None)
+    def test_open_circuit_falls_back_without_retry_ladder(self, sleep):
+        def generate(model, **kwargs):
+            if model == "groq-model-1":
+                raise LLMTimeoutError()
+            return "fallback"
+
+        self.llm_manager.generate_response = MagicMock(side_effect=generate)
+
+        result = self.llm_manager.call_llm_with_retry(prompt="test")
+
+        assert result == "fallback"
+        assert self.llm_manager.generate_response.call_count == 4
+        assert sleep.call_count == 2
+
+        self.llm_manager.generate_response.reset_mock()
+        result = self.llm_manager.call_llm_with_retry(prompt="test")
+
+        assert result == "fallback"
+        self.llm_manager.generate_response.assert_called_once()
+        assert self.llm_manager.generate_response.call_args.args[0] == "groq-model-2"
+
+    @patch("time.sleep", return_value=None)
+    def test_rate_limits_do_not_open_the_circuit(self, _):
+        self.llm_manager.generate_response = MagicMock(
+            side_effect=[LLMRateLimitError()] * 4 + ["ok"]
+        )
+
+        assert self.llm_manager.call_llm_with_retry(prompt="test") == "ok"
+        assert self.llm_manager.model_health.for_model("groq-model-1").state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_is_released(self):
+        self.llm_manager.settings.model = ["groq-model-1"]
+        breaker = self.llm_manager.model_health.for_model("groq-model-1")
+        for _ in range(3):
+            breaker.record(False, 1.0)
+        breaker._opened_at -= breaker.config.open_seconds
+        started = asyncio.Event()
+
+        async def hang(model, **kwargs):
+            started.set()
+            await asyncio.sleep(60)
+
+        self.llm_manager.agenerate_response = hang
+        probe = asyncio.create_task(self.llm_manager.acall_llm_with_retry(prompt="t"))
+        await started.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        assert breaker.state == HALF_OPEN
+        assert breaker.available()
+        assert self.llm_manager.model_health.route(["groq-model-1"]) == ["groq-model-1"]
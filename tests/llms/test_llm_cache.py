@@ -0,0 +1,131 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pydantic import BaseModel
+
+from app.core.settings import LLMCacheConfig
+from app.llms.llm_cache import LLMResponseCache
+from app.llms.llm_manager import LLMManager
+from app.llms.circuit_breaker import ModelHealthRegistry
+from app.llms.rate_limiter import RateLimiterRegistry
+
+
+class Answer(BaseModel):
+    answer: str
+
+
+class TestLLMResponseCache:
+    @pytest.fixture(autouse=True)
+    def reset_cache(self):
+        LLMResponseCache._instance = None
+        yield
+        LLMResponseCache._instance = None
+
+    def test_key_depends_on_the_whole_request(self):
+        messages = [{"role": "user", "content": "hi"}]
+        key = LLMResponseCache.make_key("model-a", messages, Answer, max_tokens=400)
+
+        assert key == LLMResponseCache.make_key(
+            "model-a", [{"content": "hi", "role": "user"}], Answer, max_tokens=400
+        )
+        assert key != LLMResponseCache.make_key(
+            "model-b", messages, Answer, max_tokens=400
+        )
+        assert key != LLMResponseCache.make_key(
+            "model-a", messages, Answer, max_tokens=10
+        )
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = LLMResponseCache(LLMCacheConfig(max_entries=2, disk_path=None))
+        cache.put("a", Answer(answer="a"), 60)
+        cache.put("b", Answer(answer="b"), 60)
+        cache.get("a", Answer)
+        cache.put("c", Answer(answer="c"), 60)
+
+        assert cache.get("b", Answer) is None
+        assert cache.get("a", Answer) == Answer(answer="a")
+        assert cache.stats()["evictions"] == 1
+
+    def test_expired_entries_are_misses(self):
+        cache = LLMResponseCache(LLMCacheConfig(disk_path=None))
+        cache.put("a", Answer(answer="a"), 60)
+        cache._memory["a"] = (0.0, cache._memory["a"][1])
+
+        assert cache.get("a", Answer) is None
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        config = LLMCacheConfig(disk_path=str(tmp_path / "llm.sqlite"))
+        LLMResponseCache(config).put("key", Answer(answer="cached"), 60)
+        LLMResponseCache._instance = None
+
+        cache = LLMResponseCache(config)
+
+        assert cache.get("key", Answer) == Answer(answer="cached")
+        assert cache.stats()["disk_hits"] == 1
+
+
+class TestLLMManagerResponseCache:
+    @pytest.fixture(autouse=True)
+    def setup_llm_manager(self):
+        LLMResponseCache._instance = None
+        RateLimiterRegistry._instance = None
+        ModelHealthRegistry._instance = None
+        self.llm_manager = LLMManager()
+        self.llm_manager.settings = MagicMock()
+        self.llm_manager.settings.model = ["groq-model-1", "groq-model-2"]
+        self.llm_manager.settings.temperature = 0.0
+        self.llm_manager.generate_response = MagicMock(
+            return_value=Answer(answer="ok")
+        )
+        self.request = dict(user_query="q", prompt="p", response_model=Answer)
+        yield
+        LLMResponseCache._instance = None
+
+    def test_repeated_request_is_served_from_cache(self):
+        first = self.llm_manager.call_llm_with_retry(
+            prompt_name="query_rewriting", **self.request
+        )
+        second = self.llm_manager.call_llm_with_retry(
+            prompt_name="query_rewriting", **self.request
+        )
+
+        assert first == second == Answer(answer="ok")
+        self.llm_manager.generate_response.assert_called_once()
+
+    def test_bypass_flag_skips_cache(self):
+        for _ in range(2):
+            self.llm_manager.call_llm_with_retry(
+                prompt_name="query_rewriting", use_cache=False, **self.request
+            )
+
+        assert self.llm_manager.generate_response.call_count == 2
+
+    def test_prompt_with_zero_ttl_is_not_cached(self):
+        for _ in range(2):
+            self.llm_manager.call_llm_with_retry(
+                prompt_name="planner_agent", **self.request
+            )
+
+        assert self.llm_manager.generate_response.call_count == 2
+
+    def test_non_zero_temperature_is_not_cached(self):
+        self.llm_manager.settings.temperature = 0.7
+        for _ in range(2):
+            self.llm_manager.call_llm_with_retry(
+                prompt_name="query_rewriting", **self.request
+            )
+
+        assert self.llm_manager.generate_response.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_path_shares_the_cache(self):
+        self.llm_manager.agenerate_response = AsyncMock()
+        self.llm_manager.call_llm_with_retry(
+            prompt_name="question_answering", **self.request
+        )
+
+        result = await self.llm_manager.acall_llm_with_retry(
+            prompt_name="question_answering", **self.request
+        )
+
+        assert result == Answer(answer="ok")
+        self.llm_manager.agenerate_response.assert_not_called()
@@ -1,7 +1,13 @@
+import time
+import asyncio
+
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.core.settings import RateLimitConfig
 from app.llms.llm_manager import LLMManager
+from app.llms.circuit_breaker import ModelHealthRegistry
+from app.llms.rate_limiter import RateLimiterRegistry
 from app.core.exceptions.llm_exceptions import (
     LLMRateLimitError,
     LLMTimeoutError,
@@ -15,6 +21,9 @@ from app.core.exceptions.llm_exceptions import (
 class TestLLMManager:
     @pytest.fixture(autouse=True)
     def setup_llm_manager(self):
+        RateLimiterRegistry._instance = None
+        RateLimiterRegistry(RateLimitConfig(enabled=False))
+        ModelHealthRegistry._instance = None
         self.llm_manager = LLMManager()
         self.llm_manager.settings = MagicMock()
         self.llm_manager.settings.model = ["groq-model-1", "groq-model-2"]
@@ -85,3 +94,63 @@ class TestLLMManager:
         with pytest.raises(LLMManagerError):
             self.llm_manager.call_llm_with_retry(max_retries=2, prompt="test")
         assert self.llm_manager.generate_response.call_count == 4
+
+
+@pytest.mark.asyncio
+class TestAsyncLLMManager:
+    @pytest.fixture(autouse=True)
+    def setup_llm_manager(self):
+        RateLimiterRegistry._instance = None
+        RateLimiterRegistry(RateLimitConfig(enabled=False))
+        ModelHealthRegistry._instance = None
+        self.llm_manager = LLMManager()
+        self.llm_manager.settings = MagicMock()
+        self.llm_manager.settings.model = ["groq-model-1", "groq-model-2"]
+
+    @patch("asyncio.sleep", new_callable=AsyncMock)
+    async def test_rate_limit_backs_off_with_asyncio_sleep(self, sleep):
+        self.llm_manager.agenerate_response = AsyncMock(
+            side_effect=[LLMRateLimitError(), "success"]
+        )
+
+        result = await self.llm_manager.acall_llm_with_retry(prompt="test")
+
+        assert result == "success"
+        assert self.llm_manager.agenerate_response.await_count == 2
+        sleep.assert_awaited_once()
+
+    @patch("asyncio.sleep", new_callable=AsyncMock)
+    async def test_unrecoverable_error_falls_back_to_next_model(self, _):
+        self.llm_manager.agenerate_response = AsyncMock(
+            side_effect=[LLMGenerationError("fatal"), "fallback"]
+        )
+
+        result = await self.llm_manager.acall_llm_with_retry(prompt="test")
+
+        assert result == "fallback"
+        calls = self.llm_manager.agenerate_response.await_args_list
+        models = [c.args[0] for c in calls]
+        assert models == ["groq-model-1", "groq-model-2"]
+
+    async def test_all_models_fail(self):
+        self.llm_manager.agenerate_response = AsyncMock(
+            side_effect=LLMUnexpectedError("unexpected")
+        )
+
+        with pytest.raises(LLMManagerError):
+            await self.llm_manager.acall_llm_with_retry(prompt="test")
+
+    async def test_concurrent_calls_do_not_block_each_other(self):
+        async def slow_response(model, **kwargs):
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        self.llm_manager.agenerate_response = slow_response
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.llm_manager.acall_llm_with_retry(prompt="test") for _ in range(100))
+        )
+
+        assert results == ["ok"] * 100
+        assert time.perf_counter() - start < 1.0
@@ -0,0 +1,128 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.settings import RateLimitConfig
+from app.llms.llm_cache import LLMResponseCache
+from app.llms.llm_manager import LLMManager
+from app.llms.circuit_breaker import ModelHealthRegistry
+from app.llms.rate_limiter import (
+    ModelRateLimiter,
+    RateLimiterRegistry,
+    parse_duration,
+)
+
+
+class TestModelRateLimiter:
+    def test_parse_duration(self):
+        assert parse_duration("7.66s") == pytest.approx(7.66)
+        assert parse_duration("2m59.56s") == pytest.approx(179.56)
+        assert parse_duration("120ms") == pytest.approx(0.12)
+        assert parse_duration("3") == 3.0
+        assert parse_duration("soon") is None
+
+    def test_reserve_until_request_budget_is_spent(self):
+        limiter = ModelRateLimiter(requests_per_minute=2, tokens_per_minute=1000)
+
+        assert limiter.reserve(10) == 0
+        assert limiter.reserve(10) == 0
+        assert limiter.reserve(10) == pytest.approx(30, rel=0.01)
+        assert limiter.stats()["throttled"] == 1
+
+    def test_token_headers_replace_the_seed_budget(self):
+        limiter = ModelRateLimiter(requests_per_minute=30, tokens_per_minute=1000)
+
+        limiter.update_from_headers(
+            {
+                "x-ratelimit-limit-tokens": "12000",
+                "x-ratelimit-remaining-tokens": "0",
+                "x-ratelimit-reset-tokens": "6s",
+            }
+        )
+
+        assert limiter.tokens.capacity == 12000
+        assert limiter.wait_time(1000) == pytest.approx(0.5, rel=0.05)
+
+    def test_retry_after_pauses_the_model(self):
+        limiter = ModelRateLimiter(requests_per_minute=30, tokens_per_minute=1000)
+
+        limiter.update_from_headers({"retry-after": "4"})
+
+        assert limiter.reserve(10) == pytest.approx(4, rel=0.01)
+
+
+class TestRateLimiterRegistry:
+    @pytest.fixture(autouse=True)
+    def setup_registry(self):
+        RateLimiterRegistry._instance = None
+        self.registry = RateLimiterRegistry(
+            RateLimitConfig(
+                default_requests_per_minute=1,
+                requests_per_minute={},
+                max_queue_seconds=90,
+            )
+        )
+        yield
+        RateLimiterRegistry._instance = None
+
+    def test_routes_to_fallback_with_budget(self):
+        assert self.registry.schedule("model-a", ["model-b"], 10) == 0
+
+        assert self.registry.schedule("model-a", ["model-b"], 10) is None
+        assert self.registry.schedule("model-b", [], 10) == 0
+
+    def test_queues_without_fallback(self):
+        self.registry.schedule("model-a", [], 10)
+
+        assert self.registry.schedule("model-a", [], 10) == pytest.approx(60, rel=0.01)
+
+    def test_skips_model_when_wait_exceeds_max_queue(self):
+        self.registry.config.max_queue_seconds = 5
+        self.registry.schedule("model-a", [], 10)
+
+        assert self.registry.schedule("model-a", [], 10) is None
+
+
+@pytest.mark.asyncio
+class TestLLMManagerRateLimits:
+    @pytest.fixture(autouse=True)
+    def setup_llm_manager(self):
+        LLMResponseCache._instance = None
+        RateLimiterRegistry._instance = None
+        RateLimiterRegistry(
+            RateLimitConfig(
+                default_requests_per_minute=1,
+                requests_per_minute={},
+                max_queue_seconds=90,
+            )
+        )
+        ModelHealthRegistry._instance = None
+        self.llm_manager = LLMManager()
+        self.llm_manager.settings = MagicMock()
+        self.llm_manager.settings.model = ["groq-model-1", "groq-model-2"]
+        self.llm_manager.agenerate_response = AsyncMock(return_value="ok")
+        yield
+        RateLimiterRegistry._instance = None
+
+    async def test_out_of_budget_model_routes_to_fallback(self):
+        await self.llm_manager.acall_llm_with_retry(prompt="test")
+        await self.llm_manager.acall_llm_with_retry(prompt="test")
+
+        models = [c.args[0] for c in self.llm_manager.agenerate_response.call_args_list]
+        assert models == ["groq-model-1", "groq-model-2"]
+
+    @patch("asyncio.sleep", new_callable=AsyncMock)
+    async def test_last_model_queues_for_budget(self, mock_sleep):
+        self.llm_manager.settings.model = ["groq-model-1"]
+        limiter = self.llm_manager.rate_limits.for_model("groq-model-1")
+        await self.llm_manager.acall_llm_with_retry(prompt="test")
+
+        def refill(seconds):
+            assert limiter.stats()["queue_depth"] == 1
+            limiter.requests.available = 1
+
+        mock_sleep.side_effect = refill
+        result = await self.llm_manager.acall_llm_with_retry(prompt="test")
+
+        assert result == "ok"
+        mock_sleep.assert_awaited_once()
+        assert limiter.stats()["queue_depth"] == 0
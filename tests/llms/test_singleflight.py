@@ -0,0 +1,159 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from unittest.mock import MagicMock
+from pydantic import BaseModel
+
+from app.core.exceptions.llm_exceptions import LLMGenerationError, LLMManagerError
+from app.llms.llm_cache import LLMResponseCache
+from app.llms.llm_manager import LLMManager
+from app.llms.circuit_breaker import ModelHealthRegistry
+from app.llms.rate_limiter import RateLimiterRegistry
+from app.llms.singleflight import SingleFlight
+
+
+class Answer(BaseModel):
+    answer: str
+
+
+class TestSingleFlight:
+    def test_concurrent_threads_share_one_call(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            release.wait(timeout=5)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            leader = pool.submit(flight.do, "key", slow_call)
+            while not flight.stats()["in_flight"]:
+                pass
+            followers = [pool.submit(flight.do, "key", slow_call) for _ in range(3)]
+            while flight.stats()["shared"] < 3:
+                pass
+            release.set()
+            results = [leader.result()] + [f.result() for f in followers]
+
+        assert results == ["result"] * 4
+        assert len(calls) == 1
+        assert flight.stats() == {"leaders": 1, "shared": 3, "in_flight": 0}
+
+    def test_key_is_released_after_the_call(self):
+        flight = SingleFlight()
+        flight.do("key", lambda: 1)
+
+        assert flight.do("key", lambda: 2) == 2
+
+    def test_cancelled_leader_hands_the_call_to_a_follower(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return len(calls)
+
+        async def run():
+            leader = asyncio.create_task(flight.ado("key", call))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(flight.ado("key", call))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        assert asyncio.run(run()) == 2
+        assert flight.stats()["in_flight"] == 0
+
+    def test_cancelled_follower_leaves_the_leader_running(self):
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def run():
+            leader = asyncio.create_task(flight.ado("key", call))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(flight.ado("key", call))
+            await asyncio.sleep(0)
+            follower.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await follower
+            return await leader
+
+        assert asyncio.run(run()) == "result"
+
+
+@pytest.mark.asyncio
+class TestLLMManagerCoalescing:
+    @pytest.fixture(autouse=True)
+    def setup_llm_manager(self):
+        LLMResponseCache._instance = None
+        LLMManager.in_flight = SingleFlight()
+        RateLimiterRegistry._instance = None
+        ModelHealthRegistry._instance = None
+        self.llm_manager = LLMManager()
+        self.llm_manager.settings = MagicMock()
+        self.llm_manager.settings.model = ["groq-model-1"]
+        self.llm_manager.settings.temperature = 0.0
+        self.calls = 0
+        self.request = dict(
+            user_query="q", prompt="p", response_model=Answer, use_cache=False
+        )
+        yield
+        LLMResponseCache._instance = None
+
+    async def _call(self, result):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def test_identical_requests_share_one_upstream_call(self):
+        self.llm_manager.agenerate_response = lambda model, **kwargs: self._call(
+            Answer(answer="ok")
+        )
+
+        results = await asyncio.gather(
+            *[self.llm_manager.acall_llm_with_retry(**self.request) for _ in range(3)]
+        )
+
+        assert results == [Answer(answer="ok")] * 3
+        assert self.calls == 1
+        assert LLMManager.in_flight.stats()["shared"] == 2
+
+    async def test_followers_receive_the_leaders_error(self):
+        self.llm_manager.agenerate_response = lambda model, **kwargs: self._call(
+            LLMGenerationError("invalid response")
+        )
+
+        results = await asyncio.gather(
+            *[self.llm_manager.acall_llm_with_retry(**self.request) for _ in range(2)],
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, LLMManagerError) for result in results)
+        assert self.calls == 1
+
+    async def test_different_requests_are_not_coalesced(self):
+        self.llm_manager.agenerate_response = lambda model, **kwargs: self._call(
+            Answer(answer=kwargs["user_query"])
+        )
+
+        results = await asyncio.gather(
+            self.llm_manager.acall_llm_with_retry(**self.request),
+            self.llm_manager.acall_llm_with_retry(
+                **{**self.request, "user_query": "x"}
+            ),
+        )
+
+        assert results == [Answer(answer="q"), Answer(answer="x")]
+        assert self.calls == 2
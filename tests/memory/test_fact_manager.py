@@ -0,0 +1,58 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.memory.facts import fact_manager
+from app.memory.facts.fact_manager import FactManager
+
+
+def make_entries(count: int) -> list[dict]:
+    return [{"description": f"entry {i}"} for i in range(count)]
+
+
+@pytest.mark.asyncio
+class TestFactManager:
+    @pytest.fixture(autouse=True)
+    def setup_fact_manager(self):
+        FactManager._instance = None
+        self.page_sizes = []
+        self.closed = []
+        self.pages = [make_entries(7), make_entries(5)]
+
+        async def aiter_journal_entries(user_trip_id, page_size=None, fields=None):
+            self.page_sizes.append(page_size)
+            try:
+                for page in self.pages:
+                    yield page
+            finally:
+                self.closed.append(user_trip_id)
+
+        self.manager = FactManager.__new__(FactManager)
+        self.manager.fact_store = AsyncMock()
+        self.manager.retrieval_pipeline = MagicMock()
+        self.manager.retrieval_pipeline.aiter_journal_entries = aiter_journal_entries
+        self.manager.llm_manager = MagicMock()
+        self.manager.llm_manager.acall_llm_with_retry = AsyncMock(
+            return_value=SimpleNamespace(extracted_facts=[])
+        )
+        yield
+        FactManager._instance = None
+
+    async def test_fetches_large_pages_and_prompts_limit_sized_batches(self):
+        await self.manager.extract_facts("42", "7", limit=5)
+
+        assert self.page_sizes == [fact_manager.FETCH_PAGE_SIZE]
+        batches = [
+            call.kwargs["user_query"].count("\n") + 1
+            for call in self.manager.llm_manager.acall_llm_with_retry.call_args_list
+        ]
+        assert batches == [5, 5, 2]
+        assert self.closed == ["42_7"]
+
+    async def test_failure_closes_the_page_iterator(self):
+        self.manager.llm_manager.acall_llm_with_retry.side_effect = RuntimeError("llm")
+
+        with pytest.raises(RuntimeError):
+            await self.manager.extract_facts("42", "7", limit=5)
+
+        assert self.closed == ["42_7"]
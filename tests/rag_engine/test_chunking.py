@@ -0,0 +1,93 @@
+import pytest
+
+from app.core.settings import ChunkingConfig
+from app.data.dtos.trip import TripStepDTO
+from app.rag_engine.chunking import StepChunker, chunk_point_id, collapse_chunks
+
+
+def make_step(step_id: int, description) -> TripStepDTO:
+    return TripStepDTO(
+        id=step_id,
+        display_name=f"Step {step_id}",
+        description=description,
+        location_name="Osaka",
+        lat=34.7,
+        lon=135.5,
+        detail="Japan",
+        country_code="JP",
+    )
+
+
+class TestStepChunker:
+    def setup_method(self):
+        self.chunker = StepChunker(ChunkingConfig(chunk_size=5, chunk_overlap=3))
+
+    def test_passages_end_on_sentences_and_overlap(self):
+        text = "One two three. Four five. Six seven eight. Nine."
+
+        passages = [text[start:end] for start, end in self.chunker.split(text)]
+
+        assert passages == [
+            "One two three. Four five.",
+            "Four five. Six seven eight.",
+            "Six seven eight. Nine.",
+        ]
+
+    def test_long_sentence_is_split_between_words(self):
+        text = "a b c d e f g h i j k l"
+
+        passages = [text[start:end] for start, end in self.chunker.split(text)]
+
+        assert passages == ["a b c d e", "f g h i j", "k l"]
+
+    def test_short_steps_keep_a_single_chunk_with_the_step_id(self):
+        chunks = self.chunker.chunk_steps(
+            [make_step(1, "Short one."), make_step(2, None)]
+        )
+
+        assert [(c.text, c.count, c.point_id) for c in chunks] == [
+            ("Short one.", 1, 1),
+            ("Step 2", 1, 2),
+        ]
+
+    def test_chunk_ids_are_deterministic(self):
+        assert chunk_point_id(7, 1) == chunk_point_id(7, 1)
+        assert chunk_point_id(7, 1) != chunk_point_id(7, 2)
+
+    def test_disabled_chunker_embeds_whole_descriptions(self):
+        chunker = StepChunker(ChunkingConfig(enabled=False, chunk_size=5, chunk_overlap=3))
+        text = "One two three. Four five. Six seven eight."
+
+        [chunk] = chunker.chunk_steps([make_step(1, text)])
+
+        assert chunk.text == text
+        assert chunker.search_overfetch == 1
+
+    def test_overlap_must_be_smaller_than_size(self):
+        with pytest.raises(ValueError):
+            StepChunker(ChunkingConfig(chunk_size=5, chunk_overlap=5))
+
+
+class TestCollapseChunks:
+    def test_groups_chunks_by_step_in_rank_order(self):
+        text = "One two three. Four five. Six seven eight. Nine."
+        spans = StepChunker(ChunkingConfig(chunk_size=5, chunk_overlap=3)).split(text)
+        chunks = [
+            {
+                "step_id": 1,
+                "description": text[start:end],
+                "chunk_index": index,
+                "chunk_count": len(spans),
+                "chunk_start": start,
+                "chunk_end": end,
+            }
+            for index, (start, end) in enumerate(spans)
+        ]
+        other = {"step_id": 2, "description": "Other.", "chunk_count": 1}
+
+        collapsed = collapse_chunks([chunks[2], other, chunks[0]])
+
+        assert [doc["step_id"] for doc in collapsed] == [1, 2]
+        assert collapsed[0]["description"] == "One two three. Four five. … Six seven eight. Nine."
+        assert "chunk_start" not in collapsed[0]
+        assert collapse_chunks(chunks)[0]["description"] == text
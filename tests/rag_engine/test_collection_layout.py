@@ -0,0 +1,126 @@
+import pytest
+from unittest.mock import MagicMock
+from qdrant_client.models import SparseVector
+
+from app.core.settings import VectorStoreConfig
+from app.core.exceptions.custom_exceptions import VectorStoreError
+from app.rag_engine.collection_layout import CollectionLayout
+from app.rag_engine.migrate_collections import (
+    migrate_collections,
+    parse_trip_collection_name,
+)
+
+
+class TestCollectionLayout:
+    def test_per_trip_layout(self):
+        layout = CollectionLayout(VectorStoreConfig(storage_layout="per_trip"))
+
+        assert layout.trip_target("42_7") == ("42_7_trip_collection", None)
+        with pytest.raises(VectorStoreError):
+            layout.user_target("42")
+
+    def test_shared_layout(self):
+        layout = CollectionLayout(
+            VectorStoreConfig(storage_layout="shared", shared_collection_name="steps")
+        )
+
+        assert layout.trip_target("42_7") == ("steps", {"user_trip_id": "42_7"})
+        assert layout.user_target("42") == ("steps", {"user_id": "42"})
+
+    def test_unknown_layout(self):
+        with pytest.raises(ValueError):
+            CollectionLayout(VectorStoreConfig(storage_layout="sharded"))
+
+    def test_tenant_payload_uses_string_ids(self):
+        assert CollectionLayout.tenant_payload(42, 7) == {
+            "user_id": "42",
+            "trip_id": "7",
+            "user_trip_id": "42_7",
+        }
+
+    def test_shared_collection_indexes_tenant_fields(self):
+        layout = CollectionLayout(VectorStoreConfig(storage_layout="shared"))
+        client = MagicMock()
+
+        layout.create_collection(client, layout.shared_collection_name, 8)
+
+        client.create_collection.assert_called_once_with(
+            "trip_steps", 8, sparse_vectors=False
+        )
+        assert [c.args[1] for c in client.create_payload_index.call_args_list] == [
+            "location",
+            "user_id",
+            "trip_id",
+            "user_trip_id",
+        ]
+
+
+class TestMigrateCollections:
+    def test_parse_trip_collection_name(self):
+        assert parse_trip_collection_name("user_1_99_trip_collection") == (
+            "user_1",
+            "99",
+        )
+        assert parse_trip_collection_name("trip_steps") is None
+
+    def test_copies_points_with_tenant_payload(self):
+        layout = CollectionLayout(VectorStoreConfig(storage_layout="shared"))
+        wrapper = MagicMock()
+        source = MagicMock()
+        source.name = "42_7_trip_collection"
+        other = MagicMock()
+        other.name = "trip_steps"
+        wrapper.client.get_collections.return_value = MagicMock(
+            collections=[source, other]
+        )
+        wrapper.collection_exists.return_value = True
+        wrapper.client.scroll.return_value = (
+            [MagicMock(id=1, vector={"description": [0.1]}, payload={"text": "a"})],
+            None,
+        )
+
+        copied = migrate_collections(wrapper, layout, delete_source=True)
+
+        assert copied == {"42_7_trip_collection": 1}
+        target, points = wrapper.add_documents.call_args.args
+        assert target == "trip_steps"
+        assert points[0].payload == {
+            "text": "a",
+            "user_id": "42",
+            "trip_id": "7",
+            "user_trip_id": "42_7",
+        }
+        wrapper.delete_collection.assert_called_once_with("42_7_trip_collection")
+
+    def test_creates_shared_collection_with_sparse_vectors(self):
+        layout = CollectionLayout(VectorStoreConfig(storage_layout="shared"))
+        wrapper = MagicMock()
+        source = MagicMock()
+        source.name = "42_7_trip_collection"
+        wrapper.client.get_collections.return_value = MagicMock(collections=[source])
+        wrapper.collection_exists.return_value = False
+        wrapper.get_collection_info.return_value = {
+            "exists": True,
+            "vector_size": 8,
+            "points_count": 1,
+            "sparse_vectors": True,
+        }
+        bm25 = SparseVector(indices=[3], values=[1.0])
+        wrapper.client.scroll.return_value = (
+            [
+                MagicMock(
+                    id=1,
+                    vector={"description": [0.1] * 8, "bm25": bm25},
+                    payload={"text": "a"},
+                )
+            ],
+            None,
+        )
+
+        migrate_collections(wrapper, layout)
+
+        wrapper.create_collection.assert_called_once_with(
+            "trip_steps", 8, sparse_vectors=True
+        )
+        _, points = wrapper.add_documents.call_args.args
+        assert points[0].vector["bm25"] == bm25
@@ -0,0 +1,194 @@
+import pytest
+from unittest.mock import MagicMock
+
+from app.core.settings import ChunkingConfig, EmbeddingConfig, VectorStoreConfig
+from app.data.dtos.trip import TripDTO, TripStepDTO
+from app.data.storage.numpy_vector_store import NumpyVectorStore
+from app.embeddings.bm25_encoder import BM25Encoder
+from app.embeddings.embedding_base import EmbeddingBase
+from app.rag_engine.chunking import StepChunker
+from app.rag_engine.collection_layout import CollectionLayout
+from app.rag_engine.indexing_pipeline import IndexingPipeline, IndexingReport
+from app.rag_engine.vector_store import VectorStore
+
+
+def make_step(step_id: int, description: str) -> TripStepDTO:
+    return TripStepDTO(
+        id=step_id,
+        display_name=f"Step {step_id}",
+        description=description,
+        location_name="Osaka",
+        lat=34.7,
+        lon=135.5,
+        detail="Japan",
+        country_code="JP",
+    )
+
+
+def make_trip(steps: list[TripStepDTO]) -> TripDTO:
+    return TripDTO(id=7, user_id=42, name="Japan", summary=None, all_steps=steps)
+
+
+class TestIncrementalIndexing:
+    @pytest.fixture(autouse=True)
+    def setup_pipeline(self):
+        NumpyVectorStore._instance = None
+        VectorStore._instance = None
+        self.embeddings = MagicMock(spec=EmbeddingBase)
+        self.embeddings.model_name = "test-model"
+        self.embeddings.get_embedding_dimension.return_value = 2
+        self.embeddings.embed.side_effect = lambda texts: [
+            [float(len(text)), 1.0] for text in texts
+        ]
+        config = VectorStoreConfig(numpy_storage_path=None, storage_layout="shared")
+        self.store = NumpyVectorStore(config)
+        self.pipeline = IndexingPipeline.__new__(IndexingPipeline)
+        self.pipeline.embedding_config = EmbeddingConfig()
+        self.pipeline.embeddings = self.embeddings
+        self.pipeline.vector_store = VectorStore(
+            self.store,
+            self.embeddings,
+            CollectionLayout(config),
+            StepChunker(ChunkingConfig(chunk_size=4, chunk_overlap=1)),
+        )
+
+    def test_first_sync_adds_every_step(self):
+        trip = make_trip([make_step(1, "temples"), make_step(2, "ramen")])
+
+        report = self.pipeline.add_trip_to_vector_store(trip, "42_7", incremental=True)
+
+        assert (report.added, report.updated, report.deleted, report.unchanged) == (
+            2,
+            0,
+            0,
+            0,
+        )
+        documents = self.store.get_all_documents("trip_steps")
+        assert {doc["step_id"] for doc in documents} == {1, 2}
+        assert all(doc["user_trip_id"] == "42_7" for doc in documents)
+
+    def test_resync_embeds_only_changes(self):
+        self.pipeline.sync_trip(
+            make_trip([make_step(1, "temples"), make_step(2, "ramen")]), "42_7"
+        )
+        self.embeddings.embed.reset_mock()
+
+        report = self.pipeline.sync_trip(
+            make_trip([make_step(1, "temples"), make_step(3, "onsen")]), "42_7"
+        )
+
+        assert (report.added, report.updated, report.deleted, report.unchanged) == (
+            1,
+            0,
+            1,
+            1,
+        )
+        self.embeddings.embed.assert_called_once_with(["onsen"])
+        documents = self.store.get_all_documents("trip_steps")
+        assert sorted(doc["step_id"] for doc in documents) == [1, 3]
+
+    def test_changed_step_is_updated(self):
+        self.pipeline.sync_trip(make_trip([make_step(1, "temples")]), "42_7")
+
+        report = self.pipeline.sync_trip(make_trip([make_step(1, "shrines")]), "42_7")
+
+        assert report.updated == 1
+        assert self.store.get_all_documents("trip_steps")[0]["description"] == "shrines"
+
+    def test_long_step_is_chunked_and_shrinking_removes_stale_chunks(self):
+        long_text = "We hiked up. The view was great. Then it rained. We ran down."
+        self.pipeline.sync_trip(make_trip([make_step(1, long_text)]), "42_7")
+
+        assert len(self.store.collections["trip_steps"].ids) == 4
+        [document] = self.pipeline.vector_store.get_all_documents("trip_steps")
+        assert document["description"] == long_text
+        assert "chunk_index" not in document
+
+        self.pipeline.sync_trip(make_trip([make_step(1, "Short.")]), "42_7")
+
+        assert self.store.collections["trip_steps"].ids == [1]
+        assert self.store.get_all_documents("trip_steps")[0]["description"] == "Short."
+
+    def test_full_reindex_of_a_shortened_step_removes_stale_chunks(self):
+        long_text = "We hiked up. The view was great. Then it rained. We ran down."
+        self.pipeline.add_trip_to_vector_store(
+            make_trip([make_step(1, long_text)]), "42_7"
+        )
+        assert len(self.store.collections["trip_steps"].ids) == 4
+
+        self.pipeline.add_trip_to_vector_store(
+            make_trip([make_step(1, "Short.")]), "42_7"
+        )
+
+        assert self.store.collections["trip_steps"].ids == [1]
+
+    def test_bulk_reindex_of_a_shortened_step_removes_stale_chunks(self):
+        long_text = "We hiked up. The view was great. Then it rained. We ran down."
+        self.pipeline.index_trips([make_trip([make_step(1, long_text)])], num_workers=0)
+        assert len(self.store.collections["trip_steps"].ids) == 4
+
+        self.pipeline.index_trips([make_trip([make_step(1, "Short.")])], num_workers=0)
+
+        assert self.store.collections["trip_steps"].ids == [1]
+        assert self.store.get_all_documents("trip_steps")[0]["description"] == "Short."
+
+    @pytest.mark.asyncio
+    async def test_paging_yields_whole_chunked_steps(self):
+        long_text = "We hiked up. The view was great. Then it rained. We ran down."
+        self.pipeline.sync_trip(
+            make_trip([make_step(1, "Temples."), make_step(2, long_text)]), "42_7"
+        )
+
+        pages = [
+            page
+            async for page in self.pipeline.vector_store.aiter_documents(
+                "trip_steps", page_size=2, fields=["description"]
+            )
+        ]
+
+        assert pages == [
+            [{"description": "Temples."}],
+            [{"description": long_text}],
+        ]
+
+    def test_enabling_hybrid_search_reindexes_and_matches_terms(self):
+        trip = make_trip([make_step(1, "temples"), make_step(2, "ramen")])
+        self.pipeline.sync_trip(trip, "42_7")
+        self.pipeline.vector_store.sparse_encoder = BM25Encoder()
+
+        report = self.pipeline.sync_trip(trip, "42_7")
+        # The dense vector of "ramen bowl" is closest to "temples"; only the
+        # lexical ranking knows about ramen.
+        [results] = self.pipeline.vector_store.search_many(
+            "trip_steps", ["ramen bowl"], limit=1
+        )
+
+        assert report.updated == 2
+        assert [doc["step_id"] for doc in results] == [2]
+
+    def test_bulk_indexing_reports_trips_and_steps(self):
+        trips = [
+            make_trip([make_step(1, "temples"), make_step(2, "ramen")]),
+            TripDTO(
+                id=8,
+                user_id=42,
+                name="Peru",
+                summary=None,
+                all_steps=[make_step(3, "llamas")],
+            ),
+        ]
+
+        report = self.pipeline.index_trips(iter(trips), num_workers=0, batch_size=1)
+
+        assert (report.trips, report.steps) == (2, 3)
+        assert report.steps_per_second == report.steps / report.seconds
+        assert self.embeddings.embed.call_count == 3
+        documents = self.store.get_all_documents("trip_steps")
+        assert {doc["step_id"]: doc["user_trip_id"] for doc in documents} == {
+            1: "42_7",
+            2: "42_7",
+            3: "42_8",
+        }
+
+    def test_empty_report_has_no_throughput(self):
+        assert IndexingReport().steps_per_second == 0.0
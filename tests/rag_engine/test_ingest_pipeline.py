@@ -0,0 +1,106 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.settings import VectorStoreConfig
+from app.data.storage.numpy_vector_store import NumpyVectorStore
+from app.embeddings.embedding_base import EmbeddingBase
+from app.rag_engine.collection_layout import CollectionLayout
+from app.rag_engine.ingest_pipeline import IngestPipeline
+from app.rag_engine.vector_store import VectorStore
+
+
+def write_trip(path, trip_id: int, num_steps: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "id": trip_id,
+        "user_id": 42,
+        "name": f"Trip {trip_id}",
+        "summary": None,
+        "all_steps": [
+            {
+                "id": trip_id * 100 + i,
+                "display_name": f"Step {i}",
+                "description": "x" * (i + 1),
+                "location": {
+                    "name": "Osaka",
+                    "lat": 34.7,
+                    "lon": 135.5,
+                    "detail": "Japan",
+                    "country_code": "JP",
+                },
+            }
+            for i in range(num_steps)
+        ],
+    }
+    path.write_text(json.dumps(data))
+
+
+class TestIngestPipeline:
+    @pytest.fixture(autouse=True)
+    def setup_pipeline(self, tmp_path):
+        NumpyVectorStore._instance = None
+        VectorStore._instance = None
+        self.embeddings = MagicMock(spec=EmbeddingBase)
+        self.embeddings.model_name = "test-model"
+        self.embeddings.embed.side_effect = lambda texts: [
+            [float(len(text)), 1.0] for text in texts
+        ]
+        config = VectorStoreConfig(numpy_storage_path=None, storage_layout="shared")
+        self.store = NumpyVectorStore(config)
+        self.vector_store = VectorStore(
+            self.store, self.embeddings, CollectionLayout(config)
+        )
+        self.export = tmp_path / "export"
+        write_trip(self.export / "trip_1" / "trip.json", trip_id=1, num_steps=5)
+        write_trip(self.export / "trip_2" / "trip.json", trip_id=2, num_steps=2)
+        self.checkpoint = tmp_path / "checkpoint.jsonl"
+
+    def make_pipeline(self) -> IngestPipeline:
+        return IngestPipeline(
+            vector_store=self.vector_store,
+            embedding_config=MagicMock(),
+            num_workers=0,
+            batch_size=2,
+            queue_size=1,
+            checkpoint_path=str(self.checkpoint),
+        )
+
+    def test_ingests_every_trip(self):
+        report = self.make_pipeline().run(str(self.export))
+
+        assert (report.trips, report.skipped_trips, report.steps) == (2, 0, 7)
+        documents = self.store.get_all_documents("trip_steps")
+        assert sorted(doc["step_id"] for doc in documents) == [
+            100,
+            101,
+            102,
+            103,
+            104,
+            200,
+            201,
+        ]
+        trip_2 = self.store.get_all_documents(
+            "trip_steps", filters={"user_trip_id": "42_2"}
+        )
+        assert len(trip_2) == 2
+        # Trip 1 is split into three batches of at most two steps.
+        assert self.embeddings.embed.call_count == 4
+
+    def test_resumes_from_checkpoint(self):
+        self.make_pipeline().run(str(self.export))
+        self.embeddings.embed.reset_mock()
+
+        report = self.make_pipeline().run(str(self.export))
+
+        assert (report.trips, report.skipped_trips, report.steps) == (0, 2, 0)
+        self.embeddings.embed.assert_not_called()
+
+    def test_upload_failure_stops_the_pipeline(self):
+        self.store.add_documents = MagicMock(side_effect=RuntimeError("down"))
+
+        with pytest.raises(RuntimeError, match="down"):
+            self.make_pipeline().run(str(self.export))
+
+        assert not self.checkpoint.exists()
@@ -0,0 +1,92 @@
+import pytest
+from unittest.mock import MagicMock
+
+from qdrant_client.models import PointStruct
+
+from app.core.settings import ChunkingConfig, VectorStoreConfig
+from app.data.storage.numpy_vector_store import NumpyVectorStore
+from app.embeddings.embedding_base import EmbeddingBase
+from app.rag_engine.chunking import StepChunker
+from app.rag_engine.collection_layout import CollectionLayout
+from app.rag_engine.mmr import mmr_select
+from app.rag_engine.retrieval_pipeline import RetrievalPipeline
+from app.rag_engine.vector_store import VectorStore
+
+# Two near-identical days and a distinct one that is slightly less relevant.
+CANDIDATES = [[1.0, 0.0, 0.0], [0.99, 0.05, 0.0], [0.7, 0.0, 0.7]]
+QUERY = [1.0, 0.0, 0.3]
+
+
+class TestMMRSelect:
+    def test_skips_near_duplicates(self):
+        assert mmr_select(QUERY, CANDIDATES, k=2, lambda_mult=0.5) == [0, 2]
+
+    def test_lambda_one_keeps_similarity_order(self):
+        assert mmr_select(QUERY, CANDIDATES, k=3, lambda_mult=1.0) == [
+            0,
+            1,
+            2,
+        ]
+
+    def test_k_larger_than_candidates(self):
+        assert sorted(mmr_select(QUERY, CANDIDATES, k=10)) == [0, 1, 2]
+        assert mmr_select(QUERY, [], k=3) == []
+
+
+class TestDiversifiedSearch:
+    @pytest.fixture(autouse=True)
+    def setup_vector_store(self):
+        NumpyVectorStore._instance = None
+        VectorStore._instance = None
+        config = VectorStoreConfig(numpy_storage_path=None)
+        self.store = NumpyVectorStore(config)
+        self.store.create_collection("trip", embedding_size=3)
+        self.store.add_documents(
+            "trip",
+            [
+                PointStruct(
+                    id=step_id,
+                    vector={"description": vector},
+                    payload={"step_id": step_id},
+                )
+                for step_id, vector in enumerate(CANDIDATES, start=1)
+            ],
+        )
+        embeddings = MagicMock(spec=EmbeddingBase)
+        embeddings.embed.return_value = QUERY
+        self.vector_store = VectorStore(
+            self.store,
+            embeddings,
+            CollectionLayout(config),
+            StepChunker(ChunkingConfig(enabled=False)),
+        )
+
+    def test_diversify_replaces_near_duplicates(self):
+        plain = self.vector_store.search("trip", "ramen", limit=2, diversify=False)
+        diverse = self.vector_store.search("trip", "ramen", limit=2, diversify=True)
+
+        assert [doc["step_id"] for doc in plain] == [1, 2]
+        assert [doc["step_id"] for doc in diverse] == [1, 3]
+
+    def test_generation_follows_the_mmr_setting(self):
+        self.vector_store.layout = MagicMock()
+        self.vector_store.layout.trip_target.return_value = ("trip", None)
+        pipeline = RetrievalPipeline.__new__(RetrievalPipeline)
+        pipeline.vector_store = self.vector_store
+        pipeline._rewrite_query = lambda user_query, user_trip_id: user_query
+        pipeline._generate_answer = MagicMock()
+
+        _, plain = pipeline.search_with_generation("ramen", "42_7", limit=2)
+        self.vector_store.mmr_enabled = True
+        _, diverse = pipeline.search_with_generation("ramen", "42_7", limit=2)
+
+        assert [doc["step_id"] for doc in plain] == [1, 2]
+        assert [doc["step_id"] for doc in diverse] == [1, 3]
+
+    def test_search_with_vectors_returns_stored_vectors(self):
+        [(payload, vector)] = self.store.search_with_vectors(
+            "trip", [0.0, 0.0, 1.0], k=1
+        )
+
+        assert payload == {"step_id": 3}
+        assert vector == pytest.approx([0.7071, 0.0, 0.7071], abs=1e-4)
@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import patch
+from httpx import ASGITransport, AsyncClient
+from fastapi import status
+
+from main import app
+from app.server.readiness import Readiness
+from app.llms.rate_limiter import RateLimiterRegistry
+
+
+@pytest.mark.asyncio
+class TestHealthEndpoints:
+    @pytest.fixture(autouse=True)
+    def setup_readiness(self):
+        self.readiness = Readiness()
+        self.readiness.ready = False
+        self.readiness.error = None
+        self.readiness.timings = {}
+        yield
+        self.readiness.ready = False
+        self.readiness.error = None
+        self.readiness.timings = {}
+
+    async def test_health(self):
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as ac:
+            response = await ac.get("/health")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"status": "ok"}
+
+    async def test_ready_before_warm_up(self):
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as ac:
+            response = await ac.get("/ready")
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json() == {"status": "starting", "error": None}
+
+    async def test_ready_after_warm_up(self):
+        with patch.object(Readiness, "_warm_up_components", return_value=None):
+            await self.readiness.warm_up()
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as ac:
+            response = await ac.get("/ready")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "ready"
+
+    async def test_warm_up_failure_keeps_not_ready(self):
+        with patch.object(
+            Readiness,
+            "_warm_up_components",
+            side_effect=RuntimeError("model download failed"),
+        ):
+            await self.readiness.warm_up()
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as ac:
+            response = await ac.get("/ready")
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json() == {
+            "status": "starting",
+            "error": "model download failed",
+        }
+
+    async def test_metrics_report_llm_budgets(self):
+        RateLimiterRegistry().for_model("groq-model-1")
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as ac:
+            response = await ac.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        budget = response.json()["llm_rate_limits"]["groq-model-1"]
+        assert budget["queue_depth"] == 0
+        assert "tokens_available" in budget
@@ -6,6 +6,7 @@ from fastapi import status
 from main import app
 from app.core.exceptions.custom_exceptions import CollectionNotFoundError
 from app.core.exceptions.llm_exceptions import LLMManagerError
+from app.data.dtos.geo import GeoRadius
 from app.services.journal_service import JournalService
 from app.server.dependencies import get_journal_service
 
@@ -68,8 +69,27 @@ class TestSearchJournal:
             user_id=self.sample_request["user_id"],
             trip_id=self.sample_request["trip_id"],
             limit=self.sample_request["limit"],
+            geo_filter=None,
         )
 
+    async def test_search_journal_with_geo_filter(self):
+        mock_journal_service = AsyncMock(spec=JournalService)
+        mock_journal_service.search_journal.return_value = []
+        app.dependency_overrides[get_journal_service] = lambda: mock_journal_service
+        geo_filter = {"lat": 38.7, "lon": -9.1, "radius_km": 5}
+
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as ac:
+            response = await ac.post(
+                "/journal/search",
+                json={**self.sample_request, "geo_filter": geo_filter},
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        kwargs = mock_journal_service.search_journal.await_args.kwargs
+        assert kwargs["geo_filter"] == GeoRadius(**geo_filter)
+
     async def test_search_journal_collection_not_found(self):
         mock_journal_service = AsyncMock(spec=JournalService)
         mock_journal_service.search_journal.return_value = self.sample_response[
@@ -217,3 +237,34 @@ class TestSearchJournal:
 
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
         assert response.json() == {"detail": f"Internal server error: {error_message}"}
+
+    async def test_search_journal_batch_success(self):
+        mock_journal_service = AsyncMock(spec=JournalService)
+        documents = self.sample_response["documents"]
+        mock_journal_service.search_journal_batch.return_value = [
+            documents[:1],
+            documents[1:],
+        ]
+
+        app.dependency_overrides[get_journal_service] = lambda: mock_journal_service
+
+        request = {
+            "user_queries": ["Osaka", "Kyoto"],
+            "user_id": "user123",
+            "trip_id": "trip456",
+            "limit": 1,
+        }
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as ac:
+            response = await ac.post("/journal/search_batch", json=request)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"results": [documents[:1], documents[1:]]}
+        mock_journal_service.search_journal_batch.assert_awaited_once_with(
+            user_queries=["Osaka", "Kyoto"],
+            user_id="user123",
+            trip_id="trip456",
+            limit=1,
+            geo_filter=None,
+        )
@@ -0,0 +1,67 @@
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from app.data.storage.async_qdrant_client import AsyncQdrantClientWrapper
+from app.core.settings import QdrantConfig
+from app.core.exceptions.custom_exceptions import (
+    QdrantClientError,
+    CollectionNotFoundError,
+)
+
+
+@pytest.mark.asyncio
+class TestAsyncQdrantClient:
+    @pytest.fixture(autouse=True)
+    def setup_async_qdrant_client(self):
+        AsyncQdrantClientWrapper._instance = None
+        self.wrapper = AsyncQdrantClientWrapper(QdrantConfig())
+        self.wrapper.client = AsyncMock()
+
+    async def test_search(self):
+        self.wrapper.client.query_points.return_value = MagicMock(
+            points=[MagicMock(payload={"text": "doc1"})]
+        )
+
+        result = await self.wrapper.search("test_collection", [0.1, 0.2], k=1)
+
+        assert result == [{"text": "doc1"}]
+        self.wrapper.client.query_points.assert_awaited_once_with(
+            collection_name="test_collection",
+            query=[0.1, 0.2],
+            using="description",
+            query_filter=None,
+            search_params=None,
+            limit=1,
+        )
+        self.wrapper.client.collection_exists.assert_not_called()
+
+    async def test_search_collection_not_found(self):
+        self.wrapper.client.query_points.side_effect = UnexpectedResponse(
+            404, "Not Found", b"", httpx.Headers()
+        )
+
+        with pytest.raises(CollectionNotFoundError):
+            await self.wrapper.search("missing_collection", [0.1, 0.2])
+
+        assert await self.wrapper.collection_exists("missing_collection") is False
+        self.wrapper.client.collection_exists.assert_not_called()
+
+    async def test_search_error(self):
+        self.wrapper.client.query_points.side_effect = Exception("Search failed")
+
+        with pytest.raises(QdrantClientError):
+            await self.wrapper.search("test_collection", [0.1, 0.2])
+
+    async def test_get_all_documents_scrolls_every_page(self):
+        self.wrapper.client.scroll.side_effect = [
+            ([MagicMock(payload={"text": "doc1"})], "next"),
+            ([MagicMock(payload={"text": "doc2"})], None),
+        ]
+
+        result = await self.wrapper.get_all_documents("test_collection", batch_size=1)
+
+        assert result == [{"text": "doc1"}, {"text": "doc2"}]
+        assert self.wrapper.client.scroll.await_count == 2
@@ -0,0 +1,33 @@
+from app.data.dtos.trip import TripStepDTO
+from app.data.storage.conversion_benchmark import benchmark, load_steps, raw_document
+from app.data.storage.step_documents import step_point
+
+
+class TestConversionBenchmark:
+    def test_raw_document_matches_dto_conversion(self):
+        raw_step = {
+            "id": 7,
+            "display_name": "Osaka",
+            "description": "beautiful",
+            "location": {
+                "name": "Osaka",
+                "lat": 34,
+                "lon": 135.5,
+                "full_detail": "Japan",
+                "country_code": "JP",
+            },
+            "weather_temperature": 16,
+        }
+
+        raw_point = raw_document(raw_step, [0.1, 0.2])
+        dto_point = step_point(TripStepDTO.from_raw_json(raw_step), [0.1, 0.2])
+
+        assert raw_point.model_dump() == dto_point.model_dump()
+        assert isinstance(raw_point.payload["lat"], float)
+
+    def test_benchmark_reports_every_path(self):
+        report = benchmark(load_steps(None, 4), dimension=8, repeat=1)
+
+        assert report["steps"] == 4
+        for name in ("dto", "constructed_dto", "raw"):
+            assert report[f"{name}_us_per_step"] > 0
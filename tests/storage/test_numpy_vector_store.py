@@ -0,0 +1,266 @@
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+
+from qdrant_client.models import PointStruct
+
+from app.core.settings import VectorStoreConfig
+from app.data.dtos.geo import GeoBoundingBox, GeoRadius
+from app.data.dtos.trip import TripStepDTO
+from app.data.storage.numpy_vector_store import NumpyVectorStore
+from app.embeddings.bm25_encoder import BM25Encoder
+from app.core.exceptions.custom_exceptions import CollectionNotFoundError
+
+
+def make_point(point_id: int, vector: list[float], text: str) -> PointStruct:
+    return PointStruct(
+        id=point_id, vector={"description": vector}, payload={"text": text}
+    )
+
+
+class TestNumpyVectorStore:
+    @pytest.fixture(autouse=True)
+    def setup_numpy_store(self):
+        NumpyVectorStore._instance = None
+        self.store = NumpyVectorStore(VectorStoreConfig(numpy_storage_path=None))
+        self.store.create_collection("trip", embedding_size=2)
+        self.store.add_documents(
+            "trip",
+            [
+                make_point(1, [1.0, 0.0], "east"),
+                make_point(2, [0.0, 1.0], "north"),
+                make_point(3, [-1.0, 0.0], "west"),
+                make_point(4, [0.7, 0.7], "north-east"),
+            ],
+        )
+
+    def test_collection_exists(self):
+        assert self.store.collection_exists("trip") is True
+        assert self.store.collection_exists("unknown") is False
+
+    def test_search_returns_top_k_in_order(self):
+        results = self.store.search("trip", query_embedding=[2.0, 0.1], k=2)
+
+        assert results == [{"text": "east"}, {"text": "north-east"}]
+
+    def test_search_k_larger_than_collection(self):
+        results = self.store.search("trip", query_embedding=[0.0, 1.0], k=10)
+
+        assert len(results) == 4
+        assert results[0] == {"text": "north"}
+        assert results[-1] == {"text": "west"}
+
+    def test_search_batch_matches_single_searches(self):
+        queries = [[2.0, 0.1], [0.0, 1.0], [-1.0, 0.2]]
+
+        results = self.store.search_batch("trip", query_embeddings=queries, k=2)
+
+        assert results == [self.store.search("trip", query, k=2) for query in queries]
+
+    def test_search_with_filters(self):
+        self.store.create_collection("shared", embedding_size=2)
+        self.store.add_documents(
+            "shared",
+            [
+                PointStruct(
+                    id=1, vector=[1.0, 0.0], payload={"text": "a", "trip_id": "1"}
+                ),
+                PointStruct(
+                    id=2, vector=[0.9, 0.1], payload={"text": "b", "trip_id": "2"}
+                ),
+                PointStruct(
+                    id=3, vector=[0.0, 1.0], payload={"text": "c", "trip_id": "2"}
+                ),
+            ],
+        )
+
+        results = self.store.search(
+            "shared", query_embedding=[1.0, 0.0], k=1, filters={"trip_id": "2"}
+        )
+
+        assert results == [{"text": "b", "trip_id": "2"}]
+        assert self.store.get_all_documents("shared", filters={"trip_id": "3"}) == []
+
+    def test_search_with_geo_filters(self):
+        self.store.create_collection("steps", embedding_size=2)
+        self.store.add_documents(
+            "steps",
+            [
+                PointStruct(
+                    id=1,
+                    vector=[1.0, 0.0],
+                    payload={"text": "lisbon", "location": {"lat": 38.72, "lon": -9.14}},
+                ),
+                PointStruct(
+                    id=2,
+                    vector=[0.9, 0.1],
+                    payload={"text": "porto", "location": {"lat": 41.15, "lon": -8.61}},
+                ),
+            ],
+        )
+
+        near_lisbon = GeoRadius(lat=38.7, lon=-9.1, radius_km=50)
+        north = GeoBoundingBox(min_lat=40, min_lon=-10, max_lat=43, max_lon=-6)
+
+        assert self.store.search(
+            "steps", [1.0, 0.0], k=2, filters={"location": near_lisbon}
+        ) == [{"text": "lisbon", "location": {"lat": 38.72, "lon": -9.14}}]
+        assert [
+            doc["text"]
+            for doc in self.store.get_all_documents("steps", filters={"location": north})
+        ] == ["porto"]
+
+    def test_search_collection_not_found(self):
+        with pytest.raises(CollectionNotFoundError) as e:
+            self.store.search("unknown", query_embedding=[0.1, 0.2])
+
+        assert "Collection 'unknown' does not exist." in str(e.value)
+
+    def test_add_documents_replaces_existing_id(self):
+        self.store.add_documents("trip", [make_point(3, [0.0, 1.0], "moved north")])
+
+        results = self.store.search("trip", query_embedding=[0.0, 1.0], k=2)
+
+        assert {"text": "moved north"} in results
+        assert {"text": "west"} not in self.store.get_all_documents("trip")
+        assert len(self.store.get_all_documents("trip")) == 4
+
+    def test_get_all_documents(self):
+        documents = self.store.get_all_documents("trip")
+
+        assert [doc["text"] for doc in documents] == [
+            "east",
+            "north",
+            "west",
+            "north-east",
+        ]
+
+    def test_iter_documents_pages_and_projection(self):
+        self.store.add_documents("trip", [make_point(5, [0.0, -1.0], "south")])
+
+        pages = list(self.store.iter_documents("trip", page_size=2, fields=["text"]))
+
+        assert pages == [
+            [{"text": "east"}, {"text": "north"}],
+            [{"text": "west"}, {"text": "north-east"}],
+            [{"text": "south"}],
+        ]
+
+    def test_trip_step_to_document_matches_qdrant_payload(self):
+        dto = TripStepDTO(
+            id=7,
+            display_name="Osaka",
+            description="beautiful",
+            location_name="Osaka",
+            lat=34.7,
+            lon=135.5,
+            detail="Japan",
+            country_code="JP",
+        )
+
+        document = NumpyVectorStore.trip_step_to_document(dto, [0.1, 0.2])
+
+        assert document.id == 7
+        assert document.payload["display_name"] == "Osaka"
+        assert document.vector == {"description": [0.1, 0.2]}
+
+    def test_hybrid_search_promotes_exact_term_matches(self):
+        encoder = BM25Encoder()
+        self.store.create_collection("lexical", embedding_size=2)
+        steps = [
+            (1, [1.0, 0.0], "Ramen in a quiet street"),
+            (2, [0.9, 0.1], "Sushi at the fish market"),
+            (3, [0.0, 1.0], "Okonomiyaki in Osaka"),
+        ]
+        self.store.add_documents(
+            "lexical",
+            [
+                NumpyVectorStore.trip_step_to_document(
+                    TripStepDTO(
+                        id=step_id,
+                        display_name=text,
+                        description=text,
+                        location_name="Japan",
+                        lat=35.0,
+                        lon=135.0,
+                        detail="Japan",
+                        country_code="JP",
+                    ),
+                    vector,
+                    encoder.encode_document(text),
+                )
+                for step_id, vector, text in steps
+            ],
+        )
+        query = encoder.encode_query("okonomiyaki")
+
+        sparse = self.store.sparse_search("lexical", query, k=5)
+        hybrid = self.store.hybrid_search("lexical", [1.0, 0.0], query, k=2)
+
+        assert [doc["step_id"] for doc in sparse] == [3]
+        assert [doc["step_id"] for doc in hybrid] == [1, 3]
+
+    def test_persisted_sparse_vectors_are_reloaded(self, tmp_path):
+        NumpyVectorStore._instance = None
+        config = VectorStoreConfig(numpy_storage_path=str(tmp_path))
+        store = NumpyVectorStore(config)
+        encoder = BM25Encoder()
+        store.create_collection("trip", embedding_size=2, sparse_vectors=True)
+        point = make_point(1, [1.0, 0.0], "ramen")
+        point.vector["bm25"] = encoder.encode_document("ramen")
+        store.add_documents("trip", [point, make_point(2, [0.0, 1.0], "sushi")])
+
+        NumpyVectorStore._instance = None
+        reloaded = NumpyVectorStore(config)
+
+        assert reloaded.sparse_search("trip", encoder.encode_query("ramen")) == [
+            {"text": "ramen"}
+        ]
+
+    def test_persisted_collections_are_reloaded(self, tmp_path):
+        NumpyVectorStore._instance = None
+        config = VectorStoreConfig(numpy_storage_path=str(tmp_path))
+        store = NumpyVectorStore(config)
+        store.create_collection("trip", embedding_size=2)
+        store.add_documents("trip", [make_point(1, [1.0, 0.0], "east")])
+
+        NumpyVectorStore._instance = None
+        reloaded = NumpyVectorStore(config)
+        reloaded.add_documents("trip", [make_point(2, [0.0, 1.0], "north")])
+
+        assert reloaded.search("trip", query_embedding=[0.0, 1.0], k=1) == [
+            {"text": "north"}
+        ]
+        assert len(reloaded.get_all_documents("trip")) == 2
+
+    def test_bulk_writes_persist_each_collection_once(self, tmp_path):
+        NumpyVectorStore._instance = None
+        config = VectorStoreConfig(numpy_storage_path=str(tmp_path))
+        store = NumpyVectorStore(config)
+        store._write = MagicMock(wraps=store._write)
+
+        with store.bulk_writes():
+            store.create_collection("trip", embedding_size=2)
+            for point_id in range(5):
+                store.add_documents("trip", [make_point(point_id, [1.0, 0.0], "e")])
+            store.delete_documents("trip", [0])
+            store._write.assert_not_called()
+
+        store._write.assert_called_once_with("trip")
+        NumpyVectorStore._instance = None
+        assert len(NumpyVectorStore(config).get_all_documents("trip")) == 4
+
+    def test_search_waits_for_a_concurrent_write(self):
+        results = []
+        search = threading.Thread(
+            target=lambda: results.append(self.store.search("trip", [1.0, 0.0], k=1))
+        )
+
+        with self.store._lock:
+            search.start()
+            search.join(timeout=0.1)
+            assert search.is_alive()
+        search.join()
+
+        assert results == [[{"text": "east"}]]
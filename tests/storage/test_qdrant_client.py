@@ -1,10 +1,15 @@
+import grpc
+import httpx
 import pytest
 from unittest.mock import MagicMock
 
+from qdrant_client.http.exceptions import UnexpectedResponse
 from qdrant_client.models import Distance, VectorParams
 from qdrant_client.models import PointStruct
 
+from app.data.dtos.geo import GeoRadius
 from app.data.storage.qdrant_client import QdrantClientWrapper
+from app.embeddings.bm25_encoder import SparseEmbedding
 from app.core.settings import QdrantConfig
 from app.core.exceptions.custom_exceptions import (
     QdrantClientError,
@@ -18,6 +23,8 @@ class TestQdrantClient:
         config = QdrantConfig()
         self.wrapper = QdrantClientWrapper(config)
         self.wrapper.client = MagicMock()
+        self.wrapper.collection_cache.clear()
+        self.wrapper.collection_cache.ttl_seconds = config.collection_cache_ttl
 
     def test_collection_exists(self):
         collection_name = "existing_collection"
@@ -48,6 +55,7 @@ class TestQdrantClient:
             vectors_config={
                 "description": VectorParams(size=128, distance=Distance.COSINE)
             },
+            sparse_vectors_config=None,
         )
 
     def test_create_collection_already_exists(self):
@@ -86,17 +94,71 @@ class TestQdrantClient:
         assert "Error adding documents to collection" in str(e.value)
         self.wrapper.client.upload_points.assert_called_once()
 
+    def test_collection_exists_is_cached(self):
+        collection_name = "existing_collection"
+        self.wrapper.client.collection_exists.return_value = True
+
+        assert self.wrapper.collection_exists(collection_name) is True
+        assert self.wrapper.collection_exists(collection_name) is True
+
+        self.wrapper.client.collection_exists.assert_called_once_with(collection_name)
+
+    def test_collection_exists_cache_expires(self):
+        collection_name = "existing_collection"
+        self.wrapper.client.collection_exists.return_value = True
+        self.wrapper.collection_cache.ttl_seconds = 0
+
+        self.wrapper.collection_exists(collection_name)
+        self.wrapper.collection_exists(collection_name)
+
+        assert self.wrapper.client.collection_exists.call_count == 2
+
+    def test_create_collection_updates_cache(self):
+        collection_name = "new_collection"
+        self.wrapper.client.collection_exists.return_value = False
+
+        self.wrapper.create_collection(collection_name, embedding_size=128)
+
+        assert self.wrapper.collection_exists(collection_name) is True
+        self.wrapper.client.collection_exists.assert_called_once_with(collection_name)
+
+    def test_delete_collection_updates_cache(self):
+        collection_name = "existing_collection"
+        self.wrapper.client.collection_exists.return_value = True
+        self.wrapper.collection_exists(collection_name)
+
+        self.wrapper.delete_collection(collection_name)
+
+        assert self.wrapper.collection_exists(collection_name) is False
+        self.wrapper.client.delete_collection.assert_called_once_with(
+            collection_name=collection_name
+        )
+        self.wrapper.client.collection_exists.assert_called_once_with(collection_name)
+
     def test_search_collection_not_found(self):
         collection_name = "unknown_collection"
-        self.wrapper.collection_exists = MagicMock(return_value=False)
+        self.wrapper.client.query_points.side_effect = UnexpectedResponse(
+            status_code=404,
+            reason_phrase="Not Found",
+            content=b"Collection not found",
+            headers=httpx.Headers(),
+        )
 
         with pytest.raises(CollectionNotFoundError) as e:
             self.wrapper.search(collection_name, query_embedding=[0.1, 0.2])
 
         assert f"Collection '{collection_name}' does not exist." in str(e.value)
+        assert self.wrapper.collection_exists(collection_name) is False
+        self.wrapper.client.collection_exists.assert_not_called()
+
+    def test_search_does_not_check_collection_first(self):
+        self.wrapper.client.query_points.return_value = MagicMock(points=[])
+
+        self.wrapper.search("test_collection", query_embedding=[0.1, 0.2])
+
+        self.wrapper.client.collection_exists.assert_not_called()
 
     def test_search_qdrant_error(self):
-        self.wrapper.collection_exists = MagicMock(return_value=True)
         self.wrapper.client.query_points.side_effect = Exception("internal error")
 
         with pytest.raises(QdrantClientError) as e:
@@ -105,7 +167,6 @@ class TestQdrantClient:
         assert "Qdrant search error" in str(e.value)
 
     def test_search_no_results(self):
-        self.wrapper.collection_exists = MagicMock(return_value=True)
         self.wrapper.client.query_points.return_value = []
 
         results = self.wrapper.search("test_collection", query_embedding=[0.1, 0.2])
@@ -113,7 +174,6 @@ class TestQdrantClient:
 
     def test_search_with_results(self):
         collection_name = "test_collection"
-        self.wrapper.collection_exists = MagicMock(return_value=True)
 
         mock_point1 = MagicMock(payload={"text": "doc 1"})
         mock_point2 = MagicMock(payload={"text": "doc 2"})
@@ -127,5 +187,155 @@ class TestQdrantClient:
             collection_name=collection_name,
             query=[0.1, 0.2],
             using="description",
+            query_filter=None,
+            search_params=None,
             limit=5,
         )
+
+    def test_search_batch_single_round_trip(self):
+        collection_name = "test_collection"
+        self.wrapper.client.query_batch_points.return_value = [
+            MagicMock(points=[MagicMock(payload={"text": "doc 1"})]),
+            MagicMock(points=[MagicMock(payload={"text": "doc 2"})]),
+        ]
+
+        results = self.wrapper.search_batch(
+            collection_name, query_embeddings=[[0.1, 0.2], [0.3, 0.4]], k=1
+        )
+
+        assert results == [[{"text": "doc 1"}], [{"text": "doc 2"}]]
+        self.wrapper.client.query_batch_points.assert_called_once()
+        requests = self.wrapper.client.query_batch_points.call_args.kwargs["requests"]
+        assert [request.query for request in requests] == [[0.1, 0.2], [0.3, 0.4]]
+        assert all(request.limit == 1 for request in requests)
+        self.wrapper.client.query_points.assert_not_called()
+
+    def test_search_batch_collection_not_found(self):
+        self.wrapper.client.query_batch_points.side_effect = UnexpectedResponse(
+            404, "Not Found", b"", httpx.Headers()
+        )
+
+        with pytest.raises(CollectionNotFoundError):
+            self.wrapper.search_batch("missing_collection", [[0.1, 0.2]])
+
+    def test_grpc_not_found_is_translated_like_the_async_client(self):
+        class NotFound(grpc.RpcError):
+            def code(self):
+                return grpc.StatusCode.NOT_FOUND
+
+        self.wrapper.client.query_batch_points.side_effect = NotFound()
+
+        with pytest.raises(CollectionNotFoundError):
+            self.wrapper.hybrid_search_batch(
+                "missing_collection",
+                [[0.1, 0.2]],
+                [SparseEmbedding(indices=[1], values=[1.0])],
+            )
+        assert self.wrapper.collection_exists("missing_collection") is False
+
+    def test_iter_documents_yields_pages(self):
+        self.wrapper.client.scroll.side_effect = [
+            ([MagicMock(payload={"description": "doc 1"})], "next"),
+            ([MagicMock(payload={"description": "doc 2"})], None),
+        ]
+
+        pages = self.wrapper.iter_documents(
+            "test_collection", page_size=1, fields=["description"]
+        )
+
+        assert next(pages) == [{"description": "doc 1"}]
+        assert self.wrapper.client.scroll.call_count == 1
+        assert list(pages) == [[{"description": "doc 2"}]]
+        self.wrapper.client.scroll.assert_called_with(
+            collection_name="test_collection",
+            scroll_filter=None,
+            with_payload=["description"],
+            limit=1,
+            offset="next",
+        )
+
+    def test_search_with_filters(self):
+        self.wrapper.client.query_points.return_value = MagicMock(points=[])
+
+        self.wrapper.search(
+            "trip_steps", query_embedding=[0.1, 0.2], filters={"user_trip_id": "1_2"}
+        )
+
+        query_filter = self.wrapper.client.query_points.call_args.kwargs["query_filter"]
+        assert query_filter.must[0].key == "user_trip_id"
+        assert query_filter.must[0].match.value == "1_2"
+
+    def test_search_with_geo_radius(self):
+        self.wrapper.client.query_points.return_value = MagicMock(points=[])
+
+        self.wrapper.search(
+            "trip_steps",
+            query_embedding=[0.1, 0.2],
+            filters={"location": GeoRadius(lat=38.7, lon=-9.1, radius_km=5)},
+        )
+
+        query_filter = self.wrapper.client.query_points.call_args.kwargs["query_filter"]
+        condition = query_filter.must[0]
+        assert condition.key == "location"
+        assert (condition.geo_radius.center.lat, condition.geo_radius.radius) == (
+            38.7,
+            5000,
+        )
+
+    def test_hybrid_search_fuses_dense_and_sparse_prefetches(self):
+        self.wrapper.client.query_points.return_value = MagicMock(
+            points=[MagicMock(payload={"step_id": 1})]
+        )
+
+        results = self.wrapper.hybrid_search(
+            "trip_steps",
+            query_embedding=[0.1, 0.2],
+            sparse_query=SparseEmbedding(indices=[7], values=[1.0]),
+            k=3,
+            filters={"user_trip_id": "1_2"},
+        )
+
+        kwargs = self.wrapper.client.query_points.call_args.kwargs
+        dense, sparse = kwargs["prefetch"]
+        assert results == [{"step_id": 1}]
+        assert kwargs["query"].fusion == "rrf"
+        assert (dense.using, sparse.using) == ("description", "bm25")
+        assert sparse.query.indices == [7]
+        assert dense.filter == sparse.filter is not None
+
+    def test_sparse_search_queries_the_bm25_vector(self):
+        self.wrapper.client.query_points.return_value = MagicMock(
+            points=[MagicMock(payload={"step_id": 1})]
+        )
+
+        results = self.wrapper.sparse_search(
+            "trip_steps", SparseEmbedding(indices=[7], values=[1.0]), k=3
+        )
+
+        kwargs = self.wrapper.client.query_points.call_args.kwargs
+        assert results == [{"step_id": 1}]
+        assert kwargs["using"] == "bm25"
+        assert kwargs["query"].indices == [7]
+        assert kwargs["limit"] == 3
+
+    def test_search_with_vectors_returns_description_vectors(self):
+        self.wrapper.client.query_points.return_value = MagicMock(
+            points=[
+                MagicMock(payload={"step_id": 1}, vector={"description": [0.1, 0.2]})
+            ]
+        )
+
+        results = self.wrapper.search_with_vectors("trip_steps", [0.1, 0.2], k=8)
+
+        kwargs = self.wrapper.client.query_points.call_args.kwargs
+        assert results == [({"step_id": 1}, [0.1, 0.2])]
+        assert kwargs["with_vectors"] == ["description"]
+        assert (kwargs["using"], kwargs["limit"]) == ("description", 8)
+
+    def test_create_collection_with_sparse_vectors(self):
+        self.wrapper.client.collection_exists.return_value = False
+
+        self.wrapper.create_collection("trip_steps", 128, sparse_vectors=True)
+
+        kwargs = self.wrapper.client.create_collection.call_args.kwargs
+        assert kwargs["sparse_vectors_config"]["bm25"].modifier == "idf"
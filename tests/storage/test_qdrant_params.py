@@ -0,0 +1,86 @@
+import pytest
+
+from qdrant_client.models import (
+    BinaryQuantization,
+    Distance,
+    FusionQuery,
+    ScalarQuantization,
+    ScalarType,
+    VectorParams,
+)
+
+from app.core.settings import QdrantConfig
+from app.data.storage.qdrant_params import (
+    batch_request,
+    dense_search_query,
+    hybrid_search_query,
+    search_params,
+    vector_params,
+    vector_query,
+)
+from app.embeddings.bm25_encoder import SparseEmbedding
+
+
+class TestQdrantParams:
+    def test_defaults_leave_qdrant_defaults(self):
+        config = QdrantConfig(quantization="none")
+
+        assert vector_params(config, 128) == VectorParams(
+            size=128, distance=Distance.COSINE
+        )
+        assert search_params(config) is None
+
+    def test_scalar_quantization_with_rescoring(self):
+        config = QdrantConfig(
+            quantization="scalar", vectors_on_disk=True, search_oversampling=3.0
+        )
+
+        params = vector_params(config, 128)
+        search = search_params(config)
+
+        assert isinstance(params.quantization_config, ScalarQuantization)
+        assert params.quantization_config.scalar.type == ScalarType.INT8
+        assert params.on_disk is True
+        assert search.quantization.rescore is True
+        assert search.quantization.oversampling == 3.0
+
+    def test_binary_quantization_and_hnsw_settings(self):
+        config = QdrantConfig(
+            quantization="binary", hnsw_m=32, hnsw_ef_construct=200, search_hnsw_ef=128
+        )
+
+        params = vector_params(config, 128)
+
+        assert isinstance(params.quantization_config, BinaryQuantization)
+        assert (params.hnsw_config.m, params.hnsw_config.ef_construct) == (32, 200)
+        assert search_params(config).hnsw_ef == 128
+
+    def test_unknown_quantization(self):
+        with pytest.raises(ValueError):
+            vector_params(QdrantConfig(quantization="product"), 128)
+
+    def test_batch_request_matches_the_single_query(self):
+        params = search_params(QdrantConfig(search_hnsw_ef=64))
+        query = dense_search_query([0.1, 0.2], 3, params=params)
+
+        request = batch_request(query)
+
+        assert (request.query, request.using, request.limit) == (
+            [0.1, 0.2],
+            "description",
+            3,
+        )
+        assert request.params == params
+        assert request.with_payload is True
+
+    def test_vector_query_fuses_a_sparse_query_and_returns_vectors(self):
+        sparse = SparseEmbedding(indices=[1], values=[1.0])
+
+        query = vector_query([0.1, 0.2], sparse, 3)
+
+        assert query == {
+            **hybrid_search_query([0.1, 0.2], sparse, 3),
+            "with_vectors": ["description"],
+        }
+        assert isinstance(query["query"], FusionQuery)
+        assert len(query["prefetch"]) == 2